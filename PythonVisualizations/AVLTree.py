@@ -20,16 +20,16 @@ class AVLTree(BinaryTreeBase):
         self.emptyTree()
         self.display(treeLabel='AVLtree')
 
+    def display(self, fields=[], treeLabel='AVLtree'):
+        super().display(fields=fields, treeLabel=treeLabel)
+
     def randomFill(self, numNodes):
-        callEnviron = self.createCallEnvironment()
-
-        #randomly generate a tree
-        nums = list(range(self.valMax + 1))
-        random.shuffle(nums)
-        nums = nums[:numNodes]
-        while nums:
-            self.insert(nums.pop(), animation=False)
-        self.cleanUp(callEnviron)
+        '''Add random keys to the tree by rebuilding it as a balanced tree
+        from the sorted old and new keys.  New keys are only sampled up to
+        the room left in the tree.'''
+        keys = [node.getKey() for node in self.nodes]
+        count = max(0, min(numNodes, self.maxElems - len(keys), self.valMax))
+        return self.bulkLoad(keys + random.sample(range(self.valMax), count))
 
     updateHeightCode = '''
 def updateHeight(self):
@@ -214,15 +214,6 @@ def __insert(self, node={nodeKey}, key={key}, data):
             self.cleanUp(callEnviron, sleepTime=wait / 10)
             return node, False
 
-        # don't insert past MAX_LEVEL
-        if self.getLevel(node) == self.MAX_LEVEL-1:
-            if animation:
-                self.setMessage(
-                    "Error! Cannot insert at level " + str(self.MAX_LEVEL) + 
-                    " or below")
-            self.cleanUp(callEnviron, sleepTime=wait / 10)
-            return node, False
-          
         # Does the key belong in left subtree?
         if animation:
             self.highlightCode('key < node.key', callEnviron, wait=wait)
@@ -379,7 +370,6 @@ def rotateLeft(self, top={topKey}):
             callEnviron |= set(toRaiseArrow)
 
         # Get key nodes
-        topLeft = self.getLeftChild(top)
         toRaiseNode = self.getNode(toRaise)
         toRaiseLeft, toRaiseRight = self.getChildren(toRaise)
 
@@ -398,41 +388,20 @@ def rotateLeft(self, top={topKey}):
         else:
             topNode.setLine(toRaise.getLine())
 
-        # Extract current subtrees
-        topLeftTree = self.getNodeTree(topLeft, erase=True)
-        toRaiseLeftTree = self.getNodeTree(toRaiseLeft, erase=True)
-        toRaiseRightTree = self.getNodeTree(toRaiseRight, erase=True)
-
-        # Move nodes internally, noting any nodes cutoff past depth limit
-        cutoff = self.storeNodeTree(
-            [toRaiseNode, 
-             [topNode, topLeftTree, toRaiseLeftTree], toRaiseRightTree],
-            topIndex)
+        # Relink the nodes
+        self.nodes.rotate(topIndex, Child.RIGHT)
         toRaise.setLine(topParentLine)
 
-        # Move canvas items to new positions to match internal structure
-        newSubTree = self.getAllDescendants(topIndex)
-        newSubTreeItems = flat(*(
-            node.drawnValue.items for node in newSubTree + list(cutoff)))[1:]
-        toPositions = flat(*(
-            self.nodeItemCoords(node, parent=self.getParent(node)) 
-            for node in newSubTree + [len(self.nodes) * 3] * len(cutoff)))[1:]
+        # Move drawn canvas items to new positions to match internal
+        # structure.  Without animation, clean up restores them.
         if animation:
+            newSubTreeItems, toPositions = self.drawnSubtreeItemCoords(
+                topIndex)
             self.moveItemsLinearly(
-                newSubTreeItems + topArrow + toRaiseArrow, 
-                toPositions + self.indexCoords(topNode, 2) +
-                self.indexCoords(toRaiseNode, 1), sleepTime=wait / 10)
-        else:
-            for item, coords in zip(newSubTreeItems, toPositions):
-                self.canvas.coords(item, *coords)
-        if cutoff and animation:
-            self.setMessage(
-                'Removed node{} {} that went beyond level {}'.format(
-                    '' if len(cutoff) == 1 else 's',
-                    ', '.join(str(node.getKey()) for node in cutoff),
-                self.MAX_LEVEL - 1))
-        self.dispose(callEnviron,
-                     *flat(*(node.drawnValue.items for node in cutoff)))
+                newSubTreeItems + list(topArrow + toRaiseArrow),
+                toPositions + list(self.indexCoords(topNode, 2) +
+                                   self.indexCoords(toRaiseNode, 1)),
+                sleepTime=wait / 10)
                 
         # Update heights of rotated nodes
         if animation:
@@ -481,7 +450,6 @@ def rotateRight(self, top={topKey}):
             callEnviron |= set(toRaiseArrow)
 
         # Get key nodes
-        topRight = self.getRightChild(top)
         toRaiseNode = self.getNode(toRaise)
         toRaiseLeft, toRaiseRight = self.getChildren(toRaise)
 
@@ -500,41 +468,20 @@ def rotateRight(self, top={topKey}):
         else:
             topNode.setLine(toRaise.getLine())
             
-        # Extract current subtrees
-        topRightTree = self.getNodeTree(topRight, erase=True)
-        toRaiseRightTree = self.getNodeTree(toRaiseRight, erase=True)
-        toRaiseLeftTree = self.getNodeTree(toRaiseLeft, erase=True)
-
-        # Move nodes internally, noting any nodes cutoff past depth limit
-        cutoff = self.storeNodeTree(
-            [toRaiseNode,
-             toRaiseLeftTree, [topNode, toRaiseRightTree, topRightTree]],
-            topIndex)
+        # Relink the nodes
+        self.nodes.rotate(topIndex, Child.LEFT)
         toRaise.setLine(topParentLine)
 
-        # Move canvas items to new positions to match internal structure
-        newSubTree = self.getAllDescendants(topIndex)
-        newSubTreeItems = flat(*(
-            node.drawnValue.items for node in newSubTree + list(cutoff)))[1:]
-        toPositions = flat(*(
-            self.nodeItemCoords(node, parent=self.getParent(node)) 
-            for node in newSubTree + [len(self.nodes) * 3] * len(cutoff)))[1:]
+        # Move drawn canvas items to new positions to match internal
+        # structure.  Without animation, clean up restores them.
         if animation:
+            newSubTreeItems, toPositions = self.drawnSubtreeItemCoords(
+                topIndex)
             self.moveItemsLinearly(
-                newSubTreeItems + topArrow + toRaiseArrow, 
-                toPositions + self.indexCoords(topNode, 2) +
-                self.indexCoords(toRaiseNode, 1), sleepTime=wait / 10)
-        else:
-            for item, coords in zip(newSubTreeItems, toPositions):
-                self.canvas.coords(item, *coords)
-        if cutoff and animation:
-            self.setMessage(
-                'Removed node{} {} that went beyond level {}'.format(
-                    '' if len(cutoff) == 1 else 's',
-                    ', '.join(str(node.getKey()) for node in cutoff),
-                self.MAX_LEVEL - 1))
-        self.dispose(callEnviron,
-                     *flat(*(node.drawnValue.items for node in cutoff)))
+                newSubTreeItems + list(topArrow + toRaiseArrow),
+                toPositions + list(self.indexCoords(topNode, 2) +
+                                   self.indexCoords(toRaiseNode, 1)),
+                sleepTime=wait / 10)
                 
         # Update heights of rotated nodes
         if animation:
@@ -1024,12 +971,13 @@ def __balanceRight(self, node={nodeKey}):
       
         # create the Node object
         node = Node(drawnValueObj, center, tag)
+        self.drawnNodes.add(node)
 
         # increment size
         self.size += 1
 
         # add the node object to the internal representation
-        if addToArray and 0 <= nodeIndex and nodeIndex < len(self.nodes):
+        if addToArray and 0 <= nodeIndex:
             self.nodes[nodeIndex] = node
 
         return node
@@ -1059,6 +1007,9 @@ def __balanceRight(self, node={nodeKey}):
                 anchor=W, text=str(height), font=font, fill=self.HEIGHT_COLOR,
                 tags = (tag, "height")),)
     
+    def redrawCulledNode(self, node, state):
+        super().redrawCulledNode(node, dict(state, height=self.getHeight(node)))
+
     def heightDiff(self, node, callEnviron=None, sleepTime=0):
         '''Return difference in node's child heights.  Animate calculation
         if callEnviron is provided.'''
@@ -1109,16 +1060,6 @@ def __balanceRight(self, node={nodeKey}):
 
         return left - right
 
-    # override height from BinaryTreeBase.py
-    def getHeight(self, node):
-        if not node or (isinstance(node, int) and not self.getNode(node)):
-            return 0
-
-        rightChild = self.getRightChild(node)
-        leftChild = self.getLeftChild(node)
-
-        return max(self.getHeight(rightChild), self.getHeight(leftChild)) + 1
-
     def clickInsert(self):
         val = self.validArgument()
         if val:
@@ -1173,7 +1114,7 @@ if __name__ == '__main__':
     nonneg, negative, options, otherArgs = categorizeArguments(sys.argv[1:])
     if '-r' not in options:  # Use fixed seed for testing consistency unless
         random.seed(3.14159) # random option specified
-    tree = AVLTree()
+    tree = AVLTree(TIDY_LAYOUT='-t' in options)
     for arg in nonneg:
         tree.setArgument(arg)
         tree.insertButton.invoke()
@@ -23,10 +23,10 @@ class AdvancedArraySort(SortingBase):
         self.ARRAY_Y0 = 60
 
         if values is None:
-            for i in range(self.size):
-                self.list.append(drawnValue(random.randrange(self.valMax)))
+            self.list.extend(drawnValue.many(
+                random.randrange(self.valMax) for i in range(self.size)))
         else:
-            self.list = [drawnValue(val) for val in values]
+            self.list = drawnValue.many(values)
         self.display()
         
         self.buttons = self.makeButtons()
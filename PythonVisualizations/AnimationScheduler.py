@@ -0,0 +1,169 @@
+__doc__ = """
+Frame scheduler for animations.
+Runs animation step sequences (like those produced by the
+Visualization.moveItems____Sequence generators) from Tk's event loop
+using timed 'after' callbacks instead of sleeping.  The calling code
+blocks in a nested Tk event loop (tkwait) while the scheduler advances
+the sequence one step per frame, so the display stays responsive and
+frame timing does not drift by the time spent in Tcl calls.
+Pauses wait for a notification of a change in the animation state
+rather than polling, so paused animations use no CPU and resume as soon
+as the state changes.
+"""
+
+import time
+from tkinter import *
+
+class AnimationScheduler(object):
+    '''Schedule animation frames on a fixed frame budget.  Frames are timed
+    against deadlines, so the time spent making canvas changes within a
+    frame is subtracted from the delay before the next frame.
+    '''
+
+    def __init__(self, window):
+        self.window = window
+        self.lastFrame = None  # Deadline of most recently completed frame
+        self.waitVars = []     # Tk variables for each level of nested waits
+        self.depth = 0         # Current depth of nested waits
+        self.interrupted = False
+        self.frames = 0        # Count of frames run
+        self.profiler = None   # Profiler to notify of frames and waits
+        self.waiters = []      # Functions to call on next notification
+
+    def frameDelay(self, frameTime, continuous=False):
+        '''Compute the delay in seconds to the deadline of the next frame
+        and record that deadline.  Continuous frames are timed from the
+        previous deadline, even if it has passed.  Other frames start
+        a new frame clock unless they follow within a frame of the last one.
+        '''
+        now = time.perf_counter()
+        target = None if self.lastFrame is None else self.lastFrame + frameTime
+        if target is None or not (target >= now or continuous):
+            target = now + frameTime
+        elif target < now:    # Frame work ran over budget, so resynchronize
+            target = now      # rather than trying to catch up
+        self.lastFrame = target
+        return target - now
+
+    def waitVariable(self):  # Get a Tk variable to wait on at current depth
+        while len(self.waitVars) <= self.depth:
+            self.waitVars.append(IntVar(self.window, value=0))
+        return self.waitVars[self.depth]
+
+    def waitFor(self, start): # Run a nested Tk event loop until the wait
+        var = self.waitVariable() # variable is set. The start function
+        var.set(0)                # is called to schedule the events that
+        self.depth += 1           # will set it
+        try:
+            start(var)
+            if not var.get():
+                self.window.wait_variable(var)
+        finally:
+            self.depth -= 1
+
+    def waitUntil(self, condition):
+        '''Process Tk events until the condition function returns true.
+        The condition is only checked again after a call to notify(), so
+        no time is spent polling.  Returns immediately if the scheduler
+        was interrupted.'''
+        while not (self.interrupted or condition()):
+            self.waitFor(lambda var: self.whenNotified(lambda: var.set(1)))
+            if self.profiler:
+                self.profiler.noteWakeup()
+
+    def whenNotified(self, function): # Call a function on next notification
+        self.waiters.append(function)
+
+    def notify(self):        # Wake all waits and held sequences so they
+        waiters, self.waiters = self.waiters, [] # check their conditions
+        for waiter in waiters:
+            try:
+                waiter()
+            except TclError:
+                pass
+
+    def sleep(self, sleepTime, continuous=False):
+        '''Wait for the next frame deadline while processing Tk events.
+        Returns immediately if the scheduler was interrupted.'''
+        if self.interrupted:
+            return
+        delay = self.frameDelay(sleepTime, continuous)
+        self.waitFor(lambda var: self.window.after(
+            max(0, int(delay * 1000)), var.set, 1))
+        self.frames += 1
+        if self.profiler:
+            self.profiler.noteFrame()
+
+    def schedule(self, function, frameTime): # Call a function at the next
+        delay = self.frameDelay(frameTime)   # frame deadline from Tk's event
+        self.frames += 1                     # loop without waiting for it
+        if self.profiler:
+            self.profiler.noteFrame()
+        return self.window.after(max(0, int(delay * 1000)), function)
+
+    def run(self,            # Run an animation sequence, advancing one step
+            sequence,        # per frame.  Each step of the sequence is run
+            frameTime,       # in an 'after' callback.  frameTime is the
+            hold=None,       # seconds per frame or a function to get it.
+            abort=None):     # Hold and abort are predicates checked before
+        '''Run the steps of the sequence on the frame schedule.  While the
+        hold function returns true, the sequence is not advanced and is
+        only checked again after a call to notify().  When the abort
+        function returns true, the sequence is closed without finishing.
+        Exceptions raised by the sequence are re-raised here.  Returns True
+        if the sequence ran to completion.
+        '''
+        iterator = iter(sequence)
+        getFrameTime = frameTime if callable(frameTime) else (
+            lambda: frameTime)
+        outcome = {'finished': False, 'error': None, 'stepTime': 0}
+        start = time.perf_counter()
+        self.lastFrame = start # First step starts a new clock
+
+        def finish(var):
+            if hasattr(iterator, 'close'):
+                iterator.close()
+            var.set(1)
+
+        def frame(var):
+            if self.interrupted or (abort and abort()):
+                return finish(var)
+            if hold and hold():  # Wait for notification before next check
+                self.whenNotified(lambda: self.window.after_idle(frame, var))
+                if self.profiler:
+                    self.profiler.noteWakeup()
+                return
+            stepStart = time.perf_counter()
+            try:
+                next(iterator)
+                self.frames += 1
+                if self.profiler:
+                    self.profiler.noteFrame()
+            except StopIteration:
+                outcome['finished'] = True
+                return var.set(1)
+            except BaseException as e:
+                outcome['error'] = e
+                return finish(var)
+            finally:
+                outcome['stepTime'] += time.perf_counter() - stepStart
+            self.window.after(
+                max(0, int(self.frameDelay(getFrameTime(), True) * 1000)),
+                frame, var)
+
+        self.waitFor(lambda var: self.window.after_idle(frame, var))
+        if self.profiler:    # Time not spent running steps was spent waiting
+            self.profiler.noteWait(
+                time.perf_counter() - start - outcome['stepTime'])
+        if outcome['error']:
+            raise outcome['error']
+        return outcome['finished']
+
+    def interrupt(self):     # Release all current and future waits, e.g.
+        self.interrupted = True # when the window is destroyed
+        self.notify()
+        for var in self.waitVars:
+            try:
+                var.set(1)
+            except TclError:
+                pass
@@ -0,0 +1,364 @@
+__doc__ = """
+Timeline recording and replay of animations.
+A TimelineRecorder attached to a Scrim canvas is told which items change
+as an operation runs.  At the end of each animation frame, it captures
+the state of just those items, plus the canvas stacking order and the
+highlighted code, and appends the differences to a Timeline along with
+the states they replace.  Timelines keep one current state and move it
+forwards or backwards a step at a time by applying those changes in
+place, so playing costs only the changes made in each step.  They also
+store a full keyframe every few steps so that a distant step is
+reached by copying the nearest keyframe and applying a bounded number
+of steps, no matter how long the recording is.  A TimelinePlayer shows
+a recorded timeline in its own window with controls to seek, scrub,
+play forwards or backwards, and change the playback speed.
+"""
+
+from tkinter import *
+
+try:
+    from tkUtilities import *
+except ModuleNotFoundError:
+    from .tkUtilities import *
+
+def hashableValue(value):   # Make an option value read from a canvas
+    if isinstance(value, (list, tuple)): # hashable while keeping what Tk
+        return tuple(hashableValue(v) for v in value) # needs to replay it
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)       # Tcl objects become their string values
+
+class Timeline(object):
+    '''Recorded sequence of canvas and code states.  Each step holds a
+    delta: a dictionary mapping changed item IDs to their new state (or
+    None when deleted), the new stacking order of the items (or None if
+    unchanged), and the new code state (or None if unchanged).  A
+    matching undo delta holds the states those changes replaced.  Item
+    states are (type, coords, options) tuples where options is a tuple
+    of (name, value) pairs for the options that differ from their
+    default values.  Code states are (text, highlights) pairs where
+    highlights is a tuple of text widget indices, taken in pairs.
+    '''
+
+    KEYFRAME_INTERVAL = 16  # Steps between full copies of the state
+
+    def __init__(self, keyframeInterval=None):
+        self.keyframeInterval = (
+            keyframeInterval if keyframeInterval else self.KEYFRAME_INTERVAL)
+        self.deltas = []    # Changes made in each step
+        self.undos = []     # States replaced by the changes in each step
+        self.keyframes = [] # (items, order, code) states every interval steps
+        self.defaults = {}  # Default option values by item type
+        self.step = None    # Step of the current state
+        self.items = {}     # Current state of items, order, and code, which
+        self.order = ()     # seeking changes in place
+        self.code = ('', ())
+
+    def __len__(self):
+        return len(self.deltas)
+
+    def __str__(self):
+        return '<Timeline of {} step{} with {} keyframe{}>'.format(
+            len(self), '' if len(self) == 1 else 's',
+            len(self.keyframes), '' if len(self.keyframes) == 1 else 's')
+
+    def append(self,        # Add a step to the timeline with the changes
+               changes,     # to items, the stacking order, and code
+               order,       # state, the states they replace, plus the
+               code,        # full state after the changes to use if this
+               state,       # step is a keyframe
+               replaced):
+        self.deltas.append((changes, order, code))
+        self.undos.append(replaced)
+        if (len(self.deltas) - 1) % self.keyframeInterval == 0:
+            items, order, code = state
+            self.keyframes.append((dict(items), order, code))
+
+    def seek(self, step):
+        '''Move the current state to a step and return the set of IDs of
+        the items whose states may have changed.  Nearby steps are reached
+        by applying the deltas or undo deltas in between in place.  Steps
+        more than a keyframe interval away start from a copy of the
+        nearest preceding keyframe, which takes time proportional to the
+        number of items, and then apply at most an interval of deltas.'''
+        if len(self) == 0:
+            raise IndexError('Cannot get state from empty timeline')
+        step = max(0, min(step, len(self) - 1))
+        changed = set()
+        if self.step is None or abs(step - self.step) > self.keyframeInterval:
+            index = step // self.keyframeInterval
+            items, self.order, self.code = self.keyframes[index]
+            changed.update(self.items, items)
+            self.items = dict(items)
+            self.step = index * self.keyframeInterval
+        while self.step < step:
+            self.step += 1
+            self.apply(self.deltas[self.step], changed)
+        while self.step > step:
+            self.apply(self.undos[self.step], changed)
+            self.step -= 1
+        return changed
+
+    def apply(self, delta, changed): # Apply a delta to the current state
+        changes, order, code = delta
+        items = self.items
+        for item, itemState in changes.items():
+            if itemState is None:
+                items.pop(item, None)
+            else:
+                items[item] = itemState
+        changed.update(changes)
+        if order is not None:
+            self.order = order
+        if code is not None:
+            self.code = code
+
+    def stateAt(self, step):
+        '''Return the (items, order, code) state at a step.  The items
+        dictionary is the timeline's current state, which the next seek
+        changes, so callers that keep it must copy it.'''
+        self.seek(step)
+        return self.items, self.order, self.code
+
+    def default(self, itemType, option):
+        return self.defaults.get(itemType, {}).get(option, '')
+
+class TimelineRecorder(object):
+    '''Record changes to a canvas into a Timeline.  The canvas notifies the
+    recorder of the items or tags it changes and when the stacking order
+    changes.  Each call to captureFrame() reads the state of the changed
+    items and appends any differences as a new step.
+    '''
+
+    def __init__(self, canvas, keyframeInterval=None):
+        self.canvas = canvas
+        self.timeline = Timeline(keyframeInterval)
+        self.dirtyItems = set()  # Item IDs changed since last frame
+        self.dirtyTags = set()   # Tags of items changed since last frame
+        self.restacked = False   # Stacking order may have changed
+        self.items = {}          # Current state of each item
+        self.order = ()          # Current stacking order
+        self.code = ('', ())     # Current code state
+        self.captureFrame(self.code, everything=True)
+
+    def touch(self, *tagsOrIds): # Note items that changed
+        for tagOrId in tagsOrIds:
+            if isinstance(tagOrId, int):
+                self.dirtyItems.add(tagOrId)
+            elif isinstance(tagOrId, str) and tagOrId.isdigit():
+                self.dirtyItems.add(int(tagOrId))
+            elif isinstance(tagOrId, str):
+                self.dirtyTags.add(tagOrId)
+
+    def restack(self):           # Note possible change in stacking order
+        self.restacked = True
+
+    def itemState(self, item):   # Read the state of a canvas item
+        canvas = self.canvas
+        kind = canvas.type(item)
+        if not kind:
+            return None
+        config = canvas.itemconfigure(item)
+        defaults = self.timeline.defaults.get(kind)
+        if defaults is None:
+            defaults = self.timeline.defaults[kind] = dict(
+                (key, hashableValue(config[key][3])) for key in config)
+        options = tuple(sorted(
+            (key, value) for key, value in (
+                (key, hashableValue(config[key][-1])) for key in config
+                if key != 'window')
+            if value != defaults.get(key)))
+        return (kind, tuple(canvas.coords(item)), options)
+
+    def captureFrame(self, code=None, everything=False):
+        '''Capture the changes since the last frame as a new step in the
+        timeline.  Steps that change nothing are not recorded.  Returns
+        True if a step was added.'''
+        canvas = self.canvas
+        if everything:
+            items = set(self.items) | set(canvas.find_all())
+        else:
+            items = self.dirtyItems
+            for tag in self.dirtyTags:
+                items.update(canvas.find_withtag(tag))
+        changes, replaced = {}, {}
+        for item in items:
+            itemState = self.itemState(item)
+            oldState = self.items.get(item)
+            if itemState != oldState:
+                changes[item], replaced[item] = itemState, oldState
+                if itemState is None:
+                    del self.items[item]
+                else:
+                    self.items[item] = itemState
+        self.dirtyItems, self.dirtyTags = set(), set()
+        order = oldOrder = None
+        if self.restacked or everything:
+            self.restacked = False
+            newOrder = tuple(canvas.find_all())
+            if newOrder != self.order:
+                oldOrder, order = self.order, newOrder
+                self.order = order
+        oldCode = None
+        if code is not None and code != self.code:
+            oldCode, self.code = self.code, code
+        else:
+            code = None
+        if not (changes or order is not None or code is not None or
+                everything):
+            return False
+        self.timeline.append(changes, order, code,
+                             (self.items, self.order, self.code),
+                             (replaced, oldOrder, oldCode))
+        return True
+
+class TimelinePlayer(object):
+    '''Window to replay a recorded timeline.  The slider seeks to any step
+    and the buttons play the timeline backwards or forwards or pause it.
+    The speed slider changes the playback rate.'''
+
+    BG = 'white'
+    CONTROLS_FONT = ('Helvetica', -12)
+    CODE_FONT = ('Courier', -12)
+    CODE_BG = 'beige'
+    CODE_HIGHLIGHT = 'yellow'
+    FRAME_TIME = 0.05        # Seconds per step at normal speed
+
+    def __init__(
+            self, timeline,  # Timeline to play
+            master=None,     # Parent window for player's Toplevel window
+            title='Replay',
+            canvasWidth=800, # Size of canvas for replay
+            canvasHeight=400):
+        self.timeline = timeline
+        self.window = Toplevel(master)
+        self.window.title(title)
+        self.canvas = Scrim(self.window, width=canvasWidth,
+                            height=canvasHeight, bg=self.BG)
+        self.canvas.pack(side=TOP, expand=True, fill=BOTH)
+        self.itemMap = {}    # Map from recorded item IDs to replayed IDs
+        self.shown = ({}, (), ('', ())) # State shown on canvas and code,
+                             # with its own copy of the item states
+        self.step = None     # Step being shown
+        self.direction = 0   # Playback direction: 1, -1, or 0 when paused
+        self.timer = None    # Timer for next playback step
+
+        controls = Frame(self.window, bg=self.BG)
+        controls.pack(side=TOP, fill=X)
+        for column, (text, command) in enumerate((
+                ('◀', lambda: self.play(-1)), ('❚❚', self.pause),
+                ('▶', lambda: self.play(1)))):
+            Button(controls, text=text, command=command, width=2,
+                   font=self.CONTROLS_FONT).grid(row=0, column=column)
+        self.stepScale = Scale(
+            controls, orient=HORIZONTAL, from_=0, to=max(0, len(timeline) - 1),
+            label='Step', font=self.CONTROLS_FONT, bg=self.BG,
+            command=lambda value: self.seek(int(float(value))))
+        self.stepScale.grid(row=0, column=3, sticky=(E, W))
+        self.speedScale = Scale(
+            controls, orient=HORIZONTAL, from_=0.25, to=4, resolution=0.25,
+            label='Speed', font=self.CONTROLS_FONT, bg=self.BG)
+        self.speedScale.set(1)
+        self.speedScale.grid(row=0, column=4)
+        controls.grid_columnconfigure(3, weight=1)
+        self.codeText = Text(
+            self.window, font=self.CODE_FONT, bg=self.CODE_BG, wrap=NONE,
+            height=12, width=60, state=DISABLED)
+        self.codeText.tag_config('highlight', background=self.CODE_HIGHLIGHT)
+        self.codeText.pack(side=TOP, fill=X)
+        self.window.bind('<Destroy>', lambda event: self.pause()
+                         if event.widget == self.window else None)
+        self.seek(0)
+
+    def seek(self, step):    # Show the state at a particular step
+        step = max(0, min(step, len(self.timeline) - 1))
+        if step == self.step:
+            return
+        self.step = step
+        changed = self.timeline.seek(step)
+        self.show(self.timeline.stateAt(step), changed)
+        if self.stepScale.get() != step:
+            self.stepScale.set(step)
+
+    def show(self,           # Update canvas and code text to show a state,
+             state,          # looking only at the changed items, if given
+             changed=None):
+        canvas, itemMap = self.canvas, self.itemMap
+        items, order, code = state
+        shownItems, shownOrder, shownCode = self.shown
+        if changed is None:
+            changed = set(shownItems) | set(items)
+        with canvas.batch():
+            for item in changed:
+                old, itemState = shownItems.get(item), items.get(item)
+                if old == itemState:
+                    continue
+                if itemState is None:
+                    canvas.delete(itemMap.pop(item))
+                    del shownItems[item]
+                    continue
+                shownItems[item] = itemState
+                kind, coords, options = itemState
+                if old is None or old[0] != kind:
+                    if item in itemMap:
+                        canvas.delete(itemMap[item])
+                    itemMap[item] = getattr(canvas, 'create_' + kind)(
+                        *coords, **dict(options))
+                    shownOrder = None
+                    continue
+                if old[1] != coords:
+                    canvas.coords(itemMap[item], *coords)
+                if old[2] != options:
+                    oldOptions, newOptions = dict(old[2]), dict(options)
+                    for key in oldOptions:  # Restore defaults for options
+                        if key not in newOptions: # no longer set
+                            newOptions[key] = self.timeline.default(kind, key)
+                    canvas.itemconfigure(itemMap[item], **dict(
+                        (key, value) for key, value in newOptions.items()
+                        if value != oldOptions.get(key)))
+        if order is not shownOrder and order != shownOrder:
+            for item in order:
+                if item in itemMap:
+                    canvas.tag_raise(itemMap[item])
+        if code != shownCode:
+            self.showCode(code)
+        self.shown = (shownItems, order, code)
+
+    def showCode(self, code):
+        text, highlights = code
+        self.codeText.configure(state=NORMAL)
+        if text != self.shown[2][0]:
+            self.codeText.delete('1.0', END)
+            self.codeText.insert('1.0', text)
+        self.codeText.tag_remove('highlight', '1.0', END)
+        if highlights:
+            self.codeText.tag_add('highlight', *highlights)
+            self.codeText.see(highlights[0])
+        self.codeText.configure(state=DISABLED)
+
+    def play(self, direction=1): # Play forwards (1) or backwards (-1)
+        self.pause()
+        self.direction = direction
+        if self.step == (len(self.timeline) - 1 if direction > 0 else 0):
+            self.seek(0 if direction > 0 else len(self.timeline) - 1)
+        self.schedule()
+
+    def pause(self):
+        self.direction = 0
+        if self.timer:
+            self.window.after_cancel(self.timer)
+            self.timer = None
+
+    def schedule(self):
+        self.timer = self.window.after(
+            max(1, int(self.FRAME_TIME * 1000 / self.speedScale.get())),
+            self.advance)
+
+    def advance(self):
+        self.timer = None
+        nextStep = self.step + self.direction
+        if self.direction == 0 or not (0 <= nextStep < len(self.timeline)):
+            self.direction = 0
+            return
+        self.seek(nextStep)
+        self.schedule()
@@ -19,10 +19,10 @@ class Array(SortingBase):
         # Fill in initial array values with random integers
         # The display items representing these array cells are created later
         if values is None:
-            for i in range(self.size - 1):
-                self.list.append(drawnValue(random.randrange(self.valMax)))
+            self.list.extend(drawnValue.many(
+                random.randrange(self.valMax) for i in range(self.size - 1)))
         else:
-            self.list = [drawnValue(val) for val in values]
+            self.list = drawnValue.many(values)
         self.makeButtons()
 
         self.display()
@@ -295,6 +295,12 @@ def __promote_successor(self, node={nodeStr}):
             "Erase & Random Fill", lambda: self.clickFill(), numArguments=1,
             validationCmd=vcmd, argHelpText=['number of items'], 
             helpText='Empty tree and fill it\nwith a number of random items')
+        bulkLoadButton = self.addOperation(
+            "Erase & Balanced Fill", lambda: self.clickBulkLoad(),
+            numArguments=1, validationCmd=vcmd,
+            argHelpText=['number of items'],
+            helpText='Empty tree and build a balanced tree\n'
+            'of random items in one pass')
 
         preOrderButton = self.addOperation(
             "Pre-order Traverse", lambda: self.clickTraverse('pre'), 
@@ -307,13 +313,14 @@ def __promote_successor(self, node={nodeStr}):
             helpText='Traverse tree in post-order')
         self.addAnimationButtons()
         return [insertButton, searchButton, deleteButton, fillButton,
-                preOrderButton, inOrderButton, postOrderButton]
+                bulkLoadButton, preOrderButton, inOrderButton, postOrderButton]
 
 if __name__ == '__main__':
     nonneg, negative, options, otherArgs = categorizeArguments(sys.argv[1:])
     if '-r' not in options:  # Use fixed seed for testing consistency unless
         random.seed(3.14159) # random option specified
     tree = BinaryTree(
-        values=[int(a) for a in nonneg] if len(nonneg) > 0 else None)
+        values=[int(a) for a in nonneg] if len(nonneg) > 0 else None,
+        TIDY_LAYOUT='-t' in options)
 
     tree.runVisualization()
@@ -1,6 +1,7 @@
 from tkinter import *
-import random, re
+import random, re, gc
 from enum import Enum
+from contextlib import contextmanager
 
 try:
     from coordinates import *
@@ -10,6 +11,7 @@ try:
     from VisualizationApp import *
     from OutputBox import *
     from TableDisplay import *
+    from TreeLayout import *
 except ModuleNotFoundError:
     from .coordinates import *
     from .drawnValue import *
@@ -18,6 +20,7 @@ except ModuleNotFoundError:
     from .VisualizationApp import *
     from .OutputBox import *
     from .TableDisplay import *
+    from .TreeLayout import *
 
 V = vector
 
@@ -30,17 +33,58 @@ class Node(object):
     a shape with some text centered at particular place on the canvas. A
     line connects it with its parent (unless it's the root node).  The
     drawn value's items should be the (line, shape, text) items on the canvas.
+    Nodes that are not visible can be culled, removing their canvas items.
+    They are redrawn as soon as their drawn value is needed.  The center
+    of a culled node is computed from its position in the tree when used.
     '''
     def __init__(self, drawnValue, center, tag):
-        self.drawnValue = drawnValue
-        self.center = center
+        self._drawnValue = drawnValue
+        self.culled = None    # (app, drawing state) while items are culled
+        self._center = center
         self.tag = tag
+        self.parent = None    # Links to neighboring nodes, maintained by the
+        self.left = None      # NodeArray holding the node.  Nodes removed
+        self.right = None     # from the array keep their last links
+        self.height = 1       # Height of subtree, cached by the NodeArray
+        self.layout = None    # Layout of subtree, cached by a tree layout
+
+    @property
+    def drawnValue(self):
+        self.redraw()
+        return self._drawnValue
+
+    @drawnValue.setter
+    def drawnValue(self, value):
+        if self.culled:
+            self.uncull()
+        self._drawnValue = value
+
+    @property
+    def center(self):       # Culled nodes are placed by their app when used
+        return self.culled[0].culledCenter(self) if self.culled else (
+            self._center)
+
+    @center.setter
+    def center(self, center):
+        self._center = center
+
+    def redraw(self):       # Recreate the canvas items of a culled node
+        if self.culled:
+            app, state = self.uncull()
+            app.redrawCulledNode(self, state)
+
+    def uncull(self):       # Fix the center of a culled node, note that it
+        app, state = self.culled # is drawn, and return its app and drawing
+        self._center = self.center # state
+        self.culled = None
+        app.drawnNodes.add(self)
+        return app, state
 
     def getKey(self):
-        return self.drawnValue.val
+        return self._drawnValue.val
 
     def setKey(self, key):
-        self.drawnValue.val = key
+        self._drawnValue.val = key
 
     def getLine(self):
         return self.drawnValue.items[0]
@@ -53,6 +97,322 @@ class Node(object):
         #         self.getKey(), self.center, self.drawnValue.items)
         return "<Node: {}>".format(self.getKey())
 
+@contextmanager
+def pausedGarbageCollection():
+    '''Context manager that suspends cyclic garbage collection while many
+    linked objects are made at once, as in bulk loading a tree.  None of
+    them are garbage, so collecting only slows down building them.'''
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+class NodeArray(object):
+    '''The nodes of a binary tree addressed by heap-style indices.  The
+    parent, left, and right links of the nodes are the tree; the root is
+    at index 0 and the children of the node at index i are at 2i + 1 and
+    2i + 2, so an index just names the path from the root to a node.
+    Reading an index behaves like a list of length capacity filled with
+    None where nodes are absent.  Writing a node at an index links it
+    with the nodes around that position.  Writing None at an index whose
+    node has children leaves each child subtree anchored at its own
+    index until a node is written above it, which lets the index-based
+    code move subtrees one node at a time.  Rotations and subtree moves
+    relink whole subtrees at once instead.  The capacity starts with a
+    number of full levels and grows by whole levels whenever a node is
+    placed below them, so no subtree is ever cut off.  The node at every
+    index and the index of every node are kept in a pair of dictionaries,
+    so both lookups take constant time; writing a node updates only its
+    own entries, and rotations and moves update only the subtree whose
+    position changes.  The heights of subtrees are cached on the nodes
+    and updated from a change up toward the root until they stop
+    changing.  A layout or invariant checker attached to the array is
+    told about every change.'''
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.levels = (capacity + 1).bit_length() - 1 # Full levels that fit
+        self.count = 0        # Number of nodes in the array
+        self.moves = 0        # Number of rotations and subtree moves
+        self.anchors = {}     # Top nodes of the linked subtrees by index,
+        self.anchorIndex = {} # normally just the root, and their indices
+        self.nodeAt = {}      # Nodes in the array by index and their
+        self.indexOf = {}     # indices by node
+        self.layout = None    # Tree layout to notify of changes
+        self.checker = None   # Invariant checker to notify of changes
+
+    def __len__(self):
+        return self.capacity
+
+    def __iter__(self):       # The nodes in the array, parents first
+        for index in sorted(self.anchors):
+            stack = [self.anchors[index]]
+            while stack:
+                node = stack.pop()
+                yield node
+                if node.right:
+                    stack.append(node.right)
+                if node.left:
+                    stack.append(node.left)
+
+    def checkIndex(self, index): # Indices past the capacity are empty
+        if index < 0:            # until a node is written there
+            index += self.capacity
+        if index < 0:
+            raise IndexError('node index out of range')
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.get(i) for i in range(*index.indices(self.capacity))]
+        return self.get(self.checkIndex(index))
+
+    def get(self, index):   # Node at a nonnegative index, or None
+        return self.nodeAt.get(index)
+
+    def find(self, node):   # Index of a node in the array, or -1
+        return self.indexOf.get(node, -1)
+
+    def items(self):        # Occupied (index, node) pairs in index order
+        return sorted(self.nodeAt.items(), key=lambda pair: pair[0])
+
+    def __setitem__(self, index, node):
+        index = self.checkIndex(index)
+        old = self.get(index)
+        if old is node:
+            return
+        if node is not None:    # A node stored elsewhere is moved
+            moved = self.find(node)
+            if moved >= 0:
+                parent = self.unlink(moved, node)
+                self.updateHeights(parent)
+                self.changed(parent, node)
+                old = self.get(index)
+        parent = None
+        if old is not None:
+            parent = self.unlink(index, old)
+        if node is None:
+            self.updateHeights(parent)
+        else:
+            parent = self.place(index, node)
+            self.updateHeights(node)
+            self.fit(index)
+        self.changed(parent, old, node)
+
+    def unlink(self, index, node):
+        '''Take the node at an index out of the tree, anchoring its
+        children at their indices.  Returns its parent.'''
+        parent = node.parent
+        if self.anchorIndex.pop(node, None) is not None:
+            del self.anchors[index]
+        elif parent.left is node:
+            parent.left = None
+        else:
+            parent.right = None
+        for child, childIndex in ((node.left, 2 * index + 1),
+                                  (node.right, 2 * index + 2)):
+            if child:
+                child.parent = None
+                self.anchors[childIndex] = child
+                self.anchorIndex[child] = childIndex
+        del self.nodeAt[index], self.indexOf[node]
+        self.count -= 1
+        return parent
+
+    def place(self, index, node):
+        '''Put a node that is not in the tree at an empty index, adopting
+        any subtrees anchored below it.  Returns its parent.'''
+        parent = self.get((index - 1) // 2) if index > 0 else None
+        self.link(parent, index, node)
+        node.left = self.adopt(node, 2 * index + 1)
+        node.right = self.adopt(node, 2 * index + 2)
+        self.nodeAt[index], self.indexOf[node] = node, index
+        self.count += 1
+        return parent
+
+    def link(self, parent, index, node): # Make a node the child at an index
+        node.parent = parent             # of a parent, or an anchor if the
+        if parent is None:               # parent is missing
+            self.anchors[index] = node
+            self.anchorIndex[node] = index
+        elif index % 2 == 1:
+            parent.left = node
+        else:
+            parent.right = node
+
+    def adopt(self, parent, index): # Link the subtree anchored at an index
+        child = self.anchors.pop(index, None) # below a parent
+        if child:
+            del self.anchorIndex[child]
+            child.parent = parent
+        return child
+
+    def detach(self, index, node): # Cut the link above the subtree at an
+        parent = node.parent       # index and return the parent
+        if self.anchorIndex.pop(node, None) is not None:
+            del self.anchors[index]
+        elif parent.left is node:
+            parent.left = None
+        else:
+            parent.right = None
+        node.parent = None
+        self.unindex(node)
+        return parent
+
+    def reindex(self, index, node): # Record the indices of the nodes in
+        stack = [(index, node)]     # the subtree linked at an index
+        while stack:
+            index, node = stack.pop()
+            self.nodeAt[index], self.indexOf[node] = node, index
+            if node.left:
+                stack.append((2 * index + 1, node.left))
+            if node.right:
+                stack.append((2 * index + 2, node.right))
+
+    def unindex(self, node): # Forget the indices of a subtree's nodes
+        for node in self.subtree(node):
+            index = self.indexOf.pop(node)
+            if self.nodeAt.get(index) is node:
+                del self.nodeAt[index]
+
+    def rotate(self, index, side):
+        '''Rotate the subtree at an index by raising the top node's child
+        on one side, Child.LEFT or Child.RIGHT, into its place.  Only the
+        links of the top, raised, and inner nodes change, but the indices
+        of the whole subtree are updated.  The subtree must not have any
+        subtrees anchored below it.  The capacity grows if the lowered top
+        node's subtree reaches past it.'''
+        top = self.get(index)
+        raised = top.left if side == Child.LEFT else top.right
+        inner = raised.right if side == Child.LEFT else raised.left
+        parent = top.parent
+        self.unindex(top)
+        if self.anchorIndex.pop(top, None) is not None:
+            del self.anchors[index]
+        self.link(parent, index, raised)
+        top.parent = raised
+        if side == Child.LEFT:
+            raised.right, top.left = top, inner
+        else:
+            raised.left, top.right = top, inner
+        if inner:
+            inner.parent = top
+        self.reindex(index, raised)
+        self.moves += 1
+        self.updateHeights(top, force=2)
+        self.fit(2 * index + (2 if side == Child.LEFT else 1))
+        self.changed(parent, top, raised, inner)
+
+    def move(self, toIndex, fromIndex):
+        '''Replace the subtree at toIndex with the one at fromIndex, which
+        may be empty or lie inside it.  The replaced nodes are removed.
+        The capacity grows if the moved subtree reaches past it.'''
+        toIndex = self.checkIndex(toIndex)
+        moving = self.get(fromIndex) if 0 <= fromIndex else None
+        fromParent = self.detach(fromIndex, moving) if moving else None
+        old = self.get(toIndex)
+        removed = []
+        if old:
+            parent = self.detach(toIndex, old)
+            removed = self.subtree(old)
+        else:
+            parent = self.get((toIndex - 1) // 2) if toIndex > 0 else None
+        for index in [i for i in self.anchors if i > toIndex]:
+            above = index            # Subtrees anchored below toIndex are
+            while above > toIndex:   # replaced too
+                above = (above - 1) // 2
+            if above == toIndex:
+                removed.extend(self.subtree(self.anchors[index]))
+                self.detach(index, self.anchors[index])
+        self.count -= len(removed)
+        self.moves += 1
+        if moving:
+            self.link(parent, toIndex, moving)
+            self.reindex(toIndex, moving)
+            self.fit(toIndex)
+        self.updateHeights(fromParent)
+        self.updateHeights(parent)
+        self.changed(parent, fromParent, moving, *removed)
+
+    def grow(self, levels): # Raise the capacity to hold a number of levels
+        if levels > self.levels:
+            self.levels = levels
+            self.capacity = 2 ** levels - 1
+
+    def fit(self, index):   # Grow to hold the subtree at an index
+        node = self.get(index)
+        if node:
+            self.grow((index + 1).bit_length() - 1 + node.height)
+
+    def subtree(self, node): # The nodes in the subtree below a node
+        nodes, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(child for child in (node.right, node.left) if child)
+        return nodes
+
+    def changed(self, parent, *nodes):
+        '''Tell the layout and checker that the links of the given nodes
+        and the child links of parent, if any, have changed'''
+        if self.layout:
+            self.layout.invalidate(self, parent, *nodes)
+        if self.checker:
+            self.checker.invalidate(self, parent, *nodes)
+
+    def height(self, index): # Cached height of subtree at an index
+        node = self.get(index)
+        return node.height if node else 0
+
+    def updateHeights(self, node, force=1):
+        '''Update the cached heights at a node and its ancestors while
+        they change, always updating the first force of them'''
+        while node is not None:
+            left, right = node.left, node.right
+            height = 1 + max(left.height if left else 0,
+                             right.height if right else 0)
+            if height == node.height and force <= 0:
+                return
+            node.height = height
+            force -= 1
+            node = node.parent
+
+    def release(self):      # Cut the links from the nodes to their parents
+        for node in self:   # so a discarded tree is freed as soon as it is
+            node.parent = None # dropped rather than by garbage collection
+        self.anchors, self.anchorIndex = {}, {}
+        self.nodeAt, self.indexOf = {}, {}
+        self.count = 0
+
+    def load(self, nodes):
+        '''Link a sequence of (index, node) pairs into an empty array,
+        listing parents before their children.  The links and heights are
+        set in one pass from the children up rather than by walking
+        toward the root from each index.'''
+        nodes = [(self.checkIndex(index), node) for index, node in nodes]
+        if nodes:
+            self.grow(max(index for index, node in nodes).bit_length() + 1)
+        get = dict(nodes).get
+        for index, node in reversed(nodes):
+            node.parent = parent = get((index - 1) // 2) if index > 0 else None
+            if parent is None:
+                self.anchors[index] = node
+                self.anchorIndex[node] = index
+            node.left = left = get(2 * index + 1)
+            node.right = right = get(2 * index + 2)
+            node.height = 1 + max(left.height if left else 0,
+                                  right.height if right else 0)
+        self.nodeAt.update(nodes)
+        self.indexOf.update((node, index) for index, node in nodes)
+        self.count += len(nodes)
+        if self.layout:
+            self.layout.dirty = True
+        if self.checker:
+            self.checker.reset()
+
+
 class BinaryTreeBase(VisualizationApp):
     # -------- CONSTANTS ------------------
     FONT_SIZE = -16
@@ -66,15 +426,20 @@ class BinaryTreeBase(VisualizationApp):
     NONE_DOT_COLOR = 'red'
     DEPTH_BOUNDARY_COLOR = 'gray80'
     DEPTH_BOUNDARY_DASH = (5, 10)
+    TIDY_LAYOUT = False
+    CULL_NODES = True         # Draw only visible nodes outside of operations
+    PLACEHOLDER_COLOR = 'gray75'
 
     def __init__(self, RECT=None, CIRCLE_SIZE=None, VAL_MAX=valMax, 
-               ARROW_HEIGHT=None, MAX_LEVEL=None, **kwargs):
+               ARROW_HEIGHT=None, MAX_LEVEL=None, TIDY_LAYOUT=None, **kwargs):
         """Build a VisualizationApp that will show a binary tree on part of the
         canvas within the rectangle bounded by RECT (X0, Y0, X1, Y1) which
         defaults to (0, 0, canvas_width, canvas_height - output_box_height).
         CIRCLE_SIZE is the radius of the circles used for each node in the tree.
         ARROW_HEIGHT is the length of a pointer arrow to point at a node.
         MAX_LEVEL is one more than the maximum node level allowed in the tree.
+        TIDY_LAYOUT places nodes compactly based on the tree's shape instead
+        of at fixed positions for each index.
         """
         super().__init__(**kwargs)
         self.outputFont = (self.VALUE_FONT[0], self.VALUE_FONT[1] * 9 // 10)
@@ -85,11 +450,14 @@ class BinaryTreeBase(VisualizationApp):
                          arrowHeight=ARROW_HEIGHT, maxLevel=MAX_LEVEL,
                          stackWidth=self.STACK_DEFAULT_SIZE[0])
 
-        # tree will be stored in array
+        # tree will be stored in a sparse array with links between nodes
         # root will be index 0
         # root's left child will be index 1, root's right child will be index 2
         self.maxElems = 2 ** self.MAX_LEVEL - 1
-        self.nodes = [None] * self.maxElems
+        self.nodes = NodeArray(self.maxElems)
+        self.drawnNodes = set() # Nodes whose canvas items may be drawn
+        self.layout = TidyTreeLayout(self) if (
+            self.TIDY_LAYOUT if TIDY_LAYOUT is None else TIDY_LAYOUT) else None
 
         self.prevId = -1      # One up counter for node tags
 
@@ -151,11 +519,7 @@ class BinaryTreeBase(VisualizationApp):
             return node
         elif not isinstance(node, Node):
             return -1
-        for i, n in enumerate(self.nodes):
-            if node is n:
-                return i
-      
-        return -1
+        return self.nodes.find(node)
 
     # return's the node or node index's left child index
     def getLeftChildIndex(self, node):
@@ -183,18 +547,21 @@ class BinaryTreeBase(VisualizationApp):
         return self.getChild(node, Child.RIGHT)
 
     def getChild(self, node, leftOrRight):
+        if isinstance(node, Node):
+            return node.left if leftOrRight == Child.LEFT else node.right
         childIndex = self.getChildIndex(node, leftOrRight)
         return self.getNode(childIndex)
 
     def getNode(self, nodeIndex):  # Get a node by its index, if valid
         if isinstance(nodeIndex, Node):
             return nodeIndex
-        if 0 <= nodeIndex and nodeIndex < self.maxElems:
+        if 0 <= nodeIndex:
             return self.nodes[nodeIndex]
         
     # returns the node or node index's parent node
     def getParent(self, node):
         if self.isRoot(node): return None
+        if isinstance(node, Node): return node.parent
         return self.getNode(self.getParentIndex(node))
 
     # returns the root node
@@ -216,6 +583,8 @@ class BinaryTreeBase(VisualizationApp):
     def getChildDirection(self, node):
         if node is None or self.isRoot(node):
             return None
+        if isinstance(node, Node) and node.parent:
+            return Child.LEFT if node.parent.left is node else Child.RIGHT
         nodeIndex = self.getIndex(node) if isinstance(node, Node) else node
         return Child.RIGHT if nodeIndex % 2 == 0 else Child.LEFT
 
@@ -232,17 +601,27 @@ class BinaryTreeBase(VisualizationApp):
         n = self.getNode(node)
         return n.getLine() if n else None
 
-    # returns the level of the node
+    # returns the level of the node, which follows from its index
     def getLevel(self, node):
-        if self.isRoot(node): return 0
-        else: return self.getLevel(self.getParent(node)) + 1
+        return (self.getIndex(node) + 1).bit_length() - 1
 
-    # returns the height of the node from its deepest leaf
+    # returns the height of the node from its deepest leaf, as cached on
+    # the node by the nodes array
     def getHeight(self, node):
         n = self.getNode(node) if isinstance(node, int) else node
-        if n is None: return 0
-        return max(
-            self.getHeight(child) for child in self.getChildren(node)) + 1
+        return n.height if n else 0
+
+    def verifyCachedHeights(self):
+        '''Compare the heights cached on the nodes with heights computed
+        from the whole tree.  Returns a list of (index, node, cached height,
+        actual height) tuples for nodes whose cached height is wrong.'''
+        heights, mismatches = {}, []
+        for index, node in reversed(self.nodes.items()):
+            heights[index] = 1 + max(heights.get(2 * index + 1, 0),
+                                     heights.get(2 * index + 2, 0))
+            if node.height != heights[index]:
+                mismatches.append((index, node, node.height, heights[index]))
+        return mismatches
       
     # returns a tuple of the left and right child of node
     def getChildren(self, node):
@@ -276,21 +655,15 @@ class BinaryTreeBase(VisualizationApp):
             nodeTree: 'Subtree in the form of a nested list of nodes',
             index: 'Index to place top of subtree',
             updateCenter:'Update center coords for new position' =True
-    ) -> 'Returns tuple of nodes that could not be stored (past depth limit)':
-
+    ):
         empty = (nodeTree is None or len(nodeTree) != 3 or
                  not isinstance(nodeTree[0], Node)) # Is this an empty node?
-        cutoff = ((nodeTree[0],)              # Cutoff non-empty nodes
-                  if not empty and len(self.nodes) <= index else  # Beyond limit
-                  ())  # otherwise nothing to cutoff
-        if index < len(self.nodes): # Store node at index if valid
-            self.nodes[index] = None if empty else nodeTree[0]
-            if updateCenter and self.nodes[index]: # Update center if requested
-                self.nodes[index].center = self.nodeCenter(index)
-        return cutoff if empty else (
-            cutoff +
-            self.storeNodeTree(nodeTree[1], self.getLeftChildIndex(index)) +
-            self.storeNodeTree(nodeTree[2], self.getRightChildIndex(index)))
+        self.nodes[index] = None if empty else nodeTree[0] # Array grows
+        if updateCenter and self.nodes[index]: # Update center if requested
+            self.nodes[index].center = self.nodeCenter(index)
+        if not empty:
+            self.storeNodeTree(nodeTree[1], self.getLeftChildIndex(index))
+            self.storeNodeTree(nodeTree[2], self.getRightChildIndex(index))
 
     # ----------- DRAWING METHODS -------------------
    
@@ -476,7 +849,8 @@ class BinaryTreeBase(VisualizationApp):
     def nodeCenter(self, node):
         '''Calculate the coordinates for node based on its index in the nodes
         array or from its center attribute, if a Node is passed.  The index -1
-        indicates the binary tree object.
+        indicates the binary tree object.  With a tidy layout, the nodes in the
+        tree and their empty child indices are placed by the layout.
         '''
         if isinstance(node, Node):
             return node.center
@@ -485,6 +859,10 @@ class BinaryTreeBase(VisualizationApp):
                 (0, 0, 40, 30) if getattr(self, 'treeObject', None) is None else
                 self.canvas.coords(self.treeObject[0]))
             return V(V(treeObjectBox[:2]) + V(treeObjectBox[2:])) / 2 
+        if self.layout:
+            center = self.layout.center(node)
+            if center:
+                return center
         level, i = 0, node
         x, y = 0, 0
         while 0 < i:
@@ -493,6 +871,52 @@ class BinaryTreeBase(VisualizationApp):
             i = (i - 1) // 2
         return self.ROOT_X0 + x, self.ROOT_Y0 + y
         
+    def nodeCenters(self):
+        '''Generate (index, node, center) for every node in the tree from the
+        root downward in time linear in the number of nodes'''
+        if self.layout:
+            yield from self.layout.centers()
+            return
+        root = self.nodes[0]      # Offsets from the root are summed in the
+        stack = [(0, root, 0, 0,  # same order as nodeCenter()
+                  self.TREE_WIDTH / 4)] if root else []
+        while stack:
+            index, node, x, y, dx = stack.pop()
+            yield index, node, (self.ROOT_X0 + x, self.ROOT_Y0 + y)
+            for child, childIndex, childX in (
+                    (node.right, 2 * index + 2, x + dx),
+                    (node.left, 2 * index + 1, x - dx)):
+                if child:
+                    stack.append((childIndex, child, childX,
+                                  y + self.LEVEL_GAP, dx / 2))
+
+    def drawnSubtree(self, index):
+        '''Find the (index, node) pairs of the drawn nodes in the subtree at
+        an index, parents first, by checking the index of each drawn node
+        rather than visiting the whole subtree'''
+        top, pairs = index + 1, []  # Indices plus one hold the path to a
+        for node in self.drawnNodes: # node in their bits after the first
+            nodeIndex = self.nodes.find(node)
+            below = (nodeIndex + 1).bit_length() - top.bit_length()
+            if 0 <= nodeIndex and 0 <= below and (
+                    (nodeIndex + 1) >> below == top):
+                pairs.append((nodeIndex, node))
+        pairs.sort(key=lambda pair: pair[0])
+        return pairs
+
+    def drawnSubtreeItemCoords(self, index):
+        '''Place the drawn nodes in the subtree at an index and return
+        their canvas items and coordinates, leaving out the line from the
+        top node to its parent.'''
+        items, coords = [], []
+        for nodeIndex, node in self.drawnSubtree(index):
+            node.center = self.nodeCenter(nodeIndex)
+            first = 1 if nodeIndex == index else 0 # Skip top node's line
+            items.extend(node.drawnValue.items[first:])
+            coords.extend(self.nodeItemCoords(
+                node, parent=self.getParentIndex(nodeIndex))[first:])
+        return items, coords
+
     def nodeShapeCoordinates(self, center, radius=None):
         if radius is None: radius = self.CIRCLE_SIZE
         offset = V(radius, radius)
@@ -597,6 +1021,8 @@ class BinaryTreeBase(VisualizationApp):
             if nodeIndex < 0:
                 continue
             node.center = self.nodeCenter(nodeIndex)
+            if node.culled:
+                continue
             i = 0
             for item, coords in zip(
                     node.drawnValue.items,
@@ -613,13 +1039,33 @@ class BinaryTreeBase(VisualizationApp):
             for item, coords in zip(moveItems, moveCoords):
                 self.canvas.coords(item, coords)
 
+    def relayout(self, sleepTime=0.05):
+        '''Move the nodes whose tidy layout positions differ from where they
+        were last drawn, along with the lines from their children.'''
+        if not self.layout:
+            return
+        moved, lines = [], []
+        for index, node, center in self.layout.centers():
+            if (abs(node.center[0] - center[0]) > 0.5 or
+                abs(node.center[1] - center[1]) > 0.5):
+                moved.append(node)
+                lines.extend(child for child in (node.left, node.right)
+                             if child)
+        movedSet = set(moved)
+        self.restoreNodePositions(
+            moved + [child for child in lines if child not in movedSet],
+            sleepTime=sleepTime)
+
     def restoreNodes(self, nodes=None):
         '''Restore canvas items to match internal representation of nodes.
-        If nodes in None, all nodes in the tree are restored.'''
+        If nodes in None, all drawn nodes in the tree are restored.  Culled
+        nodes are placed when they are drawn again.'''
         if nodes is None:
-            nodes = self.getAllDescendants(self.getRoot())
+            nodes = self.drawnTreeNodes()
         self.restoreNodePositions(nodes, sleepTime=0)
         for node in nodes: # Restore text label above shape background
+            if node.culled:
+                continue
             shape, text = node.drawnValue.items[1:3]
             if self.canvas.type(text):
                 self.canvas.itemConfig(text, text=str(node.getKey()))
@@ -665,11 +1111,137 @@ class BinaryTreeBase(VisualizationApp):
             coords = self.outputBoxCoords(font=font, **config)
         return OutputBox(self, coords, outputFont=font, **kwargs)
         
+    def visibleNodes(self):
+        '''Find the nodes to draw by going down the tree level by level.
+        Nodes are drawn if they are in or near the visible canvas.  The
+        descent stops at the first level below the visible canvas or whose
+        nodes are less than a node radius apart and too crowded to read.
+        Returns the list of nodes to draw and the indices of the subtrees
+        below them that are summarized by placeholders.'''
+        left, top, right, bottom = V(self.visibleCanvas()) + V(
+            (-2 * self.CIRCLE_SIZE,) * 2 + (2 * self.CIRCLE_SIZE,) * 2)
+        drawn, summarized = [], []
+        level = [(0, self.nodes[0])] if self.nodes[0] else []
+        while level:
+            centers = [self.nodeCenter(index) for index, node in level]
+            xs = sorted(x for x, y in centers)
+            if centers[0][1] > bottom or any(
+                    b - a < self.CIRCLE_SIZE for a, b in zip(xs, xs[1:])):
+                summarized = [index for index, node in level]
+                break
+            nextLevel = []
+            for (index, node), (x, y) in zip(level, centers):
+                if left <= x and x <= right and top <= y:
+                    drawn.append(node)
+                nextLevel.extend(
+                    (childIndex, child)
+                    for childIndex, child in ((2 * index + 1, node.left),
+                                              (2 * index + 2, node.right))
+                    if child)
+            level = nextLevel
+        return drawn, summarized
+
+    def drawVisibleNodes(self):
+        '''Cull the canvas items of nodes that are not visible, redraw the
+        visible nodes that were culled, and draw a placeholder wedge from
+        each visible node to any of its subtrees that are summarized.'''
+        self.canvas.delete('placeholder')
+        drawn, summarized = self.visibleNodes()
+        keep = set(drawn)
+        for node in self.drawnTreeNodes():
+            if node not in keep:
+                self.cullNode(node)
+        for node in drawn:
+            node.redraw()
+        for index in summarized:
+            parent = self.nodes[(index - 1) // 2] if index > 0 else None
+            if parent in keep:
+                self.createPlaceholder(
+                    self.nodeCenter((index - 1) // 2), self.nodeCenter(index))
+
+    def createPlaceholder(self, parentCenter, center, radius=None):
+        '''Draw a wedge pointing from a parent node to the center of a
+        subtree that is not drawn'''
+        if radius is None: radius = self.CIRCLE_SIZE
+        direction = V(V(center) - V(parentCenter)).unit()
+        tip = V(parentCenter) + V(V(direction) * radius)
+        side = V(V(V(direction).normal2d()) * (radius / 2))
+        wedge = self.canvas.create_polygon(
+            *tip, *(V(center) + side), *(V(center) - side),
+            fill=self.PLACEHOLDER_COLOR, outline='', tags='placeholder')
+        self.canvas.tag_lower(wedge)
+        return wedge
+
+    def culledNodeState(self, node):
+        '''Drawing state needed to redraw a node after its canvas items are
+        culled, as keyword arguments for createNodeShape'''
+        return {'color':
+                self.canvas.itemConfig(node.drawnValue.items[1], 'fill')}
+
+    def cullNode(self, node, deleteItems=True): # Remove the canvas items of
+        state = self.culledNodeState(node)       # a node until needed again
+        if deleteItems:
+            self.canvas.delete(
+                *(item for item in node.drawnValue.items if item))
+        node.drawnValue.items = ()
+        node.culled = (self, state)
+        self.drawnNodes.discard(node)
+
+    def cullAllNodes(self, deleteItems=False): # Cull every drawn node,
+        for node in list(self.drawnNodes):     # usually before clearing the
+            if not node.culled:                # canvas
+                self.cullNode(node, deleteItems=deleteItems)
+
+    def drawnTreeNodes(self):
+        '''Forget the drawn nodes that were culled or removed from the tree
+        and return a list of the rest'''
+        self.drawnNodes = set(
+            node for node in self.drawnNodes
+            if not node.culled and 0 <= self.getIndex(node))
+        return list(self.drawnNodes)
+
+    def culledCenter(self, node): # Center of a culled node at its index
+        index = self.getIndex(node)
+        return self.nodeCenter(index) if 0 <= index else node._center
+
+    def createCulledNode(self, key, center=(0, 0), **state):
+        '''Create a node without canvas items that is drawn when needed.  The
+        state holds the keyword arguments for createNodeShape.'''
+        if 'color' not in state:
+            state['color'] = drawnValue.palette[self.nextColor]
+            self.nextColor = (self.nextColor + 1) % len(drawnValue.palette)
+        node = Node(drawnValue(key), center, self.generateTag())
+        node.culled = (self, state)
+        return node
+
+    def redrawCulledNode(self, node, state):
+        node.drawnValue.items = self.createNodeShape(
+            *node.center, node.getKey(), node.tag,
+            parent=self.getParentIndex(self.getIndex(node)), **state)
+
     def cleanUp(self, *args, **kwargs):
-        '''Customize cleanUp to restore nodes when call stack is empty'''
+        '''Customize cleanUp to restore nodes when call stack is empty.  With a
+        tidy layout, nodes that moved in the layout slide to their new
+        positions first if animations are running, or jump there in
+        instant mode.'''
+        if self.layout and len(self.callStack) <= 1:
+            if self.instant:
+                self.relayout(sleepTime=0)
+            elif self.animationsRunning():
+                try:
+                    self.relayout()
+                except UserStop:
+                    pass
         super().cleanUp(*args, **kwargs)
         if len(self.callStack) == 0:
             self.restoreNodes()
+            if self.CULL_NODES:
+                self.drawVisibleNodes()
+            if self.DEBUG:
+                for index, node, cached, actual in self.verifyCachedHeights():
+                    print('Node {} at index {} has cached height {} but '
+                          'actual height {}'.format(
+                              node, index, cached, actual))
 
     # draw a line pointing to node from its parent, if any
     def createLine(self, node):
@@ -706,6 +1278,7 @@ class BinaryTreeBase(VisualizationApp):
       
         # create the Node object
         node = Node(drawnValueObj, center, tag)
+        self.drawnNodes.add(node)
 
         # increment size
         self.size += 1
@@ -727,8 +1300,9 @@ class BinaryTreeBase(VisualizationApp):
         # create the shapes and drawnValue obj
         drawnValueObj = drawnValue(key, *self.createNodeShape(
             *node.center, node.getKey(), tag))
-      
-        return Node(drawnValueObj, node.center, tag)
+        copy = Node(drawnValueObj, node.center, tag)
+        self.drawnNodes.add(copy)
+        return copy
 
     def setRoot(self, node):
         self.nodes[0] = node
@@ -736,7 +1310,7 @@ class BinaryTreeBase(VisualizationApp):
     # set the node's left child
     def setLeftChild(self, node, child, updateLink=False):
         index = self.getLeftChildIndex(node)
-        if index != -1 and index < len(self.nodes):
+        if index != -1:
             self.nodes[index] = child
             if updateLink and child and child.getLine():
                 self.canvas.coords(child.getLine(), 
@@ -748,7 +1322,7 @@ class BinaryTreeBase(VisualizationApp):
     # set the node's right child
     def setRightChild(self, node, child, updateLink=False):
         index = self.getRightChildIndex(node)
-        if index != -1 and index < len(self.nodes):
+        if index != -1:
             self.nodes[index] = child
             if updateLink and child and child.getLine():
                 self.canvas.coords(child.getLine(), 
@@ -776,7 +1350,7 @@ class BinaryTreeBase(VisualizationApp):
             replacementIndex: 'Source subtree index',
             callEnviron: 'Animation environment',
             wait: 'Wait time between animation steps' =0.1
-    ) -> 'Returns tuple of nodes that could not be stored (past depth limit)':
+    ):
         '''Animate the process by moving leftOrRight child link
         first (when nodeIndex points at an existing node) and then the
         nodes in the subtrees'''
@@ -812,20 +1386,20 @@ class BinaryTreeBase(VisualizationApp):
                     self.removeNodeDrawing(node)
                     self.removeNodeInternal(node)
 
-        cutoff = self.moveSubtree(childIndex, replacementIndex)
+        self.moveSubtree(childIndex, replacementIndex)
         self.restoreNodePositions(replacementNodes, sleepTime=wait /10)
-        return cutoff
         
     def moveSubtree(
             self: 'Move internal subtree from one place to another',
             toIndex: 'Destination subtree root',
             fromIndex: 'Source subtree root'
-    ) -> 'Returns tuple of nodes that could not be stored (past depth limit)':
-        if toIndex < 0 or len(self.nodes) <= toIndex or toIndex == fromIndex:
-            return ()  # Do nothing if the to index is out of bounds or = from
+    ):
+        if toIndex < 0 or toIndex == fromIndex:
+            return  # Do nothing if the to index is out of bounds or = from
 
-        return self.storeNodeTree(self.getNodeTree(fromIndex, erase=True),
-                                  toIndex)
+        self.nodes.move(toIndex, fromIndex)
+        for index, node in self.drawnSubtree(toIndex): # Culled nodes are
+            node.center = self.nodeCenter(index)        # placed when drawn
 
     def generateTag(self):
         self.prevId+=1
@@ -839,7 +1413,7 @@ class BinaryTreeBase(VisualizationApp):
             nodeIndex = node
 
         # stop if node does not exist in tree
-        if not node or nodeIndex == -1 or nodeIndex >= self.maxElems: return
+        if not node or nodeIndex == -1: return
         
         # get the child indices
         leftIndex = 2*nodeIndex + 1
@@ -857,23 +1431,30 @@ class BinaryTreeBase(VisualizationApp):
     # empty the tree's data
     def emptyTree(self):
         self.size = 0
-        self.nodes = [None] * self.maxElems
+        if getattr(self, 'nodes', None) is not None:
+            self.nodes.release()
+        self.nodes = NodeArray(self.maxElems)
 
     def display(self, fields=[], treeLabel="BinarySearchTree"):
+        self.cullAllNodes()   # Nodes are redrawn after clearing the canvas
         self.canvas.delete("all")
         self.treeObject = self.createTreeObject(fields=fields, label=treeLabel)
         self.fieldwidths = self.treeObjectFieldWidths(fields=fields)
-        newNodes = [self.createNode(
-            node.getKey(), None if i == 0 else self.nodes[(i - 1) // 2],
-            Child.LEFT if i % 2 == 1 else Child.RIGHT) if node else None
-                    for i, node in enumerate(self.nodes)]
-        self.nodes = newNodes
-        self.size = sum(1 if node else 0 for node in self.nodes)
-        depthBoundary = (self.nodeCenter(len(self.nodes) + 1) +
-                         self.nodeCenter(len(self.nodes) * 2))
+        self.size = self.nodes.count
+        depthBoundary = (self.nodeCenter(self.maxElems + 1) +
+                         self.nodeCenter(self.maxElems * 2))
         self.canvas.create_line(
             *depthBoundary, fill=self.DEPTH_BOUNDARY_COLOR,
             dash=self.DEPTH_BOUNDARY_DASH, tags='boundary')
+        self.drawAllNodes()
+
+    def drawAllNodes(self):  # Set all node centers and draw the nodes that
+        self.restoreNodes()  # should be visible
+        if self.CULL_NODES:
+            self.drawVisibleNodes()
+        else:
+            for node in self.nodes:
+                node.redraw()
         
     # remove the node's drawing and optionally its line
     def removeNodeDrawing(self, node, line=False):
@@ -893,8 +1474,9 @@ class BinaryTreeBase(VisualizationApp):
         list of integers or an integer number of random values'''
         callEnviron = self.createCallEnvironment()
         
-        nums = random.sample(range(self.valMax), values) if (
-            isinstance(values, int)) else values
+        nums = random.sample(
+            range(self.valMax), min(values, self.valMax)) if (
+                isinstance(values, int)) else values
         self.emptyTree()
         for num in nums:
             self.insert(num, animation=animation)
@@ -902,6 +1484,43 @@ class BinaryTreeBase(VisualizationApp):
 
         self.cleanUp(callEnviron)
 
+    def bulkLoad(self, values):
+        '''Empty the tree and fill it with values which is either a list of
+        integers or an integer number of random values.  The values are
+        sorted and placed in a balanced tree in linear time by splitting
+        them at their middles.  No canvas items are made for the nodes
+        until the tree is displayed at the end.'''
+        nums = random.sample(
+            range(self.valMax), min(values, self.valMax)) if (
+                isinstance(values, int)) else values
+        keys = sorted(set(nums))
+        if len(keys) > self.maxElems:
+            self.setMessage('Too many items, {}, for a tree of {} levels'
+                            .format(len(keys), self.MAX_LEVEL))
+            return False
+        self.emptyTree()
+        with pausedGarbageCollection():
+            nKeys, placed = len(keys), []
+            levelStates = self.balancedLevelStates(nKeys)
+            stack = [(0, nKeys, 0, 0)] if keys else [] # Key ranges and the
+            while stack:                      # index and level of their node
+                low, high, index, level = stack.pop()
+                middle = (low + high) // 2
+                placed.append((index, self.createCulledNode(
+                    keys[middle], **levelStates[level])))
+                if middle + 1 < high:
+                    stack.append((middle + 1, high, 2 * index + 2, level + 1))
+                if low < middle:
+                    stack.append((low, middle, 2 * index + 1, level + 1))
+            self.nodes.load(placed)
+            self.display()
+        return True
+
+    def balancedLevelStates(self, nKeys):
+        '''Drawing states for the nodes on each level of a balanced tree of
+        nKeys built by bulkLoad'''
+        return [{}] * nKeys.bit_length()
+
     _findCode = '''
 def __find(self, goal={goal}):
    current = self.__root
@@ -1118,6 +1737,13 @@ for key, data in tree.traverse({traverseType!r}):
     
     def traverseExample(
             self, traverseType, code=traverseExampleCode, start=True, wait=0.1):
+        self.runSteps(self.traverseExampleSteps(
+            traverseType, code=code, start=start, wait=wait))
+
+    def traverseExampleSteps(
+            self, traverseType, code=traverseExampleCode, start=True, wait=0.1):
+        '''Generator for the steps of traverseExample, yielding the time to
+        wait before the next one'''
         callEnviron = self.createCallEnvironment(
             code=code.format(**locals()), sleepTime=wait / 10, 
             startAnimations=start)
@@ -1137,11 +1763,16 @@ for key, data in tree.traverse({traverseType!r}):
         iteratorCall = 'key, data in tree.traverse({traverseType!r})'.format(
             **locals())
         self.iteratorStack = []
-        self.highlightCode(iteratorCall, callEnviron, wait=wait)
+        yield from self.highlightCodeSteps(
+            iteratorCall, callEnviron, wait=wait)
         dataIndex = None
         localVars = ()
         colors = self.canvas.fadeItems(localVars)
-        for key, items in self.traverse(traverseType):
+        for step in self.traverseSteps(traverseType):
+            if not isinstance(step, tuple): # Pass on the iterator's waits
+                yield step
+                continue
+            key, items = step
             self.canvas.restoreItems(localVars, colors)
             nodeindex, _  = self._find(key, animation=False, code='')
             if dataIndex is None:
@@ -1150,24 +1781,28 @@ for key, data in tree.traverse({traverseType!r}):
                 callEnviron |= set(dataIndex)
                 localVars += dataIndex
             else:
-                self.moveItemsTo(
-                    dataIndex, self.indexCoords(nodeindex, 1, orientation=-135),
-                    sleepTime=wait / 10)
-
-            self.highlightCode('print(key)', callEnviron, wait=wait)
+                yield from self.sequenceSteps(
+                    self.moveItemsToSequence(
+                        dataIndex,
+                        self.indexCoords(nodeindex, 1, orientation=-135)),
+                    wait / 10)
+
+            yield from self.highlightCodeSteps(
+                'print(key)', callEnviron, wait=wait)
             keyItem = self.canvas.copyItem(
                 self.getNode(nodeindex).drawnValue.items[2])
             callEnviron.add(keyItem)
             outputBox.appendText(keyItem, sleepTime=wait / 10)
             callEnviron.discard(keyItem)
 
-            self.highlightCode(iteratorCall, callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                iteratorCall, callEnviron, wait=wait)
             colors = self.canvas.fadeItems(localVars)
 
         self.canvas.restoreItems(localVars, colors)
         while self.iteratorStack:
             self.cleanUp(self.iteratorStack.pop())
-        self.highlightCode([], callEnviron)
+        yield from self.highlightCodeSteps([], callEnviron)
         self.cleanUp(callEnviron)
         
     traverseCode = '''
@@ -1195,20 +1830,31 @@ def traverse(self, traverseType={traverseType!r}):
 '''
 
     def traverse(self, traverseType='in', code=traverseCode, wait=0.1):
+        for step in self.traverseSteps(traverseType, code=code, wait=wait):
+            if isinstance(step, tuple): # Yield the items and wait
+                yield step             # between the other steps
+            else:
+                self.wait(step or 0)
+
+    def traverseSteps(self, traverseType='in', code=traverseCode, wait=0.1):
+        '''Generator for the steps of traverse.  It yields the time to
+        wait before the next step, or a (key, items) tuple for each item
+        the iterator yields'''
         callEnviron = self.createCallEnvironment(
             code=code.format(**locals()))
 
-        if self.highlightCode("traverseType not in ['pre', 'in', 'post']",
-                              callEnviron, wait=wait,
-                              returnValue=traverseType not in
-                              ['pre', 'in', 'post']):
-            self.highlightCode(
+        if (yield from self.highlightCodeSteps(
+                "traverseType not in ['pre', 'in', 'post']",
+                callEnviron, wait=wait,
+                returnValue=traverseType not in ['pre', 'in', 'post'])):
+            yield from self.highlightCodeSteps(
                 re.compile(r'raise ValueError.*\n.*str\(traverseType\)\)'),
                 callEnviron, color=self.EXCEPTION_HIGHLIGHT)
             self.cleanUp(callEnviron)
             return
         
-        self.highlightCode('stack = Stack()', callEnviron, wait=wait)
+        yield from self.highlightCodeSteps(
+            'stack = Stack()', callEnviron, wait=wait)
         self.traverseStack = Table(
             self, self.STACK_0,
             cellWidth=self.STACK_CELL_SIZE[0], cellBorderWidth=1,
@@ -1217,15 +1863,19 @@ def traverse(self, traverseType={traverseType!r}):
             labelFont=self.VARIABLE_FONT, labelColor=self.VARIABLE_COLOR)
         callEnviron |= set(self.traverseStack.items())
 
-        self.highlightCode('stack.push(self.__root)', callEnviron, wait=wait)
+        yield from self.highlightCodeSteps(
+            'stack.push(self.__root)', callEnviron, wait=wait)
         root = self.getRoot()
-        self.stackPush(root, callEnviron, wait=wait,
-                       center=self.nodeCenter(0 if root else -1))
+        yield from self.stackPushSteps(
+            root, callEnviron, wait=wait,
+            center=self.nodeCenter(0 if root else -1))
 
         itemArrow = None
-        self.highlightCode('not stack.isEmpty()', callEnviron, wait=wait)
+        yield from self.highlightCodeSteps(
+            'not stack.isEmpty()', callEnviron, wait=wait)
         while len(self.traverseStack) > 0:
-            self.highlightCode('item = stack.pop()', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'item = stack.pop()', callEnviron, wait=wait)
             if itemArrow is None:
                 arrowCoords = self.traverseItemArrowCoords(None)
                 center0 = BBoxCenter(self.traverseStack.cellCoords(0))
@@ -1241,51 +1891,56 @@ def traverse(self, traverseType={traverseType!r}):
                     itemArrow, self.traverseItemArrowCoords(None),
                     sleepTime=0, steps=1)
             
-            item = self.stackPop(callEnviron, wait=wait)
+            item = yield from self.stackPopSteps(callEnviron, wait=wait)
             
-            if self.highlightCode(
+            if (yield from self.highlightCodeSteps(
                     'isinstance(item, self.__Node)', callEnviron, wait=wait,
-                    returnValue=isinstance(item.val, Node)):
-                self.moveItemsLinearly(
-                    itemArrow, self.traverseItemArrowCoords(item.val),
-                    sleepTime=wait / 10)
-                if self.highlightCode(
+                    returnValue=isinstance(item.val, Node))):
+                yield from self.sequenceSteps(
+                    self.moveItemsLinearlySequence(
+                        itemArrow, self.traverseItemArrowCoords(item.val)),
+                    wait / 10)
+                if (yield from self.highlightCodeSteps(
                         "traverseType == 'post'", callEnviron,
-                        wait=wait, returnValue=traverseType == 'post'):
-                    self.highlightCode(
+                        wait=wait, returnValue=traverseType == 'post')):
+                    yield from self.highlightCodeSteps(
                         ('stack.push((item.key, item.data))', 1), callEnviron)
-                    self.stackPush(item, callEnviron, wait=wait)
+                    yield from self.stackPushSteps(
+                        item, callEnviron, wait=wait)
 
-                self.highlightCode(
+                yield from self.highlightCodeSteps(
                     'stack.push(item.rightChild)', callEnviron)
-                self.stackPush(
+                yield from self.stackPushSteps(
                     self.getRightChild(item.val), callEnviron, wait=wait,
                     center=self.nodeCenter(self.getRightChildIndex(item.val)))
 
-                if self.highlightCode(
+                if (yield from self.highlightCodeSteps(
                         "traverseType == 'in'", callEnviron,
-                        wait=wait, returnValue=traverseType == 'in'):
-                    self.highlightCode(
+                        wait=wait, returnValue=traverseType == 'in')):
+                    yield from self.highlightCodeSteps(
                         ('stack.push((item.key, item.data))', 2), callEnviron)
-                    self.stackPush(item, callEnviron, wait=wait)
+                    yield from self.stackPushSteps(
+                        item, callEnviron, wait=wait)
 
-                self.highlightCode(
-                    'stack.push(item.leftChild)', callEnviron),
-                self.stackPush(
+                yield from self.highlightCodeSteps(
+                    'stack.push(item.leftChild)', callEnviron)
+                yield from self.stackPushSteps(
                     self.getLeftChild(item.val), callEnviron, wait=wait,
                     center=self.nodeCenter(self.getLeftChildIndex(item.val)))
 
-                if self.highlightCode(
+                if (yield from self.highlightCodeSteps(
                         "traverseType == 'pre'", callEnviron,
-                        wait=wait, returnValue=traverseType == 'pre'):
-                    self.highlightCode(
+                        wait=wait, returnValue=traverseType == 'pre')):
+                    yield from self.highlightCodeSteps(
                         ('stack.push((item.key, item.data))', 3), callEnviron)
-                    self.stackPush(item, callEnviron, wait=wait)
+                    yield from self.stackPushSteps(
+                        item, callEnviron, wait=wait)
                 
-            elif self.highlightCode(
+            elif (yield from self.highlightCodeSteps(
                     ('item', 11), callEnviron, wait=wait,
-                    returnValue=item.val is not None):
-                self.highlightCode('yield item', callEnviron, wait=wait)
+                    returnValue=item.val is not None)):
+                yield from self.highlightCodeSteps(
+                    'yield item', callEnviron, wait=wait)
                 itemCoords = self.yieldCallEnvironment(
                     callEnviron, sleepTime=wait / 10)
                 yield item.val, item.items
@@ -1296,12 +1951,13 @@ def traverse(self, traverseType={traverseType!r}):
             else:
                 self.dispose(callEnviron, *item.items)
                 
-            self.highlightCode('not stack.isEmpty()', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'not stack.isEmpty()', callEnviron, wait=wait)
 
-        self.highlightCode([], callEnviron)
+        yield from self.highlightCodeSteps([], callEnviron)
         self.cleanUp(callEnviron)
 
-    def stackPush(
+    def stackPushSteps(
             self,
             thing: 'A Node, tuple, or None to push on the traverse stack',
             callEnviron: 'Call environment for traverse iterator',
@@ -1348,12 +2004,14 @@ def traverse(self, traverseType={traverseType!r}):
             moveTo = (
                 (V(cellCenter) - dotRadius) + (V(cellCenter) + dotRadius),)
             
-        self.moveItemsLinearly(toMove, moveTo, sleepTime=wait / 10,
-                               startFont=startFont, endFont=endFont)
+        yield from self.sequenceSteps(
+            self.moveItemsLinearlySequence(
+                toMove, moveTo, startFont=startFont, endFont=endFont),
+            wait / 10)
         self.traverseStack.append(drawnValue(thing, *toMove))
         callEnviron |= set(self.traverseStack.items())
         
-    def stackPop(
+    def stackPopSteps(
             self,
             callEnviron: 'Call environment for traverse iterator',
             wait: 'Total animation time' =0.1):
@@ -1361,8 +2019,10 @@ def traverse(self, traverseType={traverseType!r}):
         topCenter = BBoxCenter(self.canvas_coords(top.items[0]))
         labelCoords = V(self.traverseItemLabelCoords()) + V(
             0, self.traverseStack.cellHeight)
-        self.moveItemsBy(top.items, (0, labelCoords[1] - topCenter[1]),
-                         sleepTime=wait / 10)
+        yield from self.sequenceSteps(
+            self.moveItemsBySequence(
+                top.items, (0, labelCoords[1] - topCenter[1])),
+            wait / 10)
         return self.traverseStack.pop()
 
     traverseItemConfig = {
@@ -1417,9 +2077,15 @@ def traverse(self, traverseType={traverseType!r}):
         if val is not None:
             self.fill(val)
             self.clearArgument()
+
+    def clickBulkLoad(self):
+        val = self.validArgument()
+        if val is not None:
+            self.bulkLoad(val)
+            self.clearArgument()
         
     def clickTraverse(self, traverseType):
-        self.traverseExample(traverseType, start=self.startMode())
+        return self.traverseExampleSteps(traverseType, start=self.startMode())
 
     def print(self, indentBy=' ' * 4, **kwargs):
         self.__pTree(self.nodes[0], "", indentBy, **kwargs)
@@ -1434,8 +2100,8 @@ def traverse(self, traverseType={traverseType!r}):
             
     def orphaned(self, **kwargs):
         allNodes = self.getAllDescendants(0)
-        for i, node in enumerate(self.nodes):
-            if node is not None and node not in allNodes:
+        for i, node in self.nodes.items():
+            if node not in allNodes:
                 print('At {:2d} {} is an orphan'.format(i, node), **kwargs)
                 parentIndex = self.getParentIndex(i)
                 if 0 <= i and self.nodes[parentIndex] is not None:
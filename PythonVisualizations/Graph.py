@@ -405,7 +405,7 @@ def depthFirst(self, n={nVal}):
         visited = Table(
             self, (self.vertexTable.x0 + self.vertexTable.cellWidth + gap,
                    self.vertexTable.y0),
-            *[drawnValue(initialValue) for k in range(size)],
+            *drawnValue.many([initialValue] * size),
             label='visited', labelAnchor=SW, vertical=True, 
             labelFont=self.vertexTable.labelFont, 
             cellWidth=self.vertexTable.cellHeight, see=see,
@@ -973,7 +973,7 @@ def sortVertsTopologically(
         inDegree = Table(
             self, (self.vertexTable.x0 + self.vertexTable.cellWidth + gap,
                    self.vertexTable.y0),
-            *[drawnValue(0) for k in range(self.nVertices())],
+            *drawnValue.many([0] * self.nVertices()),
             label='inDegree', labelAnchor=SW, vertical=True, 
             labelFont=self.vertexTable.labelFont, 
             cellWidth=self.vertexTable.cellHeight, see=True,
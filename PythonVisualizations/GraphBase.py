@@ -101,15 +101,17 @@ class GraphBase(VisualizationApp):
     def createAdjacencyMatrixPanel(
             self, suffix=' Adjacency Matrix', anchor=SE):
         newTitle = self.title + suffix
-        self.adjacencyMatrixPanel = Toplevel()
+        self.adjacencyMatrixPanel = self.widgetClass(Toplevel)()
         self.adjacencyMatrixPanel.title(newTitle)
-        self.adjMatControlBar = Frame(self.adjacencyMatrixPanel)
+        self.adjMatControlBar = self.widgetClass(Frame)(
+            self.adjacencyMatrixPanel)
         self.adjMatControlBar.pack(side=TOP)
-        panelTitle = Label(self.adjMatControlBar, text='Adjacency\nMatrix',
-                           font=self.ADJACENCY_MATRIX_FONT)
+        panelTitle = self.widgetClass(Label)(
+            self.adjMatControlBar, text='Adjacency\nMatrix',
+            font=self.ADJACENCY_MATRIX_FONT)
         panelTitle.pack(side=LEFT)
         self.createAdjacencyMatrixControlImages()
-        self.matrixExpose = Button(
+        self.matrixExpose = self.widgetClass(Button)(
             self.adjMatControlBar, image=self.adjMatControlImages['collapse'],
             command=self.toggleAdjacencyMatrixDisplay, takefocus=False,
             width=20)
@@ -117,7 +119,7 @@ class GraphBase(VisualizationApp):
         self.matrixExpose.pack(side=LEFT, expand=False, fill=Y)
         self.buttonPadX = int(self.window.winfo_fpixels(
             self.matrixExpose['padx']))
-        self.adjMatrixFrame = Frame(
+        self.adjMatrixFrame = self.widgetClass(Frame)(
             self.adjacencyMatrixPanel, bg=self.ADJACENCY_MATRIX_BG)
         self.adjMatrixFrame.pack(side=TOP, expand=FALSE, fill=None)
 
@@ -141,7 +143,8 @@ class GraphBase(VisualizationApp):
         targetSize = (height, height)
         names = ('collapse', 'uncollapse')
         self.adjMatControlImages = dict(
-            (name, getPhotoImage(name + '-symbol.png', targetSize))
+            (name, name if self.headless else # Use names when headless
+             getPhotoImage(name + '-symbol.png', targetSize))
             for name in names)
         return self.adjMatControlImages
             
@@ -215,7 +218,8 @@ class GraphBase(VisualizationApp):
                     '<{}>'.format(event), genericEventHandler(), '+')
         for cell in self.adjMatrixFrame.grid_slaves():
             cell.grid_forget()
-        self.adjMatrix00 = Frame(self.adjMatrixFrame, bg='white')
+        self.adjMatrix00 = self.widgetClass(Frame)(
+            self.adjMatrixFrame, bg='white')
         self.adjMatrix00.grid(row=0, column=0, sticky=(N, E, S, W))
         self.selectedVertices = [None for _ in range(self.selectableVertices)]
         self.dragItems = None
@@ -778,11 +782,11 @@ class GraphBase(VisualizationApp):
             self.canvas.tag_bind(item, '<Button-1>',
                                  lambda e: self.setArgument(label))
 
-        columnLabel = Label(
+        columnLabel = self.widgetClass(Label)(
             self.adjMatrixFrame, text=label, bg=vertColor,
             font=self.ADJACENCY_MATRIX_FONT)
         columnLabel.grid(row=0, column=vertID, sticky=(N, E, S, W))
-        rowLabel = Label(
+        rowLabel = self.widgetClass(Label)(
             self.adjMatrixFrame, text=label, bg=vertColor,
             font=self.ADJACENCY_MATRIX_FONT)
         rowLabel.grid(row=vertID, column=0, sticky=(N, E, S, W))
@@ -790,7 +794,8 @@ class GraphBase(VisualizationApp):
         columnIDs = [vert.val[1]]
         for otherVert in self.vertices.values():
             if vert == otherVert:
-                frame = Frame(self.adjMatrixFrame, bg=vertColor)
+                frame = self.widgetClass(Frame)(
+                    self.adjMatrixFrame, bg=vertColor)
                 frame.grid(row=vertID, column=vertID, 
                                sticky=(N, E, S, W))
             else:
@@ -864,11 +869,11 @@ class GraphBase(VisualizationApp):
 
     def createEdgeWeightEntry(self, color, edge, weight=None, parent=None):
         if self.weighted:
-            entry = Entry(parent or self.adjMatrixFrame, bg=color,
-                          font=self.ADJACENCY_MATRIX_FONT, width=2,
-                          state=NORMAL,
-                          takefocus=False, validate='key', 
-                          validatecommand=self.weightValidate)
+            entry = self.widgetClass(Entry)(
+                parent or self.adjMatrixFrame, bg=color,
+                font=self.ADJACENCY_MATRIX_FONT, width=2, state=NORMAL,
+                takefocus=False, validate='key', 
+                validatecommand=self.weightValidate)
             self.weight(entry, weight)
             def edgeWeightChange(event):
                 if not (isinstance(edge, tuple) and len(edge) == 2):
@@ -901,9 +906,9 @@ class GraphBase(VisualizationApp):
                        self.weight(event.widget, self.edgeWeight(*edge)) or
                        event.widget.configure(bg=color), '+')
         else:
-            entry = Button(self.adjMatrixFrame, bg=color,
-                           text='', font=self.ADJACENCY_MATRIX_FONT,
-                           state=NORMAL, takefocus=False)
+            entry = self.widgetClass(Button)(
+                self.adjMatrixFrame, bg=color, text='',
+                font=self.ADJACENCY_MATRIX_FONT, state=NORMAL, takefocus=False)
             def toggleEdge():
                 if not self.operationMutex.acquire(blocking=False):
                     self.setMessage('Cannot change edge during other operation')
@@ -924,7 +929,7 @@ class GraphBase(VisualizationApp):
             except KeyError:
                 raise ValueError('String "{}" is not a recognized widget'.
                                  format(weightEntry))
-        if isinstance(weightEntry, Entry):
+        if isinstance(weightEntry, self.widgetClass(Entry)):
             text = weightEntry.get() 
             if newWeight is None:
                 return int(text) if text else 0
@@ -935,7 +940,7 @@ class GraphBase(VisualizationApp):
                 if newWeight:
                     weightEntry.insert(0, str(newWeight))
                 weightEntry['state'] = state
-        elif isinstance(weightEntry, Button):
+        elif isinstance(weightEntry, self.widgetClass(Button)):
             text = weightEntry['text']
             if newWeight is None:
                 return int(text) if text else 0
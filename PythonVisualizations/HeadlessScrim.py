@@ -0,0 +1,758 @@
+__doc__ = """
+Headless stand-ins for the Tk window, control widgets, and Scrim canvas.
+These let visualization apps run their operations without a display,
+e.g. for profiling and regression testing.  The HeadlessScrim keeps
+canvas item state in Python arrays indexed by item ID and implements
+the subset of the Tk Canvas API used by the visualizations.  The
+HeadlessWindow is a Tcl interpreter without Tk, so Tk variables,
+'after' timers, and registered commands still work.
+"""
+
+import math, sys
+import tkinter
+from tkinter import *
+from tkinter import _stringify, _flatten
+
+try:
+    from coordinates import *
+    from tkUtilities import *
+except ModuleNotFoundError:
+    from .coordinates import *
+    from .tkUtilities import *
+
+V = vector
+
+def tclValue(value):     # Convert option values to strings like Tk does
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_stringify(v) for v in value)
+    return str(value)
+
+class HeadlessWindow(Tk):
+    '''Top level "window" that has a Tcl interpreter but no display.
+    Widget geometry and window manager requests are ignored.'''
+
+    def __init__(self, className='Tk'):
+        super().__init__(className=className, useTk=False)
+        self.bindings = {}
+        self.titleText = ''
+        self.destroyed = False
+        if tkinter._support_default_root and tkinter._default_root is None:
+            tkinter._default_root = self  # Allow variables without master
+
+    def title(self, string=None):
+        if string is None:
+            return self.titleText
+        self.titleText = string
+
+    wm_title = title
+
+    def bind(self, sequence=None, func=None, add=None):
+        return headlessBind(self, sequence, func, add)
+
+    def unbind(self, sequence, funcid=None):
+        self.bindings.pop(sequence, None)
+
+    def wait_variable(self, name='PY_VAR'): # tkwait is part of Tk, so
+        self.tk.call('vwait', name)         # use Tcl's vwait
+
+    waitvar = wait_variable
+
+    def update_idletasks(self):
+        self.tk.call('update', 'idletasks')
+
+    def focus_get(self):
+        return None
+
+    def mainloop(self, n=0):
+        pass
+
+    def destroy(self):
+        if self.destroyed:
+            return
+        self.destroyed = True
+        for child in list(self.children.values()):
+            child.destroy()
+        generateEvent(self, '<Destroy>', EventType.Destroy)
+        if tkinter._default_root is self:
+            tkinter._default_root = None
+
+    def state(self, newstate=None): return NORMAL
+    wm_state = state
+    def winfo_toplevel(self): return self
+    def winfo_width(self): return 1
+    def winfo_height(self): return 1
+    def winfo_geometry(self): return '1x1+0+0'
+    def winfo_ismapped(self): return False
+    def winfo_screenwidth(self): return 1920
+    def winfo_screenheight(self): return 1080
+    def winfo_fpixels(self, number): return float(number or 0)
+
+def headlessBind(widget, sequence, func, add):
+    'Record or query event bindings on a headless widget'
+    if sequence is None:
+        return tuple(widget.bindings.keys())
+    if func is None:
+        return widget.bindings.get(sequence, [])
+    funcs = widget.bindings.get(sequence, []) if add else []
+    funcs.append(func)
+    widget.bindings[sequence] = funcs
+    return '{}{}'.format(id(func), getattr(func, '__name__', ''))
+
+def generateEvent(widget, sequence, eventType, **attributes):
+    'Call the handlers bound to a sequence on a headless widget'
+    event = Event()
+    event.widget, event.type = widget, eventType
+    event.x, event.y, event.state = 0, 0, 0
+    for key in attributes:
+        setattr(event, key, attributes[key])
+    for func in widget.bindings.get(sequence, []):
+        if callable(func):
+            func(event)
+
+class HeadlessWidget(object):
+    '''Stand in for a Tk widget that records its configuration, bindings,
+    and geometry management requests without displaying anything.
+    '''
+    _counter = 0
+
+    def __init__(self, master=None, cnf={}, **kw):
+        self.master = master if master else tkinter._default_root
+        self.options = dict(cnf, **kw)
+        self.children = {}
+        self.bindings = {}
+        self.managed = None   # Geometry manager info ('grid' or 'pack', dict)
+        self.gridded = {}     # Slave widgets managed by this widget's grid
+        self.packed = {}      # Slave widgets managed by this widget's packer
+        HeadlessWidget._counter += 1
+        self._name = '!headless{}'.format(HeadlessWidget._counter)
+        if self.master is not None:
+            self.master.children[self._name] = self
+        self._w = '{}.{}'.format(
+            getattr(self.master, '_w', '').rstrip('.'), self._name)
+
+    def __str__(self):
+        return self._w
+
+    def cget(self, key):
+        return self.options.get(key, '')
+
+    __getitem__ = cget
+
+    def configure(self, cnf=None, **kw):
+        if isinstance(cnf, str):
+            return (cnf, cnf, cnf.capitalize(), '0', self.options.get(cnf, 0))
+        self.options.update(cnf or {}, **kw)
+
+    config = configure
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    def bind(self, sequence=None, func=None, add=None):
+        return headlessBind(self, sequence, func, add)
+
+    def unbind(self, sequence, funcid=None):
+        self.bindings.pop(sequence, None)
+
+    def after(self, ms, func=None, *args):
+        return self._root().after(ms, func, *args)
+
+    def after_idle(self, func, *args):
+        return self._root().after_idle(func, *args)
+
+    def after_cancel(self, id):
+        return self._root().after_cancel(id)
+
+    def _root(self):
+        return self.master._root()
+
+    def grid(self, cnf={}, **kw):
+        info = dict(cnf, **kw)
+        if self.managed and self.managed[0] == 'grid':
+            info = dict(self.managed[1], **info)
+        info.setdefault('row', len(getattr(self.master, 'gridded', ())))
+        info.setdefault('column', 0)
+        self.managed = ('grid', info)
+        if isinstance(self.master, HeadlessWidget):
+            self.master.gridded[self._name] = self
+
+    grid_configure = grid
+
+    def grid_info(self):
+        return dict(self.managed[1]) if (
+            self.managed and self.managed[0] == 'grid') else {}
+
+    def grid_forget(self):
+        if isinstance(self.master, HeadlessWidget):
+            self.master.gridded.pop(self._name, None)
+        self.managed = None
+
+    grid_remove = grid_forget
+
+    def grid_slaves(self, row=None, column=None): # Most recent first, like Tk
+        return [w for w in reversed(list(self.gridded.values()))
+                if (row is None or int(w.grid_info()['row']) == row) and
+                (column is None or int(w.grid_info()['column']) == column)]
+
+    def grid_size(self):
+        columns, rows = 0, 0
+        for w in self.gridded.values():
+            info = w.grid_info()
+            columns = max(columns, int(info['column']) +
+                          int(info.get('columnspan', 1)))
+            rows = max(rows, int(info['row']) + int(info.get('rowspan', 1)))
+        return columns, rows
+
+    def grid_columnconfigure(self, index, cnf={}, **kw): pass
+    def grid_rowconfigure(self, index, cnf={}, **kw): pass
+    columnconfigure, rowconfigure = grid_columnconfigure, grid_rowconfigure
+
+    def pack(self, cnf={}, **kw):
+        self.managed = ('pack', dict(cnf, **kw))
+        if isinstance(self.master, HeadlessWidget):
+            self.master.packed[self._name] = self
+
+    pack_configure = pack
+
+    def pack_forget(self):
+        if isinstance(self.master, HeadlessWidget):
+            self.master.packed.pop(self._name, None)
+        self.managed = None
+
+    def pack_slaves(self):
+        return list(self.packed.values())
+
+    def destroy(self):
+        for child in list(self.children.values()):
+            child.destroy()
+        if self.master is not None:
+            self.master.children.pop(self._name, None)
+            if isinstance(self.master, HeadlessWidget):
+                self.master.gridded.pop(self._name, None)
+                self.master.packed.pop(self._name, None)
+
+    def focus_set(self): pass
+    focus = focus_set
+    def update(self): self._root().update()
+    def update_idletasks(self): self._root().update_idletasks()
+    def transient(self, master=None): pass
+    def overrideredirect(self, boolean=None): pass
+    def geometry(self, newGeometry=None): pass
+    wm_geometry = geometry
+    def title(self, string=None): pass
+    def withdraw(self): pass
+    def deiconify(self): pass
+    def state(self, statespec=None): return 'normal'
+
+    def winfo_width(self): return int(self.options.get('width', 1) or 1)
+    def winfo_height(self): return int(self.options.get('height', 1) or 1)
+    def winfo_geometry(self):
+        return '{}x{}+0+0'.format(self.winfo_width(), self.winfo_height())
+    def winfo_reqwidth(self): return self.winfo_width()
+    def winfo_reqheight(self): return self.winfo_height()
+    def winfo_toplevel(self): return self._root()
+    def winfo_ismapped(self): return False
+    def winfo_rootx(self): return 0
+    def winfo_rooty(self): return 0
+    def winfo_pointerx(self): return 0
+    def winfo_pointery(self): return 0
+    def winfo_screenwidth(self): return 1920
+    def winfo_screenheight(self): return 1080
+    def winfo_fpixels(self, number): return float(number or 0)
+
+class HeadlessButton(HeadlessWidget):
+    'Stand in for a Tk button whose invoke() runs its command'
+
+    def __init__(self, master=None, cnf={}, **kw):
+        super().__init__(master, cnf, **kw)
+        self.options.setdefault('state', NORMAL)
+
+    def invoke(self):
+        if self.options.get('state') == DISABLED:
+            return ''
+        self.select()
+        command = self.options.get('command')
+        return command() if callable(command) else ''
+
+    def select(self): pass
+
+class HeadlessCheckbutton(HeadlessButton):
+    def select(self):
+        var = self.options.get('variable')
+        if var is not None:
+            on, off = self.options.get('onvalue', 1), self.options.get(
+                'offvalue', 0)
+            var.set(off if str(var.get()) == str(on) else on)
+
+class HeadlessRadiobutton(HeadlessButton):
+    def select(self):
+        var = self.options.get('variable')
+        if var is not None:
+            var.set(self.options.get('value', ''))
+
+class HeadlessEntry(HeadlessWidget):
+    'Stand in for a Tk entry holding a text string'
+    def __init__(self, master=None, cnf={}, **kw):
+        super().__init__(master, cnf, **kw)
+        self.text = ''
+
+    def get(self):
+        return self.text
+
+    def index(self, index):
+        return len(self.text) if index == END else int(index)
+
+    def insert(self, index, string):
+        i = self.index(index)
+        self.text = self.text[:i] + str(string) + self.text[i:]
+
+    def delete(self, first, last=None):
+        i = self.index(first)
+        j = i + 1 if last is None else self.index(last)
+        self.text = self.text[:i] + self.text[j:]
+
+    def select_range(self, start, end): pass
+    def icursor(self, index): pass
+
+class HeadlessScale(HeadlessWidget):
+    'Stand in for a Tk scale holding a numeric value'
+    def get(self):
+        return self.options.get('value', self.options.get('from_', 0))
+
+    def set(self, value):
+        self.options['value'] = value
+
+class HeadlessScrollbar(HeadlessWidget):
+    def get(self):
+        return (0.0, 1.0)
+    def set(self, first, last): pass
+
+headlessWidgetClasses = {
+    Button: HeadlessButton, ttk.Button: HeadlessButton,
+    Checkbutton: HeadlessCheckbutton, Radiobutton: HeadlessRadiobutton,
+    Entry: HeadlessEntry, Scale: HeadlessScale, Scrollbar: HeadlessScrollbar,
+}
+
+def headlessWidgetClass(tkClass):
+    'Get the headless class that stands in for a Tk widget class'
+    return headlessWidgetClasses.get(tkClass, HeadlessWidget)
+
+class HeadlessScrim(HeadlessWidget, Scrim):
+    '''Drop-in replacement for Scrim that keeps canvas items in memory.
+    Item types, coordinates, options, and tags are held in lists indexed
+    by item ID.  The display list maps each item to a stacking key, a
+    tuple that sorts in stacking order, so that raising and lowering
+    items doesn't reorder the others.  Keys placing an item just above or
+    below another extend that item's key, so any item can be placed next
+    to any other without searching for its neighbors.  The stacking
+    order is sorted only when it is needed.  Widget methods come from
+    HeadlessWidget and the Scrim convenience methods work unchanged.
+    '''
+
+    ITEM_DEFAULTS = {
+        'line': {
+            'fill': 'black', 'activefill': '', 'disabledfill': '',
+            'width': '1.0', 'activewidth': '0.0', 'disabledwidth': '0.0',
+            'dash': '', 'activedash': '', 'disableddash': '',
+            'arrow': 'none', 'arrowshape': '8 10 3', 'capstyle': 'butt',
+            'joinstyle': 'round', 'smooth': '0', 'splinesteps': '12',
+            'stipple': ''},
+        'rectangle': {
+            'fill': '', 'outline': 'black', 'activefill': '',
+            'activeoutline': '', 'disabledfill': '', 'disabledoutline': '',
+            'width': '1.0', 'activewidth': '0.0', 'disabledwidth': '0.0',
+            'dash': '', 'activedash': '', 'disableddash': '', 'stipple': '',
+            'outlinestipple': ''},
+        'polygon': {
+            'fill': 'black', 'outline': '', 'activefill': '',
+            'activeoutline': '', 'disabledfill': '', 'disabledoutline': '',
+            'width': '1.0', 'activewidth': '0.0', 'disabledwidth': '0.0',
+            'dash': '', 'activedash': '', 'disableddash': '',
+            'joinstyle': 'round', 'smooth': '0', 'splinesteps': '12',
+            'stipple': ''},
+        'text': {
+            'fill': 'black', 'activefill': '', 'disabledfill': '',
+            'text': '', 'font': 'Helvetica -12', 'anchor': 'center',
+            'justify': 'left', 'width': '0', 'angle': '0.0',
+            'underline': '-1'},
+        'image': {'image': '', 'activeimage': '', 'disabledimage': '',
+                  'anchor': 'center'},
+        'window': {'window': '', 'width': '0', 'height': '0',
+                   'anchor': 'center'},
+        'bitmap': {'bitmap': '', 'foreground': 'black', 'background': '',
+                   'activeforeground': '', 'activebackground': '',
+                   'disabledforeground': '', 'disabledbackground': '',
+                   'anchor': 'center'},
+    }
+    ITEM_DEFAULTS['oval'] = ITEM_DEFAULTS['rectangle']
+    ITEM_DEFAULTS['arc'] = dict(ITEM_DEFAULTS['rectangle'], start='0.0',
+                                extent='90.0', style='pieslice')
+
+    def __init__(self, master=None, cnf={}, **kw):
+        HeadlessWidget.__init__(self, master, cnf, **kw)
+        self.batchDepth, self.batched = 0, []
+        self.types = [None]       # Item type indexed by item ID (0 unused)
+        self.itemCoords = [None]  # Item coordinates indexed by item ID
+        self.itemOptions = [None] # Item option dictionaries by item ID
+        self.itemTags = [None]    # Item tag tuples by item ID
+        self.itemBindings = {}    # Bindings by tag or item ID
+        self.tagIndex = {}        # Sets of item IDs by tag
+        self.displayList = {}     # Stacking keys by item ID
+        self.stackingOrder = []   # Sorted item IDs, None when out of date
+        self.topKey = 0           # Keys for the top and bottom of the stack
+        self.bottomKey = 0        # and for placing items next to others
+        self.nextKey = 1
+
+    # Batching is not needed when changes are applied directly
+    def queueCommand(self, *args):
+        return False
+
+    def flush(self):
+        pass
+
+    # Item lookup
+    def findItems(self, tagOrId):
+        '''Get list of item IDs for an item ID or tag.  Multiple items are
+        returned in stacking order.'''
+        if isinstance(tagOrId, int) or (
+                isinstance(tagOrId, str) and tagOrId.isdigit()):
+            item = int(tagOrId)
+            return [item] if item in self.displayList else []
+        if tagOrId == 'all':
+            return list(self.stacked())
+        items = self.tagIndex.get(tagOrId)
+        if not items:
+            return []
+        if len(items) == 1:
+            return list(items)
+        return sorted(items, key=self.displayList.__getitem__)
+
+    def stacked(self):        # Item IDs in stacking order (bottom first)
+        if self.stackingOrder is None:
+            self.stackingOrder = sorted(
+                self.displayList, key=self.displayList.__getitem__)
+        return self.stackingOrder
+
+    def find_withtag(self, tagOrId):
+        return tuple(self.findItems(tagOrId))
+
+    def find_all(self):
+        return tuple(self.stacked())
+
+    def itemCount(self):
+        return len(self.displayList)
+
+    def find_overlapping(self, x1, y1, x2, y2):
+        region = (x1, y1, x2, y2)
+        return tuple(item for item in self.stacked()
+                     if BBoxesOverlap(self.itemBBox(item), region))
+
+    def find_enclosed(self, x1, y1, x2, y2):
+        region = (x1, y1, x2, y2)
+        return tuple(item for item in self.stacked()
+                     if BBoxContains(region, self.itemBBox(item)))
+
+    def find_closest(self, x, y, halo=None, start=None):
+        items = self.stacked()
+        if not items:
+            return ()
+        return (min(reversed(items), key=lambda item: distance2(
+            BBoxCenter(self.itemBBox(item)), (x, y))),)
+
+    def type(self, tagOrId):
+        items = self.findItems(tagOrId)
+        return self.types[items[0]] if items else None
+
+    def gettags(self, tagOrId):
+        items = self.findItems(tagOrId)
+        return self.itemTags[items[0]] if items else ()
+
+    # Item creation and deletion
+    def createItem(self, itemType, args, kw):
+        if args and isinstance(args[-1], dict):
+            kw = dict(args[-1], **kw)
+            args = args[:-1]
+        item = len(self.types)
+        self.types.append(itemType)
+        self.itemCoords.append([float(c) for c in _flatten(args)])
+        self.itemOptions.append({})
+        self.itemTags.append(())
+        self.topKey += 1
+        self.displayList[item] = (self.topKey, 0)
+        if self.stackingOrder is not None:
+            self.stackingOrder.append(item)
+        self.setOptions(item, kw)
+        self.noteChange(item)
+        self.noteRestack()
+        return item
+
+    def create_arc(self, *args, **kw):
+        return self.createItem('arc', args, kw)
+    def create_bitmap(self, *args, **kw):
+        return self.createItem('bitmap', args, kw)
+    def create_image(self, *args, **kw):
+        return self.createItem('image', args, kw)
+    def create_line(self, *args, **kw):
+        return self.createItem('line', args, kw)
+    def create_oval(self, *args, **kw):
+        return self.createItem('oval', args, kw)
+    def create_polygon(self, *args, **kw):
+        return self.createItem('polygon', args, kw)
+    def create_rectangle(self, *args, **kw):
+        return self.createItem('rectangle', args, kw)
+    def create_text(self, *args, **kw):
+        return self.createItem('text', args, kw)
+    def create_window(self, *args, **kw):
+        return self.createItem('window', args, kw)
+
+    def delete(self, *args):
+        for tagOrId in args:
+            for item in self.findItems(tagOrId):
+                self.noteChange(item)
+                self.noteRestack()
+                for tag in self.itemTags[item]:
+                    self.tagIndex[tag].discard(item)
+                    if not self.tagIndex[tag]:
+                        del self.tagIndex[tag]
+                del self.displayList[item]
+                self.stackingOrder = None
+                self.itemBindings.pop(item, None)
+                self.types[item] = self.itemCoords[item] = None
+                self.itemOptions[item] = self.itemTags[item] = None
+
+    # Item options
+    def setOptions(self, item, kw):
+        options = self.itemOptions[item]
+        for key, value in kw.items():
+            if key == 'tags':
+                self.setTags(item, value)
+            else:
+                options[key] = tclValue(value)
+
+    def setTags(self, item, tags):
+        tags = tuple(dict.fromkeys( # Drop repeated tags
+            tags.split() if isinstance(tags, str) else
+            (str(t) for t in _flatten((tags,)))))
+        for tag in self.itemTags[item]:
+            self.tagIndex[tag].discard(item)
+        self.itemTags[item] = tags
+        for tag in tags:
+            self.tagIndex.setdefault(tag, set()).add(item)
+
+    def itemOption(self, item, key):
+        if key == 'tags':
+            return ' '.join(self.itemTags[item])
+        if key == 'state':
+            return self.itemOptions[item].get(key, '')
+        return self.itemOptions[item].get(
+            key, self.ITEM_DEFAULTS[self.types[item]].get(key, ''))
+
+    def itemconfigure(self, tagOrId, cnf=None, **kw):
+        items = self.findItems(tagOrId)
+        if kw or isinstance(cnf, dict):
+            kw = dict(cnf or {}, **kw)
+            self.noteChange(*items)
+            for item in items:
+                self.setOptions(item, kw)
+            return
+        if not items:
+            return None
+        item = items[0]
+        defaults = self.ITEM_DEFAULTS[self.types[item]]
+        if isinstance(cnf, str):
+            key = cnf.lstrip('-')
+            return (key, '', '', defaults.get(key, ''),
+                    self.itemOption(item, key))
+        return dict((key, (key, '', '', defaults.get(key, ''),
+                           self.itemOption(item, key)))
+                    for key in tuple(defaults) + ('state', 'tags'))
+
+    itemconfig = itemconfigure
+
+    def itemStyle(self, tagOrId): # Options are already held in memory, so
+        return None               # there is no separate style store
+
+    def itemcget(self, tagOrId, option):
+        items = self.findItems(tagOrId)
+        return self.itemOption(items[0], option.lstrip('-')) if items else ''
+
+    # Item coordinates
+    def coords(self, tagOrId, *args):
+        items = self.findItems(tagOrId)
+        if args:
+            self.noteChange(*items[:1])
+            if items:
+                self.itemCoords[items[0]] = [
+                    float(c) for c in _flatten(args)]
+            return
+        return tuple(self.itemCoords[items[0]]) if items else []
+
+    def move(self, tagOrId, xAmount, yAmount):
+        delta = (float(xAmount), float(yAmount))
+        self.noteChange(tagOrId)
+        for item in self.findItems(tagOrId):
+            coords = self.itemCoords[item]
+            for i in range(len(coords)):
+                coords[i] += delta[i % 2]
+
+    def scale(self, tagOrId, xOrigin, yOrigin, xScale, yScale):
+        origin, factor = (xOrigin, yOrigin), (xScale, yScale)
+        self.noteChange(tagOrId)
+        for item in self.findItems(tagOrId):
+            coords = self.itemCoords[item]
+            for i in range(len(coords)):
+                coords[i] = origin[i % 2] + (
+                    coords[i] - origin[i % 2]) * factor[i % 2]
+
+    def itemBBox(self, item):   # Compute the bounding box of a single item
+        kind, coords = self.types[item], self.itemCoords[item]
+        if not coords:
+            return None
+        if kind == 'text':
+            font = parseTkFont(self.itemOption(item, 'font'))
+            text = self.itemOption(item, 'text')
+            size = V(textWidth(font, text), textHeight(font, text))
+            anchor = self.itemOption(item, 'anchor')
+            upperLeft = V(V(coords[:2]) - V(size / 2)) - V(
+                V(size / 2) * V(self.anchorVectors.get(anchor, (0, 0))))
+            return tuple(map(int, upperLeft + (V(upperLeft) + size)))
+        if kind in ('window', 'image', 'bitmap'):
+            size = V(float(self.itemOption(item, 'width') or 0),
+                     float(self.itemOption(item, 'height') or 0))
+            anchor = self.itemOption(item, 'anchor')
+            upperLeft = V(V(coords[:2]) - V(size / 2)) - V(
+                V(size / 2) * V(self.anchorVectors.get(anchor, (0, 0))))
+            return tuple(map(int, upperLeft + (V(upperLeft) + size)))
+        halfWidth = float(self.itemOption(item, 'width') or 1) / 2
+        xs, ys = coords[0::2], coords[1::2]
+        return (math.floor(min(xs) - halfWidth), math.floor(min(ys) - halfWidth),
+                math.ceil(max(xs) + halfWidth), math.ceil(max(ys) + halfWidth))
+
+    def bbox(self, *args):
+        bboxes = [bbox for tagOrId in (args or ('all',))
+                  for item in self.findItems(tagOrId)
+                  for bbox in (self.itemBBox(item),) if bbox]
+        return BBoxUnion(*bboxes) if bboxes else None
+
+    # Stacking order
+    def tag_raise(self, tagOrId, aboveThis=None):
+        items = self.findItems(tagOrId)
+        self.noteRestack()
+        if aboveThis is None:
+            for item in items:
+                self.topKey += 1
+                self.displayList[item] = (self.topKey, 0)
+            self.stackingOrder = None
+        else:
+            self.restack(items, aboveThis, True)
+
+    def tag_lower(self, tagOrId, belowThis=None):
+        items = self.findItems(tagOrId)
+        self.noteRestack()
+        if belowThis is None:
+            for item in reversed(items):
+                self.bottomKey -= 1
+                self.displayList[item] = (self.bottomKey, 0)
+            self.stackingOrder = None
+        else:
+            self.restack(items, belowThis, False)
+
+    lift = tkraise = tag_raise
+    lower = tag_lower
+
+    def restack(self, items, reference, above):
+        '''Move items just above or below the reference item, keeping
+        their order.  Every key ends in 0, so replacing that 0 with a small
+        positive or negative step sorts just above or below the reference.
+        Later steps are smaller to place items closer to the reference.'''
+        refs = self.findItems(reference)
+        if not refs:
+            return
+        ref = refs[-1] if above else refs[0]
+        refKey = self.displayList[ref][:-1]
+        moving = [item for item in items if item != ref]
+        for item in reversed(moving) if above else moving:
+            self.nextKey += 1
+            step = 1 / self.nextKey
+            self.displayList[item] = refKey + (step if above else -step, 0)
+        self.stackingOrder = None
+
+    # Tags
+    def addtag_withtag(self, newtag, tagOrId):
+        self.noteChange(tagOrId)
+        for item in self.findItems(tagOrId):
+            if newtag not in self.itemTags[item]:
+                self.setTags(item, self.itemTags[item] + (newtag,))
+
+    def dtag(self, tagOrId, tagToDelete=None):
+        if tagToDelete is None:
+            tagToDelete = tagOrId
+        self.noteChange(*self.findItems(tagOrId))
+        for item in self.findItems(tagOrId):
+            self.setTags(item, tuple(
+                t for t in self.itemTags[item] if t != tagToDelete))
+
+    # Bindings
+    def tag_bind(self, tagOrId, sequence=None, func=None, add=None):
+        key = int(tagOrId) if isinstance(tagOrId, str) and tagOrId.isdigit() \
+              else tagOrId
+        bindings = self.itemBindings.setdefault(key, {})
+        if sequence is None:
+            return tuple(bindings.keys())
+        if func is None:
+            funcs = bindings.get(sequence, [])
+            return funcs[0] if len(funcs) == 1 else funcs
+        funcs = bindings.get(sequence, []) if add else []
+        funcs.append(func)
+        bindings[sequence] = funcs
+        return '{}{}'.format(id(func), getattr(func, '__name__', ''))
+
+    def tag_unbind(self, tagOrId, sequence, funcid=None):
+        self.itemBindings.get(tagOrId, {}).pop(sequence, None)
+
+    # Scrolling does nothing without a display
+    def canvasx(self, screenx, gridspacing=None):
+        return float(screenx)
+
+    def canvasy(self, screeny, gridspacing=None):
+        return float(screeny)
+
+    def xview(self, *args):
+        return (0.0, 1.0) if not args else None
+
+    yview = xview
+
+    def xview_moveto(self, fraction): pass
+    def yview_moveto(self, fraction): pass
+
+if __name__ == '__main__':
+    import time
+    window = HeadlessWindow()
+    useApproximateFonts()
+    scrim = HeadlessScrim(window, width=800, height=400)
+    N = 1000
+    start = time.perf_counter()
+    items = [scrim.create_rectangle(i, i, i + 10, i + 10, fill='blue',
+                                    tags=('box', 'even' if i % 2 else 'odd'))
+             for i in range(N)]
+    labels = [scrim.create_text(i + 5, i + 5, text=str(i), tags='label')
+              for i in range(N)]
+    created = time.perf_counter()
+    for step in range(10):
+        for item in items:
+            scrim.move(item, 1, 2)
+        scrim.move('label', 1, 2)
+    moved = time.perf_counter()
+    print('Created {} items in {:.3f}s, moved them 10 times in {:.3f}s'.format(
+        len(scrim.find_all()), created - start, moved - created))
+    print('First box coords:', scrim.coords(items[0]),
+          'bbox:', scrim.bbox(items[0]))
+    print('First label config:', scrim.itemConfig(labels[0], 'text'),
+          scrim.getItemFont(labels[0]), scrim.bbox(labels[0]))
+    copy = scrim.copyItem(items[1])
+    print('Copy of second box has tags', scrim.gettags(copy),
+          'and colors', scrim.getItemColors(copy))
+    scrim.delete('even')
+    scrim.tag_lower('label')
+    print('After deleting even boxes there are', len(scrim.find_withtag('box')),
+          'boxes and the bottom item is', scrim.find_all()[0])
@@ -130,10 +130,10 @@ def insert(self, item={val}):
                 for item, coords in zip(self.nItemsIndex,
                                         self._arr.labeledArrowCoords(self.nItems)):
                     self.canvas.coords(item, *coords)
-                for i in range(self.nItems, len(self.nodes)):
-                    if self.nodes[i]:
+                for i, node in self.nodes.items():
+                    if i >= self.nItems:
                         self.removeNodeDrawing(node, line=True)
-                        self.removeNodeInternal(i)
+                        self.removeNodeInternal(node)
             raise UserStop()
                     
         # finish the animation
@@ -558,6 +558,11 @@ def siftDown(array, j={j}, N={N}, key=identity):
         '''Sift item j down to preserve heap condition as part of heapify.
         Show code and animate when code is provided.
         '''
+        self.runSteps(self.siftDownSteps(j, N, code))
+
+    def siftDownSteps(self, j=0, N=None, code=siftDownCode):
+        '''Generator for the steps of siftDown, yielding the time to wait
+        before the next one'''
         wait = 0.1 if code else 0
         callEnviron = self.createCallEnvironment(
             code=code.format(**locals()) if code else '')
@@ -579,17 +584,21 @@ def siftDown(array, j={j}, N={N}, key=identity):
             if code:
                 NIndex = self._arr.createLabeledArrow(N, 'N', **NIndexConfig)
                 callEnviron |= set(NIndex)
-                self.highlightCode('N is None', callEnviron, wait=wait)
+                yield from self.highlightCodeSteps(
+                    'N is None', callEnviron, wait=wait)
         else:
             N = len(self._arr)
             if code:
-                self.highlightCode('N is None', callEnviron, wait=wait)
-                self.highlightCode('N = len(array)', callEnviron, wait=wait)
+                yield from self.highlightCodeSteps(
+                    'N is None', callEnviron, wait=wait)
+                yield from self.highlightCodeSteps(
+                    'N = len(array)', callEnviron, wait=wait)
                 NIndex = self._arr.createLabeledArrow(N, 'N', **NIndexConfig)
                 callEnviron |= set(NIndex)
 
         if code:
-            self.highlightCode('firstleaf = N // 2', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'firstleaf = N // 2', callEnviron, wait=wait)
         firstleaf = N // 2
         if code:
             leafIndex = self._arr.createLabeledArrow(firstleaf, 'firstleaf')
@@ -598,15 +607,17 @@ def siftDown(array, j={j}, N={N}, key=identity):
                 color=self.VARIABLE_COLOR)
             callEnviron |= set(leafIndex + leafNodeIndex)
         
-            self.highlightCode('j >= firstleaf', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'j >= firstleaf', callEnviron, wait=wait)
         if j >= firstleaf: # If item j is at or below leaf level, nothing to do
             if code:
-                self.highlightCode('return', callEnviron)
+                yield from self.highlightCodeSteps('return', callEnviron)
             self.cleanUp(callEnviron)
             return      
 
         if code:
-            self.highlightCode('item = array[j]', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'item = array[j]', callEnviron, wait=wait)
         downItem = self._arr[j].copy()   # Store item at cell j
         itemCopy = tuple(self.canvas.copyItem(i) for i in downItem.items)
         nodeCopy = tuple(
@@ -617,10 +628,12 @@ def siftDown(array, j={j}, N={N}, key=identity):
                        for it in itemCopy) + tuple(
                                V(self.canvas.coords(it)) + V(self.siftDelta * 2)
                                for it in nodeCopy)
-        self.moveItemsTo(toMove, moveTo, sleepTime=wait / 10)
+        yield from self.sequenceSteps(
+            self.moveItemsToSequence(toMove, moveTo), wait / 10)
 
         if code:
-            self.highlightCode('itemkey = key(item)', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'itemkey = key(item)', callEnviron, wait=wait)
         itemCopyCenter = self.canvas.coords(itemCopy[1])
         if code:
             itemLabel = self.canvas.create_text(
@@ -635,11 +648,12 @@ def siftDown(array, j={j}, N={N}, key=identity):
         itemkey = downItem.val # key
 
         if code:
-            self.highlightCode('j < firstleaf', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'j < firstleaf', callEnviron, wait=wait)
         while j < firstleaf:  # While j above leaf level, find children
             left, right = j + j + 1, j + j + 2
             if code:
-                self.highlightCode(
+                yield from self.highlightCodeSteps(
                     'left, right = j + j + 1, j + j + 2', callEnviron)
                 if leftIndex is None:
                     leftIndex = self._arr.createLabeledArrow(
@@ -653,15 +667,14 @@ def siftDown(array, j={j}, N={N}, key=identity):
                     callEnviron |= set(leftIndex + leftNodeIndex +
                                        rightIndex + rightNodeIndex)
                 else:
-                    self.moveItemsTo(
+                    yield from self.sequenceSteps(self.moveItemsToSequence(
                         leftIndex + leftNodeIndex + rightIndex + rightNodeIndex,
                         self._arr.labeledArrowCoords(left, level=-1) +
                         self.indexCoords(left, 1) +
                         self._arr.labeledArrowCoords(right, level=-1) +
-                        self.indexCoords(right, 1),
-                        sleepTime=wait / 10)
+                        self.indexCoords(right, 1)), wait / 10)
 
-                self.highlightCode('maxi = left', callEnviron)
+                yield from self.highlightCodeSteps('maxi = left', callEnviron)
             maxi = left        # Assume left child has larger key
             if code:
                 if maxIndex is None:
@@ -671,45 +684,47 @@ def siftDown(array, j={j}, N={N}, key=identity):
                         maxi, label='maxi', level=2, color=self.VARIABLE_COLOR)
                     callEnviron |= set(maxIndex + maxNodeIndex)
                 else:
-                    self.moveItemsTo(
+                    yield from self.sequenceSteps(self.moveItemsToSequence(
                         maxIndex + maxNodeIndex, 
                         self._arr.labeledArrowCoords(maxi, level=-4) + 
-                        self.indexCoords(maxi, 2), sleepTime=wait / 10)
+                        self.indexCoords(maxi, 2)), wait / 10)
            
-                self.highlightCode('right < N', callEnviron, wait=wait)
+                yield from self.highlightCodeSteps(
+                    'right < N', callEnviron, wait=wait)
             if right < len(self._arr):
                 if code:
-                    self.highlightCode('key(array[left]) < key(array[right])',
-                                       callEnviron, wait=wait)
+                    yield from self.highlightCodeSteps(
+                        'key(array[left]) < key(array[right])',
+                        callEnviron, wait=wait)
             if (right < len(self._arr) and # If both children are present, and
                 self._arr[left].val < # left child has smaller key
                 self._arr[right].val):
                 maxi = right          # then use right child
                 if code:
-                    self.highlightCode('maxi = right', callEnviron)
-                    self.moveItemsTo(
+                    yield from self.highlightCodeSteps(
+                        'maxi = right', callEnviron)
+                    yield from self.sequenceSteps(self.moveItemsToSequence(
                         maxIndex + maxNodeIndex, 
                         self._arr.labeledArrowCoords(maxi, level=-4) + 
-                        self.indexCoords(maxi, 2), sleepTime=wait / 10)
+                        self.indexCoords(maxi, 2)), wait / 10)
 
             if code:
-                self.highlightCode('itemkey < key(array[maxi])',
-                                   callEnviron, wait=wait)
+                yield from self.highlightCodeSteps(
+                    'itemkey < key(array[maxi])', callEnviron, wait=wait)
             if (itemkey < self._arr[maxi].val): # If item j less than max,
                 # move a copy of the max child up to node j
                 if code:
-                    self.highlightCode('array[j] = array[maxi]',
-                                       callEnviron)
+                    yield from self.highlightCodeSteps(
+                        'array[j] = array[maxi]', callEnviron)
                 maxNode = self.getNode(maxi)
                 copyVal = tuple(self.canvas.copyItem(i) 
                                 for i in self._arr[maxi].items +
                                 maxNode.drawnValue.items[1:])
                 callEnviron |= set(copyVal)
-                self.moveItemsOnCurve(
+                yield from self.sequenceSteps(self.moveItemsOnCurveSequence(
                     copyVal,
                     (self._arr.cellCoords(j), self._arr.cellCenter(j),
-                     *self.nodeItemCoords(j)[1:]),
-                    sleepTime=wait / 10)
+                     *self.nodeItemCoords(j)[1:])), wait / 10)
                 for item in self._arr[j].items:
                     self.canvas.delete(item)
                 self._arr[j].val = self._arr[maxi].val
@@ -720,7 +735,7 @@ def siftDown(array, j={j}, N={N}, key=identity):
                 callEnviron -= set(copyVal)
 
                 if code:
-                    self.highlightCode('j = maxi', callEnviron)
+                    yield from self.highlightCodeSteps('j = maxi', callEnviron)
                 # Advance j to max child, move original item along with j Index
                 delta = (0, self._arr.cellCenter(maxi)[1] -
                          self._arr.cellCenter(j)[1])
@@ -732,25 +747,30 @@ def siftDown(array, j={j}, N={N}, key=identity):
                 toMove += nodesToMove
                 moveTo += tuple(V(self.canvas.coords(t)) + V(delta * 2)
                                 for t in nodesToMove)
-                self.moveItemsTo(toMove, moveTo, sleepTime=wait / 10)
+                yield from self.sequenceSteps(
+                    self.moveItemsToSequence(toMove, moveTo), wait / 10)
                 j = maxi
                 jNode = self.getNode(j)
                  
             else:              # If item j's key is greater than or equal
                 if code:
-                    self.highlightCode('break', callEnviron, wait=wait)
+                    yield from self.highlightCodeSteps(
+                        'break', callEnviron, wait=wait)
                 break          # to larger child, then found position
 
             if code:
-                self.highlightCode('j < firstleaf', callEnviron, wait=wait)
+                yield from self.highlightCodeSteps(
+                    'j < firstleaf', callEnviron, wait=wait)
 
         # Move copied item into appropriate location
         if code:
-            self.highlightCode('array[j] = item', callEnviron, wait=wait)
-        self.moveItemsTo(
-            itemCopy + nodeCopy,
-            self._arr.cellAndCenters(j) + self.nodeItemCoords(j)[1:],
-            sleepTime=wait / 10)
+            yield from self.highlightCodeSteps(
+                'array[j] = item', callEnviron, wait=wait)
+        yield from self.sequenceSteps(
+            self.moveItemsToSequence(
+                itemCopy + nodeCopy,
+                self._arr.cellAndCenters(j) + self.nodeItemCoords(j)[1:]),
+            wait / 10)
         for item in self._arr[j].items:
             self.canvas.delete(item)
         self._arr[j].val, self._arr[j].items = downItem.val, itemCopy
@@ -758,7 +778,7 @@ def siftDown(array, j={j}, N={N}, key=identity):
         jNode.drawnValue.items = (jNode.drawnValue.items[0],) + nodeCopy
         callEnviron -= set(itemCopy + nodeCopy)
 
-        self.highlightCode([], callEnviron)
+        yield from self.highlightCodeSteps([], callEnviron)
         self.cleanUp(callEnviron)
 
     def createTreeNode(self, index, parent=None, children=False,
@@ -786,6 +806,7 @@ def siftDown(array, j={j}, N={N}, key=identity):
       
         # create the Node object
         node = Node(drawnValueObj, center, tag)
+        self.drawnNodes.add(node)
 
         # add the node object to the internal representation
         self.nodes[index] = node
@@ -820,21 +841,29 @@ def heapify(array, N=None, key=identity):
         '''Organize an array of N items to satisfy the heap condition.
         Show code and animate operation if code provided.
         '''
+        self.runSteps(self.heapifySteps(N, code, start))
+
+    def heapifySteps(self, N=None, code=heapifyCode, start=True):
+        '''Generator for the steps of heapify, yielding the time to wait
+        before the next one'''
         wait = 0.1 if code else 0
         callEnviron = self.createCallEnvironment(
             code=code or '', startAnimations=start)
         if code:
-            self.highlightCode('N is None', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'N is None', callEnviron, wait=wait)
         if N is None:            # If N is not supplied,
             N = len(self._arr)   # then use number of items in _arr
             if code:
-                self.highlightCode('N = len(array)', callEnviron, wait=wait)
+                yield from self.highlightCodeSteps(
+                    'N = len(array)', callEnviron, wait=wait)
                 NIndexConfig = {'level': 5}
                 NIndex = self._arr.createLabeledArrow(N, 'N', **NIndexConfig)
                 callEnviron |= set(NIndex)
 
         if code:
-            self.highlightCode('heapLo = N // 2', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'heapLo = N // 2', callEnviron, wait=wait)
         heapLo = N // 2          # The heap lies in the range [heapLo, N)
         if code:
             heapLoIndex = self._arr.createLabeledArrow(heapLo, 'heapLo')
@@ -846,20 +875,24 @@ def heapify(array, N=None, key=identity):
         for leaf, coords in zip(leaves, leafCoords):
             leaf.center = coords[2]
             callEnviron |= set(leaf.drawnValue.items)
-        self.moveItemsLinearly(
+        yield from self.sequenceSteps(self.moveItemsLinearlySequence(
             flat(*(leaf.drawnValue.items for leaf in leaves)),
-            flat(*leafCoords), sleepTime=wait / 10, startFont=self.SMALL_FONT,
-            endFont=self.VALUE_FONT)
+            flat(*leafCoords), startFont=self.SMALL_FONT,
+            endFont=self.VALUE_FONT), wait / 10)
 
         if code:
-            self.highlightCode('heapLo > 0', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'heapLo > 0', callEnviron, wait=wait)
             localVars = NIndex + heapLoIndex
         while heapLo > 0:        # Heapify until the entire array is a heap
             heapLo -= 1          # Decrement heap's lower boundary
             if code:
-                self.highlightCode('heapLo -= 1', callEnviron, wait=wait)
-                self.moveItemsTo(heapLoIndex, self._arr.labeledArrowCoords(heapLo),
-                                 sleepTime=wait / 10)
+                yield from self.highlightCodeSteps(
+                    'heapLo -= 1', callEnviron, wait=wait)
+                yield from self.sequenceSteps(
+                    self.moveItemsToSequence(
+                        heapLoIndex, self._arr.labeledArrowCoords(heapLo)),
+                    wait / 10)
             if heapLo > 0:
                 leaf = self.createTreeNode(
                     heapLo, font=self.SMALL_FONT, radius=0, 
@@ -868,27 +901,33 @@ def heapify(array, N=None, key=identity):
                 leaf.center = leafCoords[2]
                 callEnviron |= set(leaf.drawnValue.items)
                 leaves.append(leaf)
-                self.moveItemsLinearly(
-                    leaf.drawnValue.items, leafCoords, sleepTime=wait / 10,
-                    startFont=self.SMALL_FONT, endFont=self.VALUE_FONT)
+                yield from self.sequenceSteps(
+                    self.moveItemsLinearlySequence(
+                        leaf.drawnValue.items, leafCoords,
+                        startFont=self.SMALL_FONT, endFont=self.VALUE_FONT),
+                    wait / 10)
 
             if code:
-                self.highlightCode('siftDown(array, heapLo, N, key)',
-                                   callEnviron)
+                yield from self.highlightCodeSteps(
+                    'siftDown(array, heapLo, N, key)', callEnviron)
                 colors = self.canvas.fadeItems(localVars)
-            self.siftDown(heapLo, N, code=self.siftDownCode if code else None)
+            yield from self.siftDownSteps(
+                heapLo, N, code=self.siftDownCode if code else None)
             if code:
                 self.canvas.restoreItems(localVars, colors)
 
-                self.highlightCode('heapLo > 0', callEnviron, wait=wait)
+                yield from self.highlightCodeSteps(
+                    'heapLo > 0', callEnviron, wait=wait)
 
         # Adjust nItems pointer to indicate heap condition is satisfied
         self.nItems = N
         for leaf in leaves:  # Leaves are no longer temporary
             callEnviron -= set(leaf.drawnValue.items)
-        self.moveItemsTo(self.nItemsIndex, self._arr.labeledArrowCoords(self.nItems),
-                         sleepTime=wait / 10)
-        self.highlightCode([], callEnviron)
+        yield from self.sequenceSteps(
+            self.moveItemsToSequence(
+                self.nItemsIndex, self._arr.labeledArrowCoords(self.nItems)),
+            wait / 10)
+        yield from self.highlightCodeSteps([], callEnviron)
         self.cleanUp(callEnviron)
 
     peekCode = '''
@@ -1039,8 +1078,8 @@ def remove(self):
                 for item, coords in zip(self.nItemsIndex,
                                         self._arr.labeledArrowCoords(self.nItems)):
                     self.canvas.coords(item, *coords)
-            for node in self.nodes[self.nItems:]:
-                if node:
+            for i, node in self.nodes.items():
+                if i >= self.nItems:
                     self.removeNodeDrawing(node, line=True)
                     self.removeNodeInternal(node)
             for item in toRemove if len(itemsToMove) == 0 else itemsToMove:
@@ -1057,6 +1096,11 @@ for item in heap.traverse():
 '''
     
     def traverseExample(self, code=traverseExampleCode, start=True):
+        self.runSteps(self.traverseExampleSteps(code, start))
+
+    def traverseExampleSteps(self, code=traverseExampleCode, start=True):
+        '''Generator for the steps of traverseExample, yielding the time to
+        wait before the next one'''
         wait = 0.1
         callEnviron = self.createCallEnvironment(
             code=code, sleepTime=wait / 10, startAnimations=start)
@@ -1067,11 +1111,16 @@ for item in heap.traverse():
             coords=outBoxCoords, outputOffset=(5, 10))
         callEnviron |= set(outputBox.items())
         
-        self.highlightCode('item in heap.traverse()', callEnviron, wait=wait)
+        yield from self.highlightCodeSteps(
+            'item in heap.traverse()', callEnviron, wait=wait)
         arrayIndex, treeIndex = None, None
         localVars = ()
         colors = self.canvas.fadeItems(localVars)
-        for i, item in self.traverse():
+        for step in self.traverseSteps():
+            if not isinstance(step, tuple): # Pass on the iterator's waits
+                yield step
+                continue
+            i, item = step
             self.canvas.restoreItems(localVars, colors)
             if arrayIndex is None:
                 arrayIndex = self._arr.createLabeledArrow(i, 'item')
@@ -1080,12 +1129,15 @@ for item in heap.traverse():
                 callEnviron |= set(indices)
                 localVars += (indices)
             else:
-                self.moveItemsTo(
-                    indices, 
-                    self._arr.labeledArrowCoords(i) + self.indexCoords(i, 1),
-                    sleepTime=wait / 10)
-
-            self.highlightCode('print(item)', callEnviron, wait=wait)
+                yield from self.sequenceSteps(
+                    self.moveItemsToSequence(
+                        indices, 
+                        self._arr.labeledArrowCoords(i) +
+                        self.indexCoords(i, 1)),
+                    wait / 10)
+
+            yield from self.highlightCodeSteps(
+                'print(item)', callEnviron, wait=wait)
             outputValues = tuple(self.canvas.copyItem(i) for i in
                                  (item.drawnValue.items[2],
                                   self._arr[i].items[1]))
@@ -1093,11 +1145,12 @@ for item in heap.traverse():
             outputBox.appendText(outputValues, sleepTime=wait / 10)
             callEnviron -= set(outputValues)
 
-            self.highlightCode('item in heap.traverse()', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'item in heap.traverse()', callEnviron, wait=wait)
             colors = self.canvas.fadeItems(localVars)
 
         self.canvas.restoreItems(localVars, colors)
-        self.highlightCode([], callEnviron)
+        yield from self.highlightCodeSteps([], callEnviron)
         self.cleanUp(callEnviron)
 
     traverseCode = '''
@@ -1107,10 +1160,21 @@ def traverse(self):
 '''
 
     def traverse(self, traverseType='in', code=traverseCode):
+        for step in self.traverseSteps(traverseType, code):
+            if isinstance(step, tuple): # Yield the items and wait
+                yield step             # between the other steps
+            else:
+                self.wait(step or 0)
+
+    def traverseSteps(self, traverseType='in', code=traverseCode):
+        '''Generator for the steps of traverse.  It yields the time to
+        wait before the next step, or an (index, node) tuple for each item
+        the iterator yields'''
         wait = 0.1
         callEnviron = self.createCallEnvironment(code=code, sleepTime=wait / 10)
 
-        self.highlightCode('i in range(len(self)', callEnviron, wait=wait)
+        yield from self.highlightCodeSteps(
+            'i in range(len(self)', callEnviron, wait=wait)
         iArrayIndex, iArrow = None, None
         for i in range(self.nItems):
             if iArrayIndex is None:
@@ -1119,29 +1183,32 @@ def traverse(self):
                 indices = iArrayIndex + iArrow
                 callEnviron |= set(indices)
             else:
-                self.moveItemsTo(
-                    indices,
-                    self._arr.labeledArrowCoords(i) + 
-                    self.indexCoords(i, 1, orientation=-110),
-                    sleepTime=wait / 10)
+                yield from self.sequenceSteps(
+                    self.moveItemsToSequence(
+                        indices,
+                        self._arr.labeledArrowCoords(i) + 
+                        self.indexCoords(i, 1, orientation=-110)),
+                    wait / 10)
                 
-            self.highlightCode('yield self._arr[i]', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'yield self._arr[i]', callEnviron, wait=wait)
             itemCoords = self.yieldCallEnvironment(
                 callEnviron, sleepTime=wait / 10)
             yield i, self.getNode(i)
             self.resumeCallEnvironment(
                 callEnviron, itemCoords, sleepTime=wait / 10)
-            self.highlightCode('i in range(len(self)', callEnviron, wait=wait)
+            yield from self.highlightCodeSteps(
+                'i in range(len(self)', callEnviron, wait=wait)
         
-        self.highlightCode([], callEnviron)
+        yield from self.highlightCodeSteps([], callEnviron)
         self.cleanUp(callEnviron, sleepTime=wait / 10)
     
     def randomFill(self, val, makeHeap=False):
         self.heapSize = val
         
         self.emptyTree()
-        self._arr[:] = [drawnValue(random.randrange(self.valMax + 1))
-                        for i in range(val)]
+        self._arr[:] = drawnValue.many(
+            random.randrange(self.valMax + 1) for i in range(val))
         self.nItems = min(val, 1)
         self.display()
         if makeHeap:
@@ -1297,21 +1364,23 @@ def traverse(self):
                 "Input value must be between 0 and {}.".format(self.MAX_SIZE))
             self.setArgumentHighlight(color=self.ERROR_HIGHLIGHT)
         elif val is not None:
-            self.randomFill(val, makeHeap=makeHeap)
+            self.randomFill(val)
             self.clearArgument()
+            if makeHeap:
+                return self.heapifySteps(code=None, start=True)
 
     def clickHeapify(self):
-        self.heapify(start=self.startMode())
+        return self.heapifySteps(start=self.startMode())
         
     def clickTraverse(self):
-        self.traverseExample(start=self.startMode())
+        return self.traverseExampleSteps(start=self.startMode())
 
 if __name__ == '__main__':
     nonneg, signed, options, otherArgs = categorizeArguments(sys.argv[1:],
                                                              signed=True)
     if '-r' not in options:  # Use fixed seed for testing consistency unless
         random.seed(3.14159) # random option specified
-    heap = Heap()
+    heap = Heap(TIDY_LAYOUT='-t' in options)
     try:
         if signed:
             fill = min(Heap.MAX_SIZE, *(abs(int(arg)) for arg in signed))
@@ -53,7 +53,7 @@ class InfixCalculator(VisualizationApp):
         kwargs['maxArgWidth'] = maxArgWidth
         super().__init__(**kwargs)
         self.TRstack = []
-        self.TRqueue = [drawnValue(None) for i in range(self.ARRAY_SIZE)]
+        self.TRqueue = drawnValue.many([None] * self.ARRAY_SIZE)
         self.TRqueueRear = 0
         self.TRqueueFront = 1
         self.TRqueueSize = 0
@@ -623,7 +623,7 @@ def PostfixTranslate(formula={infixExpression!r}):
 
     def PostfixTranslate(self, infixExpression, code=postfixTranslateCode):
         del self.TRstack[:]
-        self.TRqueue = [drawnValue(None) for i in self.TRqueue]
+        self.TRqueue = drawnValue.many([None] * len(self.TRqueue))
         self.TRqueueRear = 0
         self.TRqueueFront = 1
         self.TRqueueSize = 0
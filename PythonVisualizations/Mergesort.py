@@ -25,10 +25,10 @@ class Mergesort(SortingBase):
         self.LABEL_GAP = abs(self.VARIABLE_FONT[1])
 
         if values is None:
-            for i in range(self.size):
-                self.list.append(drawnValue(random.randrange(self.valMax)))
+            self.list.extend(drawnValue.many(
+                random.randrange(self.valMax) for i in range(self.size)))
         else:
-            self.list = [drawnValue(val) for val in values]
+            self.list = drawnValue.many(values)
         self.display(showNItems=False)
         
         self.buttons = self.makeButtons()
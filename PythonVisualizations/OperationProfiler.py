@@ -0,0 +1,174 @@
+__doc__ = """
+Per-operation instrumentation of visualization apps.
+An OperationProfiler attached to an app counts the canvas calls of each
+kind made while an operation runs, how many queued commands were sent
+to Tk in batches, the time spent waiting (animation sleeps, pauses, and
+steps) versus computing, the number of times paused waits woke up to
+check whether to resume, the intervals between animation frames, and the
+peak number of canvas items.  Each finished operation produces a
+profile dictionary that can be shown in an overlay and appended to a
+JSON lines file for offline analysis.
+"""
+
+import time, json, bisect
+from collections import *
+
+class OperationProfiler(object):
+    '''Count canvas calls and time waits and frames for one operation at a
+    time.  The canvas and the app's wait method are wrapped by instance
+    attributes while profiling and restored afterwards.  Only the
+    outermost canvas call is counted when canvas methods call each other.
+    '''
+
+    CANVAS_CALLS = (
+        'create_arc', 'create_bitmap', 'create_image', 'create_line',
+        'create_oval', 'create_polygon', 'create_rectangle', 'create_text',
+        'create_window', 'coords', 'move', 'moveto', 'scale', 'itemconfigure',
+        'itemconfig', 'itemcget', 'delete', 'tag_raise', 'tag_lower', 'lift',
+        'lower', 'tkraise', 'addtag_withtag', 'dtag', 'gettags', 'type',
+        'bbox', 'find_withtag', 'find_all', 'find_overlapping',
+        'find_enclosed', 'find_closest', 'tag_bind', 'tag_unbind')
+    FRAME_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500) # Histogram bucket
+                                        # upper bounds in milliseconds
+
+    def __init__(self, app, logFile=None):
+        self.app = app
+        self.logFile = logFile  # Path of JSON lines file for profiles
+        self.profile = None     # Profile of operation in progress
+        self.lastProfile = None # Profile of most recently finished operation
+        self.wrapped = []       # (object, name, previous) triples of wrapped
+                                # methods and any instance attribute they hid
+        self.depth = 0          # Depth of nested canvas calls
+
+    def start(self, operation=''): # Start profiling an operation
+        if self.profile:
+            self.stop()
+        canvas = self.app.canvas
+        self.profile = {
+            'app': type(self.app).__name__, 'operation': operation,
+            'start': time.time(), 'elapsed': 0, 'waitTime': 0,
+            'computeTime': 0, 'frames': 0, 'wakeups': 0,
+            'frameHistogram': OrderedDict(
+                (label, 0) for label in self.bucketLabels()),
+            'peakItems': canvas.itemCount(), 'calls': Counter(),
+            'flushes': 0, 'batchedCommands': 0}
+        self.started = time.perf_counter()
+        self.lastFrame = None
+        for name in self.CANVAS_CALLS:
+            if hasattr(canvas, name):
+                self.wrap(canvas, name, self.countCalls(name))
+        self.wrap(canvas, 'flush', self.countFlush)
+        self.wrap(self.app, 'wait', self.timeWait)
+        self.app.scheduler.profiler = self
+
+    def stop(self):          # Finish profiling and return the profile
+        profile = self.profile
+        if profile is None:
+            return None
+        for obj, name, previous in reversed(self.wrapped):
+            if previous is None:
+                obj.__dict__.pop(name, None)
+            else:
+                obj.__dict__[name] = previous
+        self.wrapped = []
+        self.app.scheduler.profiler = None
+        self.profile = None
+        profile['elapsed'] = time.perf_counter() - self.started
+        profile['computeTime'] = max(
+            0, profile['elapsed'] - profile['waitTime'])
+        profile['calls'] = OrderedDict(profile['calls'].most_common())
+        self.lastProfile = profile
+        if self.logFile:
+            with open(self.logFile, 'a') as log:
+                log.write(json.dumps(profile) + '\n')
+        return profile
+
+    def wrap(self, obj, name, makeWrapper): # Replace a method of an object
+        previous = obj.__dict__.get(name)    # with a wrapper made from the
+        obj.__dict__[name] = makeWrapper(getattr(obj, name)) # method,
+        self.wrapped.append((obj, name, previous)) # remembering any instance
+                                             # attribute override to restore
+
+    def countCalls(self, name):  # Make a wrapper maker that counts
+        def makeWrapper(method): # outermost calls to a canvas method
+            def counted(*args, **kwargs):
+                if self.depth == 0:
+                    self.profile['calls'][name] += 1
+                self.depth += 1
+                try:
+                    result = method(*args, **kwargs)
+                finally:
+                    self.depth -= 1
+                if name.startswith('create_'):
+                    self.noteItems()
+                return result
+            return counted
+        return makeWrapper
+
+    def countFlush(self, method): # Count batches of queued commands sent
+        canvas = self.app.canvas  # to Tk
+        def counted():
+            if getattr(canvas, 'batched', None):
+                self.profile['flushes'] += 1
+                self.profile['batchedCommands'] += len(canvas.batched)
+            return method()
+        return counted
+
+    def timeWait(self, method):  # Time spent in the app's wait method
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.noteWait(time.perf_counter() - start)
+        return timed
+
+    def noteItems(self):     # Update peak canvas item count
+        self.profile['peakItems'] = max(
+            self.profile['peakItems'], self.app.canvas.itemCount())
+
+    def noteWait(self, seconds): # Add time spent waiting
+        if self.profile:
+            self.profile['waitTime'] += seconds
+
+    def noteWakeup(self):    # Note a check of a paused wait's condition
+        if self.profile:
+            self.profile['wakeups'] += 1
+
+    def noteFrame(self):     # Note that an animation frame was shown
+        if self.profile is None:
+            return
+        now = time.perf_counter()
+        self.profile['frames'] += 1
+        if self.lastFrame is not None:
+            labels = self.bucketLabels()
+            self.profile['frameHistogram'][labels[bisect.bisect_right(
+                self.FRAME_BUCKETS, (now - self.lastFrame) * 1000)]] += 1
+        self.lastFrame = now
+        self.noteItems()
+
+    def bucketLabels(self):  # Labels for frame time histogram buckets
+        return ['<{}ms'.format(bound) for bound in self.FRAME_BUCKETS] + [
+            '>={}ms'.format(self.FRAME_BUCKETS[-1])]
+
+    @staticmethod
+    def summary(profile, maxCalls=6): # Short multi-line text for a profile
+        if not profile:
+            return ''
+        calls = profile['calls']
+        lines = [
+            '{} {:.3f}s'.format(profile['operation'], profile['elapsed']),
+            'wait {:.3f}s compute {:.3f}s'.format(
+                profile['waitTime'], profile['computeTime']),
+            '{} frames, {} pause wakeups, peak {} items'.format(
+                profile['frames'], profile['wakeups'], profile['peakItems']),
+            '{} canvas calls, {} batched in {} flushes'.format(
+                sum(calls.values()), profile['batchedCommands'],
+                profile['flushes'])]
+        lines.extend('  {} {}'.format(name, count)
+                     for name, count in list(calls.items())[:maxCalls])
+        frames = ' '.join('{}:{}'.format(label, count) for label, count in
+                          profile['frameHistogram'].items() if count)
+        if frames:
+            lines.append('frames ' + frames)
+        return '\n'.join(lines)
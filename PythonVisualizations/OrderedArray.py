@@ -18,11 +18,10 @@ class OrderedArray(SortingBase):
         # Fill in initial array values with random but ordered integers
         # The display items representing these array cells are created later
         if values is None:
-            for i in sorted([random.randrange(self.valMax) 
-                             for i in range(self.size-1)]):
-                self.list.append(drawnValue(i))
+            self.list.extend(drawnValue.many(sorted(
+                random.randrange(self.valMax) for i in range(self.size-1))))
         else:
-            self.list = [drawnValue(val) for val in sorted(values)]
+            self.list = drawnValue.many(sorted(values))
        
         self.display()
         
@@ -222,9 +221,8 @@ def search(self, item={item}):
         callEnviron = self.createCallEnvironment()
         
         # Clear the list so new values can be entered
-        self.list = [drawnValue(i) for i in
-                     sorted([random.randrange(self.valMax) 
-                             for i in range(self.size)])]
+        self.list = drawnValue.many(sorted(
+            random.randrange(self.valMax) for i in range(self.size)))
 
         self.display()            
         self.cleanUp(callEnviron)
@@ -151,11 +151,13 @@ class Node(drawnValue):
         elif isinstance(key, str) and key in Node.findex:
             return self.val[Node.findex[key]]
 
+    def __iter__(self):         # Iterate over fields like positional access
+        return iter(self.val)
+
     def __getattr__(self, name):
         if name in Node.findex:
             return self.val[Node.findex[name]]
-        else:
-            return super().__getattr__(name)
+        raise AttributeError('Node has no attribute {}'.format(repr(name)))
 
     def __setattr__(self, name, val):
         if name in Node.findex:
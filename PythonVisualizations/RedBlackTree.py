@@ -1,5 +1,5 @@
 from tkinter import *
-import random
+import random, heapq
 
 try:
     from coordinates import *
@@ -16,6 +16,135 @@ except ModuleNotFoundError:
 
 V = vector
 
+class RedBlackChecker(object):
+    '''Track the red-black invariants of an app's tree incrementally.  The
+    app's NodeArray reports every change and the app reports every color
+    change.  When updated, only the nodes affected by those changes are
+    checked for red-red links, and the sets of black heights below them
+    are recomputed up toward the root until they stop changing, so the
+    cost of a change grows with its depth rather than the tree size.
+    '''
+    def __init__(self, app):
+        self.app = app
+        self.nodes = None    # NodeArray being checked
+        self.dirty = set()   # Nodes written or recolored since last update
+        self.heights = {}    # Black heights of paths below each node
+        self.redRed = set()  # Red nodes with red parents
+        self.changed = set() # Nodes whose red-red link or position changed
+
+    def reset(self):         # Check the whole tree on the next update
+        self.nodes = None
+
+    def invalidate(self, nodes, parent, *written):
+        '''Note a change to the links of some nodes in a NodeArray.  The
+        changed nodes, the parent above them, and their children are
+        affected.'''
+        if parent:
+            self.dirty.add(parent)
+        for node in written:
+            if node:
+                self.dirty.add(node)
+                self.dirty.update(
+                    child for child in (node.left, node.right) if child)
+
+    def recolored(self, node): # Note a change in a node's color
+        self.dirty.add(node)
+
+    def update(self):
+        '''Recheck the nodes affected since the last update.  Returns the
+        set of nodes whose red-red link status or position may have changed.
+        '''
+        nodes = self.app.nodes
+        if nodes is not self.nodes: # Check a new node array from scratch
+            self.rebuild(nodes)
+        elif self.dirty:
+            dirty, self.dirty = self.dirty, set()
+            toDo = []             # Heap of negated indices so that nodes are
+            for node in dirty:    # recomputed after their descendants
+                index = nodes.find(node)
+                if index < 0:
+                    self.heights.pop(node, None)
+                    if node in self.redRed:
+                        self.redRed.discard(node)
+                        self.changed.add(node)
+                    continue
+                for link in (node, node.left, node.right):
+                    self.checkLink(link)
+                heapq.heappush(toDo, -index)
+            queued = set(toDo)
+            while toDo:
+                index = -heapq.heappop(toDo)
+                node = nodes.get(index)
+                heights = self.subtreeHeights(node)
+                if heights != self.heights.get(node):
+                    self.heights[node] = heights
+                    parent = (index - 1) // 2
+                    if node.parent and -parent not in queued:
+                        queued.add(-parent)
+                        heapq.heappush(toDo, -parent)
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def rebuild(self, nodes):
+        '''Check every node, visiting children before their parents so the
+        black heights below each node come from those of its children.
+        Each node's color is looked up once, and the sets of heights are
+        shared among nodes with the same ones.'''
+        self.nodes = nodes
+        nodes.checker = self
+        self.dirty, self.heights = set(), {}
+        self.changed = self.redRed # Only red-red links have highlights, so
+        self.redRed = set()        # only they and the old ones can change
+        app, heights, colors, blackened = self.app, self.heights, {}, {}
+        empty = frozenset((0,))
+        for node in reversed(list(iter(nodes))): # len(nodes) is capacity
+            colors[node] = color = (    # Culled nodes hold their color
+                node.culled[1]['ringColor'] if node.culled else
+                app.nodeColor(node))
+            for child in (node.left, node.right):
+                if child and color == app.RED_COLOR == colors[child]:
+                    self.redRed.add(child)
+            left = heights[node.left] if node.left else empty
+            right = heights[node.right] if node.right else empty
+            below = left if left == right else left | right
+            if color == app.BLACK_COLOR:
+                black = blackened.get(below)
+                if black is None:
+                    black = blackened[below] = frozenset(
+                        height + 1 for height in below)
+                below = black
+            heights[node] = below
+        self.changed |= self.redRed
+
+    def checkLink(self, node): # Check the link from a node to its parent
+        if node is None:
+            return
+        app = self.app
+        violation = node.parent is not None and (
+            app.nodeColor(node) == app.RED_COLOR) and (
+            app.nodeColor(node.parent) == app.RED_COLOR)
+        if violation:
+            self.redRed.add(node)
+        else:
+            self.redRed.discard(node)
+        self.changed.add(node)
+
+    def subtreeHeights(self, node):
+        '''Compute the set of black node counts on the paths from a node
+        to the empty links below it from those of its children'''
+        if node is None:
+            return frozenset((0,))
+        below = frozenset()
+        for child in (node.left, node.right):
+            below |= (self.heights.get(child) or self.subtreeHeights(child)
+                      if child else frozenset((0,)))
+        black = self.app.nodeColor(node) == self.app.BLACK_COLOR
+        return frozenset(height + black for height in below) if black else below
+
+    def rootHeights(self):   # Black heights of all paths from the root
+        root = self.nodes.get(0)
+        return self.heights[root] if root else frozenset((0,))
+
 class RedBlackTree(BinaryTreeBase):
     CIRCLE_SIZE = 15
     RING_RADIUS = 19
@@ -29,6 +158,9 @@ class RedBlackTree(BinaryTreeBase):
     def __init__(self, title="Red-Black Tree", values=None, **kwargs):
         super().__init__(title=title, CIRCLE_SIZE=self.CIRCLE_SIZE, **kwargs)
         self.measures = [0] * 4
+        self.checker = RedBlackChecker(self)
+        self.redRedHighlights = {} # Highlight item and coords by child node
+        self.measuredMoves = 0     # Node array moves at last measurement
         self.buttons = self.makeButtons()
         self.lastNodeClicked = (None, ) * 2
         self.lastFlipEvent, self.lastRotateEvent = (None, ) * 3,  (None, ) * 3
@@ -84,7 +216,15 @@ class RedBlackTree(BinaryTreeBase):
     def nodeColor(self, node, color=None):
         'Get or set the color of a node'
         node = node if isinstance(node, Node) else self.getNode(node)
-        if node:
+        if node and color:
+            self.checker.recolored(node)
+        if node and node.culled:   # Culled nodes keep their color in their
+            state = node.culled[1] # drawing state
+            if color:
+                state['ringColor'] = color
+            else:
+                return state['ringColor']
+        elif node:
             if color:
                 self.canvas.itemConfig(node.drawnValue.items[3], fill=color)
             else:
@@ -102,24 +242,24 @@ class RedBlackTree(BinaryTreeBase):
             else:
                 return node.drawnValue.items[3]
             
+    def culledNodeState(self, node):
+        return dict(super().culledNodeState(node),
+                    ringColor=self.nodeColor(node))
+
     def display(self, fields=[], treeLabel="RedBlackTree"):
+        self.cullAllNodes()   # Nodes are redrawn after clearing the canvas
+        self.clearMeasures()
         existingItems = set(self.canvas.find_withtag('all'))
         self.treeObject = self.createTreeObject(fields=fields, label=treeLabel)
         self.fieldwidths = self.treeObjectFieldWidths(fields=fields)
-        newNodes = [self.createNode(
-            node.getKey(), None if i == 0 else self.nodes[(i - 1) // 2],
-            Child.LEFT if i % 2 == 1 else Child.RIGHT,
-            ringColor=self.nodeColor(i)) if node else None
-                    for i, node in enumerate(self.nodes)]
-        self.nodes = newNodes
-        self.size = sum(1 if node else 0 for node in self.nodes)
-        for item in existingItems:
-            self.canvas.delete(item)
-        depthBoundary = (self.nodeCenter(len(self.nodes) + 1) +
-                         self.nodeCenter(len(self.nodes) * 2))
+        self.size = self.nodes.count
+        self.canvas.delete(*existingItems)
+        depthBoundary = (self.nodeCenter(self.maxElems + 1) +
+                         self.nodeCenter(self.maxElems * 2))
         self.canvas.create_line(
             *depthBoundary, fill=self.DEPTH_BOUNDARY_COLOR,
             dash=self.DEPTH_BOUNDARY_DASH, tags='boundary')
+        self.drawAllNodes()
         self.updateMeasures()
             
     def flipNodeColor(self, node):
@@ -207,7 +347,6 @@ class RedBlackTree(BinaryTreeBase):
             self.clearMeasures()
 
         # Get key nodes
-        topLeft = self.getLeftChild(top)
         toRaiseLeft, toRaiseRight = self.getChildren(toRaise)
 
         if animation:
@@ -223,39 +362,16 @@ class RedBlackTree(BinaryTreeBase):
         else:
             topNode.setLine(toRaise.getLine())
 
-        # Extract current subtrees
-        topLeftTree = self.getNodeTree(topLeft, erase=True)
-        toRaiseLeftTree = self.getNodeTree(toRaiseLeft, erase=True)
-        toRaiseRightTree = self.getNodeTree(toRaiseRight, erase=True)
-
-        # Move nodes internally, noting any nodes cutoff past depth limit
-        cutoff = self.storeNodeTree(
-            [toRaise, 
-             [topNode, topLeftTree, toRaiseLeftTree], toRaiseRightTree],
-            topIndex)
+        # Relink the nodes
+        self.nodes.rotate(topIndex, Child.RIGHT)
         toRaise.setLine(topParentLine)
 
-        # Move canvas items to new positions to match internal structure
-        newSubTree = self.getAllDescendants(topIndex)
-        newSubTreeItems = flat(*(
-            node.drawnValue.items for node in newSubTree + list(cutoff)))[1:]
-        toPositions = flat(*(
-            self.nodeItemCoords(node, parent=self.getParent(node)) 
-            for node in newSubTree + [len(self.nodes) * 3] * len(cutoff)))[1:]
+        # Move drawn canvas items to new positions to match internal
+        # structure.  Without animation, clean up restores them.
         if animation:
             self.moveItemsLinearly(
-                newSubTreeItems, toPositions, sleepTime=wait / 10)
-        else:
-            for item, coords in zip(newSubTreeItems, toPositions):
-                self.canvas.coords(item, *coords)
-        if cutoff and animation:
-            self.setMessage(
-                'Removed node{} {} that went beyond level {}'.format(
-                    '' if len(cutoff) == 1 else 's',
-                    ', '.join(str(node.getKey()) for node in cutoff),
-                self.MAX_LEVEL - 1))
-        self.dispose(callEnviron,
-                     *flat(*(node.drawnValue.items for node in cutoff)))
+                *self.drawnSubtreeItemCoords(topIndex),
+                sleepTime=wait / 10)
         self.reconnectLink(topIndex, self.getParentIndex(topIndex),
                            sleepTime=wait / 10 if animation else 0)
         
@@ -278,7 +394,6 @@ class RedBlackTree(BinaryTreeBase):
             self.clearMeasures()
 
         # Get key nodes
-        topRight = self.getRightChild(top)
         toRaiseLeft, toRaiseRight = self.getChildren(toRaise)
 
         if animation:
@@ -294,39 +409,16 @@ class RedBlackTree(BinaryTreeBase):
         else:
             topNode.setLine(toRaise.getLine())
 
-        # Extract current subtrees
-        topRightTree = self.getNodeTree(topRight, erase=True)
-        toRaiseRightTree = self.getNodeTree(toRaiseRight, erase=True)
-        toRaiseLeftTree = self.getNodeTree(toRaiseLeft, erase=True)
-
-        # Move nodes internally, noting any nodes cutoff past depth limit
-        cutoff = self.storeNodeTree(
-            [toRaise, 
-             toRaiseLeftTree, [topNode, toRaiseRightTree, topRightTree]],
-            topIndex)
+        # Relink the nodes
+        self.nodes.rotate(topIndex, Child.LEFT)
         toRaise.setLine(topParentLine)
 
-        # Move canvas items to new positions to match internal structure
-        newSubTree = self.getAllDescendants(topIndex)
-        newSubTreeItems = flat(*(
-            node.drawnValue.items for node in newSubTree + list(cutoff)))[1:]
-        toPositions = flat(*(
-            self.nodeItemCoords(node, parent=self.getParent(node)) 
-            for node in newSubTree + [len(self.nodes) * 3] * len(cutoff)))[1:]
+        # Move drawn canvas items to new positions to match internal
+        # structure.  Without animation, clean up restores them.
         if animation:
-            self.moveItemsLinearly(newSubTreeItems, toPositions,
-                                   sleepTime=wait / 10)
-        else:
-            for item, coords in zip(newSubTreeItems, toPositions):
-                self.canvas.coords(item, *coords)
-        if cutoff and animation:
-            self.setMessage(
-                'Removed node{} {} that went beyond level {}'.format(
-                    '' if len(cutoff) == 1 else 's',
-                    ', '.join(str(node.getKey()) for node in cutoff),
-                self.MAX_LEVEL - 1))
-        self.dispose(callEnviron,
-                     *flat(*(node.drawnValue.items for node in cutoff)))
+            self.moveItemsLinearly(
+                *self.drawnSubtreeItemCoords(topIndex),
+                sleepTime=wait / 10)
         self.reconnectLink(topIndex, self.getParentIndex(topIndex),
                            sleepTime=wait / 10 if animation else 0)
         
@@ -395,8 +487,15 @@ class RedBlackTree(BinaryTreeBase):
     def updateMeasures(self):
         blackRoot = (self.getRoot() is None or
                      self.nodeColor(self.getRoot()) == self.BLACK_COLOR)
-        redRedLinks = self.getRedRedLinks()
-        blackHeights = self.blackHeights()
+        changed = self.checker.update()
+        if self.layout or self.nodes.moves != self.measuredMoves:
+            self.measuredMoves = self.nodes.moves # Nodes move in a tidy
+            changed |= self.checker.redRed     # layout or with relinked
+                                               # subtrees without being
+                                               # written, so check all links
+        self.updateRedRedHighlights(changed)
+        redRedLinks = self.checker.redRed
+        blackHeights = set(self.checker.rootHeights())
         dy = textHeight(self.VALUE_FONT)
         for m in range(len(self.measures)):
             if self.canvas.type(self.measures[m]) != 'text':
@@ -421,43 +520,29 @@ class RedBlackTree(BinaryTreeBase):
             if measure and self.canvas.type(measure) == 'text':
                 self.canvas.itemConfig(measure, text='')
         self.canvas.delete(self.measureTag)
-
-    def getRedRedLinks(self):
-        links = []
-        toDo = [0]
-        self.canvas.delete(self.measureTag)
-        while toDo:
-            nodeIndex = toDo.pop(0)
-            parentIndex = self.getParentIndex(nodeIndex)
-            node = self.getNode(nodeIndex)
-            if node:
-                if (nodeIndex > 0 and 
-                    self.nodeColor(parentIndex) == self.RED_COLOR and
-                    self.nodeColor(nodeIndex) == self.RED_COLOR):
-                    links.append((parentIndex, nodeIndex))
-                    highlightLine = self.createHighlightedLine(
-                        node, width=8, color=self.ERROR_HIGHLIGHT,
-                        tags=self.measureTag)
-                    self.canvas.tag_lower(highlightLine)
-                toDo.extend([self.getLeftChildIndex(nodeIndex),
-                             self.getRightChildIndex(nodeIndex)])
-        return links
-
-    def blackHeights(self):
-        heights = set()
-        toDo = [(0, 0)]
-        while toDo:
-            nodeIndex, blackHeight = toDo.pop(0)
-            node = self.getNode(nodeIndex)
-            if node:
-                if self.nodeColor(nodeIndex) == self.BLACK_COLOR:
-                    blackHeight += 1
-                for child in [self.getLeftChildIndex(nodeIndex),
-                              self.getRightChildIndex(nodeIndex)]:
-                    toDo.append((child, blackHeight))
-            else:
-                heights.add(blackHeight)
-        return heights
+        self.redRedHighlights = {}
+        self.checker.changed |= self.checker.redRed
+
+    def updateRedRedHighlights(self, nodes):
+        '''Add, move, or remove the highlights on the links from the given
+        nodes to their parents to match the red-red links found by the
+        checker'''
+        for node in nodes:
+            highlight = self.redRedHighlights.get(node)
+            if node in self.checker.redRed:
+                coords = self.lineCoordinates(node)
+                if highlight is None:
+                    item = self.canvas.create_line(
+                        *coords, fill=self.ERROR_HIGHLIGHT, width=8,
+                        arrow=FIRST, tags=('highlight', 'line', self.measureTag))
+                    self.canvas.tag_lower(item)
+                    self.redRedHighlights[node] = (item, coords)
+                elif highlight[1] != coords:
+                    self.canvas.coords(highlight[0], coords)
+                    self.redRedHighlights[node] = (highlight[0], coords)
+            elif highlight:
+                self.canvas.delete(highlight[0])
+                del self.redRedHighlights[node]
         
     def _find(self, goal, prepare=False, animation=False):
         'Find a goal key in the tree, optionally preparing for insert'
@@ -546,9 +631,6 @@ class RedBlackTree(BinaryTreeBase):
         wait = 0.1
         callEnviron = self.createCallEnvironment()
         node, parent = self._find(key, prepare=True, animation=animation)
-        if node >= len(self.nodes):
-            self.cleanUp(callEnviron)
-            return None
         inserted = self.getNode(node) is None
         newNode = self.createNode(
             key, parent=None if parent < 0 or animation else self.nodes[parent],
@@ -744,8 +826,9 @@ class RedBlackTree(BinaryTreeBase):
         list of integers or an integer number of random values'''
         callEnviron = self.createCallEnvironment()
         
-        nums = random.sample(range(self.valMax), values) if (
-            isinstance(values, int)) else values
+        nums = random.sample(
+            range(self.valMax), min(values, self.valMax)) if (
+                isinstance(values, int)) else values
         self.emptyTree()
         for num in nums:
             self.insert(num, animation=animation)
@@ -753,6 +836,16 @@ class RedBlackTree(BinaryTreeBase):
 
         self.cleanUp(callEnviron)
     
+    def balancedLevelStates(self, nKeys):
+        '''Color the nodes of a balanced tree black except for those on a
+        deepest level that is not full, which are red.  Every path from the
+        root to an empty child then has the same number of black nodes.'''
+        deepest = nKeys.bit_length() - 1
+        black = {'ringColor': self.BLACK_COLOR}
+        red = {'ringColor': self.RED_COLOR}
+        return [black] * deepest + [
+            red if deepest > 0 and nKeys != 2 ** (deepest + 1) - 1 else black]
+
     def clickDelete(self):
         val = self.validArgument()
         if val is not None:
@@ -822,6 +915,11 @@ class RedBlackTree(BinaryTreeBase):
             "Erase & Random Fill", self.clickFill, numArguments=1,
             validationCmd=vcmd, argHelpText=['number of items'], 
             helpText='Empty tree and fill it\nwith a number of random items')
+        bulkLoadButton = self.addOperation(
+            "Erase & Balanced Fill", self.clickBulkLoad, numArguments=1,
+            validationCmd=vcmd, argHelpText=['number of items'],
+            helpText='Empty tree and build a balanced tree\n'
+            'of random items in one pass')
         flipButton = self.addOperation(
             "Flip Color", self.clickFlip, numArguments=1, validationCmd=vcmd,
             argHelpText=['item'], helpText='Flip red/black color of item')
@@ -834,15 +932,16 @@ class RedBlackTree(BinaryTreeBase):
             numArguments=1, validationCmd=vcmd, argHelpText=['item'],
             helpText='Rotate right around item')
         self.addAnimationButtons()
-        return [fillButton, searchButton, insertButton, deleteButton,
-                flipButton, rotateLeftButton, rotateRightButton]
+        return [fillButton, bulkLoadButton, searchButton, insertButton,
+                deleteButton, flipButton, rotateLeftButton, rotateRightButton]
 
 if __name__ == '__main__':
     nonneg, negative, options, otherArgs = categorizeArguments(sys.argv[1:])
     if '-r' not in options:  # Use fixed seed for testing consistency unless
         random.seed(3.14159) # random option specified
     numArgs = [int(arg) for arg in sys.argv[1:] if arg.isdigit()]
-    tree = RedBlackTree(values=[int(arg) for arg in nonneg] if nonneg else None)
+    tree = RedBlackTree(values=[int(arg) for arg in nonneg] if nonneg else None,
+                        TIDY_LAYOUT='-t' in options)
     tree.DEBUG = '-d' in options
 
     tree.runVisualization()
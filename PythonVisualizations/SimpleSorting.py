@@ -17,10 +17,10 @@ class SimpleArraySort(SortingBase):
         super().__init__(**kwargs)
 
         if values is None:
-            for i in range(self.size):
-                self.list.append(drawnValue(random.randrange(self.valMax)))
+            self.list.extend(drawnValue.many(
+                random.randrange(self.valMax) for i in range(self.size)))
         else:
-            self.list = [drawnValue(val) for val in values]
+            self.list = drawnValue.many(values)
         self.display()
 
         self.buttons = self.makeButtons()
@@ -329,9 +329,8 @@ def insert(self, item={val}):
 
         toFill = self.size - len(self.list)
         if toFill > 0:
-            self.list.extend([
-                drawnValue(random.randrange(self.valMax)) 
-                for i in range(toFill)])
+            self.list.extend(drawnValue.many(
+                random.randrange(self.valMax) for i in range(toFill)))
         else:
             self.setMessage('Array is already full')
         
@@ -343,11 +342,10 @@ def insert(self, item={val}):
 
         toFill = self.size - len(self.list)
         if toFill > 0:
-            self.list.extend([
-                drawnValue(
-                    int((i if increasing else max(1, toFill - 1) - i) *
-                        self.valMax / max(1, toFill - 1)))
-                for i in range(toFill)])
+            self.list.extend(drawnValue.many(
+                int((i if increasing else max(1, toFill - 1) - i) *
+                    self.valMax / max(1, toFill - 1))
+                for i in range(toFill)))
         else:
             self.setMessage('Array is already full')
         self.display(showNItems=self.nItems)
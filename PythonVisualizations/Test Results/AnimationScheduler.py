@@ -0,0 +1 @@
+../AnimationScheduler.py
\ No newline at end of file
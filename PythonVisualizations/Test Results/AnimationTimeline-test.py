@@ -0,0 +1,67 @@
+from BinaryTree import *
+import random
+import sys
+
+def replayedState(timeline, step):
+    'State at a step found by applying every delta from the first step'
+    items, order, code = {}, (), ('', ())
+    for changes, newOrder, newCode in timeline.deltas[:step + 1]:
+        for item, itemState in changes.items():
+            if itemState is None:
+                items.pop(item, None)
+            else:
+                items[item] = itemState
+        if newOrder is not None:
+            order = newOrder
+        if newCode is not None:
+            code = newCode
+    return items, order, code
+
+def recordedTimeline(seed, nKeys=12, keyframeInterval=8):
+    'Record the inserts and deletes of random keys in a binary tree'
+    random.seed(seed)
+    tree = BinaryTree(headless=True)
+    tree.emptyTree()
+    tree.display()
+    keys = random.sample(range(99), nKeys)
+    tree.startRecording(keyframeInterval)
+    for key in keys:
+        tree.insert(key)
+    for key in keys[::3]:
+        tree.delete(key)
+    return tree.stopRecording()
+
+def testSeeks(seed, nSeeks=300):
+    '''Seek to random steps, nearby and distant, forwards and backwards,
+    and compare the states with a replay from the start and the changed
+    items reported with the differences from the previous state'''
+    timeline = recordedTimeline(seed)
+    last = len(timeline) - 1
+    steps = [random.randrange(len(timeline)) for i in range(nSeeks // 3)]
+    step = 0
+    for i in range(nSeeks // 3):
+        step = max(0, min(last, step + random.randint(-3, 3)))
+        steps.append(step)
+    steps.extend(range(last, -1, -1))
+    shown = {}
+    for step in steps:
+        changed = timeline.seek(step)
+        state = timeline.stateAt(step)
+        assert state == replayedState(timeline, step), (
+            'Seed {}: state at step {} differs from replay'.format(
+                seed, step))
+        items = state[0]
+        assert all(shown.get(item) == items.get(item)
+                   for item in set(shown) | set(items)
+                   if item not in changed), (
+            'Seed {}: seek to step {} missed changed items'.format(
+                seed, step))
+        shown = dict(items)
+    print('Seed {}: {} seeks in {} matched a replay'.format(
+        seed, len(steps), timeline))
+
+if __name__ == '__main__':
+    seeds = [int(arg) for arg in sys.argv[1:]] or [1, 2, 3]
+    for seed in seeds:
+        testSeeks(seed)
+    print('All timeline tests passed')
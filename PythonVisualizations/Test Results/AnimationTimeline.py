@@ -0,0 +1 @@
+../AnimationTimeline.py
\ No newline at end of file
@@ -0,0 +1,42 @@
+from BinaryTree import *
+from AVLTree import *
+from RedBlackTree import *
+import random
+import sys
+
+def drawnCenter(tree, node):
+    'Center of the shape drawn for a node on the canvas'
+    x0, y0, x1, y1 = tree.canvas.coords(node.drawnValue.items[1])
+    return ((x0 + x1) / 2, (y0 + y1) / 2)
+
+def staleNodes(tree):
+    'Keys of the drawn nodes that are not at their tidy layout positions'
+    return [node.getKey() for index, node, center in tree.layout.centers()
+            if not node.culled and any(
+                    abs(a - b) > 0.5
+                    for a, b in zip(drawnCenter(tree, node), center))]
+
+def testInstantInserts(cls, seed, nKeys=25):
+    '''Insert keys in instant mode into a tree with a tidy layout and check
+    that every drawn node is at its layout position after each insert'''
+    random.seed(seed)
+    tree = cls(TIDY_LAYOUT=True, MAX_LEVEL=6, headless=True)
+    tree.setInstantMode(True)
+    tree.emptyTree()
+    tree.display()
+    for key in random.sample(range(99), nKeys):
+        tree.cleanUp()
+        tree.insert(key)
+        stale = staleNodes(tree)
+        assert not stale, (
+            '{} seed {}: nodes {} not at layout positions after '
+            'inserting {}'.format(cls.__name__, seed, stale, key))
+    print('{} seed {}: {} instant inserts matched the layout'.format(
+        cls.__name__, seed, nKeys))
+
+if __name__ == '__main__':
+    seeds = [int(arg) for arg in sys.argv[1:]] or [1, 2, 3]
+    for cls in (BinaryTree, AVLTree, RedBlackTree):
+        for seed in seeds:
+            testInstantInserts(cls, seed)
+    print('All tidy layout tests passed')
@@ -0,0 +1,87 @@
+from BinaryTreeBase import *
+import random
+import sys
+
+def walkedIndices(nodes):
+    'Indices of the nodes found by following the links from the anchors'
+    indices = {}
+    for index, node in nodes.anchors.items():
+        stack = [(index, node)]
+        while stack:
+            index, node = stack.pop()
+            indices[node] = index
+            if node.left:
+                stack.append((2 * index + 1, node.left))
+            if node.right:
+                stack.append((2 * index + 2, node.right))
+    return indices
+
+def anchoredBelow(nodes, index):
+    'Whether any subtrees are left anchored below an index'
+    for anchor in nodes.anchors:
+        while anchor > index:
+            anchor = (anchor - 1) // 2
+            if anchor == index:
+                return True
+    return False
+
+def checkIndices(nodes, removed):
+    '''Compare the index lookups of a node array with the indices found by
+    walking its links'''
+    indices = walkedIndices(nodes)
+    assert len(indices) == nodes.count, 'count'
+    for node, index in indices.items():
+        assert nodes.find(node) == index, 'index of {}'.format(node.tag)
+        assert nodes.get(index) is node, 'node at {}'.format(index)
+    for node in removed - set(indices):
+        assert nodes.find(node) == -1, 'removed {}'.format(node.tag)
+    assert len(nodes.items()) == nodes.count, 'items'
+
+def testNodeArray(seed, nOperations=2000, levels=4):
+    '''Apply random writes, rotations, and subtree moves to a small node
+    array and check the index lookups after each one.  Rotations are
+    only made where no subtrees are left anchored below, as in the
+    trees.'''
+    random.seed(seed)
+    nodes = NodeArray(2 ** levels - 1)
+    made = set()
+    for step in range(nOperations):
+        occupied = [index for index, node in nodes.items()]
+        choice = random.random()
+        if choice < 0.4 or not occupied:
+            index = random.randrange(2 ** (levels + 1) - 1)
+            node = Node(None, (0, 0), 'n{}'.format(step))
+            made.add(node)
+            nodes[index] = node
+            operation = 'write {} at {}'.format(node.tag, index)
+        elif choice < 0.55:
+            index = random.choice(occupied)
+            nodes[index] = None
+            operation = 'clear {}'.format(index)
+        elif choice < 0.8:
+            index = random.choice(occupied)
+            side = random.choice((Child.LEFT, Child.RIGHT))
+            top = nodes.get(index)
+            if (top.left if side == Child.LEFT else top.right) and not (
+                    anchoredBelow(nodes, index)):
+                nodes.rotate(index, side)
+            operation = 'rotate {} {}'.format(index, side)
+        else:
+            index = random.choice(occupied)
+            child = 2 * index + random.choice((1, 2))
+            nodes.move(index, child if random.random() < 0.8 else -1)
+            operation = 'move {} to {}'.format(child, index)
+        try:
+            checkIndices(nodes, made)
+        except AssertionError as error:
+            raise AssertionError(
+                'Seed {} step {}: {} after {}'.format(
+                    seed, step, error, operation))
+    print('Seed {}: {} operations kept indices consistent, {} levels'.format(
+        seed, nOperations, nodes.levels))
+
+if __name__ == '__main__':
+    seeds = [int(arg) for arg in sys.argv[1:]] or [1, 2, 3, 4]
+    for seed in seeds:
+        testNodeArray(seed)
+    print('All node array tests passed')
@@ -0,0 +1 @@
+../HeadlessScrim.py
\ No newline at end of file
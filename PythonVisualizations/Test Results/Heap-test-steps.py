@@ -0,0 +1,67 @@
+from Heap import *
+from BinaryTree import *
+import random
+import sys
+
+def isHeap(heap):
+    'Whether the heap array satisfies the heap condition'
+    keys = [item.val for item in heap._arr]
+    return all(keys[(i - 1) // 2] >= keys[i] for i in range(1, len(keys)))
+
+def randomHeap(seed, nItems):
+    'Make a heap app with a random fill from a seed'
+    random.seed(seed)
+    heap = Heap(headless=True)
+    heap.randomFill(nItems)
+    return heap
+
+def testHeapify(seed, nItems=20):
+    '''Heapify random fills with the operation button, which runs the
+    operation's steps, and with the synchronous call, and compare them'''
+    stepped = randomHeap(seed, nItems)
+    stepped.heapifyButton.invoke()
+    called = randomHeap(seed, nItems)
+    called.heapify()
+    assert isHeap(stepped), 'Seed {}: heapify steps'.format(seed)
+    assert [item.val for item in stepped._arr] == [
+        item.val for item in called._arr], (
+            'Seed {}: heapify steps differ from heapify call'.format(seed))
+    print('Seed {}: heapified {} items in steps'.format(seed, nItems))
+
+def outputKeys(tree, steps):
+    'Run the steps of an operation and get the keys it appends to outputs'
+    keys, appendText = [], OutputBox.appendText
+    def noteKey(box, item, *args, **kwargs):
+        keys.append(int(tree.canvas.itemcget(item, 'text')))
+        appendText(box, item, *args, **kwargs)
+    OutputBox.appendText = noteKey
+    try:
+        tree.runSteps(steps)
+    finally:
+        OutputBox.appendText = appendText
+    tree.cleanUp()
+    return keys
+
+def testTraverse(seed, nKeys=15):
+    '''Traverse a random tree in the steps of the traverse example and
+    compare the keys output with the keys from the iterator'''
+    random.seed(seed)
+    tree = BinaryTree(headless=True)
+    for key in random.sample(range(99), nKeys):
+        tree.insert(key)
+        tree.cleanUp()
+    for traverseType in ('pre', 'in', 'post'):
+        output = outputKeys(tree, tree.traverseExampleSteps(traverseType))
+        keys = [key for key, items in tree.traverse(traverseType)]
+        tree.cleanUp()
+        assert output == keys and (
+            traverseType != 'in' or keys == sorted(keys)), (
+                'Seed {}: {}-order traversal'.format(seed, traverseType))
+    print('Seed {}: traversed {} keys in steps'.format(seed, nKeys))
+
+if __name__ == '__main__':
+    seeds = [int(arg) for arg in sys.argv[1:]] or [1, 2, 3]
+    for seed in seeds:
+        testHeapify(seed)
+        testTraverse(seed)
+    print('All operation step tests passed')
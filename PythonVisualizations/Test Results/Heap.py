@@ -0,0 +1 @@
+../Heap.py
\ No newline at end of file
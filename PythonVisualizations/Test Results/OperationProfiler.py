@@ -0,0 +1 @@
+../OperationProfiler.py
\ No newline at end of file
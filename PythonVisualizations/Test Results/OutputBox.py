@@ -0,0 +1 @@
+../OutputBox.py
\ No newline at end of file
@@ -0,0 +1,79 @@
+from RedBlackTree import *
+import random
+import sys
+
+def checkerState(tree):
+    'Red-red links and root black heights tracked by the tree checker'
+    tree.updateMeasures()
+    return set(tree.checker.redRed), tree.checker.rootHeights()
+
+def rebuiltState(tree):
+    'Red-red links and root black heights found by checking every node'
+    checker = RedBlackChecker(tree)
+    checker.rebuild(tree.nodes)
+    tree.nodes.checker = tree.checker
+    return set(checker.redRed), checker.rootHeights()
+
+def testLargeMaxLevel(maxLevel=40, nKeys=1000):
+    '''Build trees whose node array capacity is far larger than memory
+    would hold as a list'''
+    tree = RedBlackTree(MAX_LEVEL=maxLevel, VAL_MAX=10 * nKeys, headless=True)
+    keys = random.sample(range(10 * nKeys), nKeys + 50)
+    tree.bulkLoad(keys[:nKeys])
+    assert checkerState(tree) == rebuiltState(tree), 'bulk load'
+    for key in keys[nKeys:]:
+        tree.insert(key, animation=False)
+    tree.updateMeasures()
+    assert checkerState(tree) == rebuiltState(tree), 'inserts'
+    print('Built red-black tree with MAX_LEVEL = {} and {} nodes'.format(
+        maxLevel, tree.nodes.count))
+
+def testIncrementalUpdates(seed, maxLevel=8, nOperations=400):
+    '''Apply random inserts, deletes, color flips, and rotations to a
+    small tree, where rotations can push nodes below its initial levels,
+    and compare the checker with a full rebuild after each one'''
+    random.seed(seed)
+    tree = RedBlackTree(MAX_LEVEL=maxLevel, VAL_MAX=999, headless=True)
+    tree.emptyTree()
+    tree.display()
+    for step in range(nOperations):
+        tree.startAnimations()
+        tree.instant = True
+        keys = [node.getKey() for node in tree.nodes]
+        choice = random.random()
+        if choice < 0.35 or not keys:
+            key = random.randrange(999)
+            if key not in keys:
+                tree.insert(key, animation=False)
+            operation = 'insert {}'.format(key)
+        elif choice < 0.5:
+            key = random.choice(keys)
+            tree.delete(key, start=False)
+            operation = 'delete {}'.format(key)
+        elif choice < 0.7:
+            key = random.choice(keys)
+            tree.flipNodeColor(tree._find(key)[0])
+            operation = 'flip {}'.format(key)
+        else:
+            key = random.choice(keys)
+            index = tree._find(key)[0]
+            left = random.random() < 0.5
+            if tree.getNode(2 * index + (2 if left else 1)):
+                tree.startAnimations()
+                (tree.rotateLeft if left else tree.rotateRight)(
+                    index, animation=False)
+            operation = 'rotate {} {}'.format(
+                'left' if left else 'right', key)
+        assert checkerState(tree) == rebuiltState(tree), (
+            'Seed {} step {}: checker differs from rebuild after {}'.format(
+                seed, step, operation))
+    print('Seed {}: {} operations matched a full rebuild'.format(
+        seed, nOperations))
+
+if __name__ == '__main__':
+    seeds = [int(arg) for arg in sys.argv[1:]] or [1, 2, 3, 4]
+    random.seed(seeds[0])
+    testLargeMaxLevel()
+    for seed in seeds:
+        testIncrementalUpdates(seed)
+    print('All red-black checker tests passed')
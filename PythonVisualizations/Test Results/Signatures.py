@@ -0,0 +1 @@
+../Signatures.py
\ No newline at end of file
@@ -0,0 +1 @@
+../TableDisplay.py
\ No newline at end of file
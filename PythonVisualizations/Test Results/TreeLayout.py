@@ -0,0 +1 @@
+../TreeLayout.py
\ No newline at end of file
@@ -0,0 +1 @@
+../tkUtilities.py
\ No newline at end of file
@@ -1,10 +1,81 @@
 # Utilities for managing highlights on Tk text widgets corresponding
 # to source code
 
-import re
+import re, bisect
+from collections import OrderedDict
+from tkinter import TclError
 
 declarationPattern = re.compile(r'^\s*(def|class)\s+(\w+)(\W|$)')
 
+class CodeFragmentIndex(object):
+    '''Index of the positions of fragments in a code string.  One index is
+    kept for each distinct code string and shared by all the
+    CodeHighlightBlocks showing that code, so fragments are only searched
+    for the first time they are highlighted in any call.  Character
+    offsets are converted to line.char positions by binary search of the
+    offsets where lines start.  Code is often formatted with argument
+    values, so only the most recently used indices are kept.
+    '''
+
+    MAX_INDICES = 256
+    indices = OrderedDict()  # Shared indices by code string, least recently
+                             # used first
+
+    @classmethod
+    def forCode(cls, code):  # Get the shared index for a code string
+        index = cls.indices.get(code)
+        if index is None:
+            index = cls.indices[code] = cls(code)
+            while len(cls.indices) > cls.MAX_INDICES:
+                cls.indices.popitem(last=False)
+        else:
+            cls.indices.move_to_end(code)
+        return index
+
+    def __init__(self, code):
+        self.code = code
+        self.lineStarts = [0] + [
+            match.end() for match in re.finditer('\n', code)]
+        self.spans = {}      # Relative spans by (fragment, copy)
+        declaration = declarationPattern.match(
+            code[:self.lineStarts[1] if len(self.lineStarts) > 1 else None])
+        self.blockName = declaration and declaration.group(2)
+
+    def position(self, offset): # Convert character offset to line.char
+        line = bisect.bisect_right(self.lineStarts, offset) - 1
+        return '{}.{}'.format(line, offset - self.lineStarts[line])
+
+    def span(self, fragment, copy=1): # Get cached span of fragment
+        key = (fragment, copy)
+        if key not in self.spans:
+            self.spans[key] = self.findFragment(fragment, copy)
+        return self.spans[key]
+
+    def findFragment(self, fragment, copy=1):
+        '''Find the nth copy of a code fragment and return the 0-relative
+        line.char positions of its start and end, or None if it isn't
+        found.  For regex fragments that have parenthesized groups, find
+        the indices of the last, non-empty group in the match.
+        '''
+        if isinstance(fragment, type(declarationPattern)):
+            for match in fragment.finditer(self.code):
+                copy -= 1
+                if copy == 0:
+                    lastGroup = 0
+                    for i in range(1, len(match.groups()) + 1):
+                        if match.group(i):
+                            lastGroup = i
+                    return (self.position(match.start(lastGroup)),
+                            self.position(match.end(lastGroup)))
+            return None
+        start = self.code.find(fragment)
+        while start >= 0 and copy > 1:
+            copy -= 1
+            start = self.code.find(fragment, start + len(fragment))
+        if start < 0:
+            return None
+        return self.position(start), self.position(start + len(fragment))
+
 class CodeHighlightBlock(object):
     '''Class to hold information about visualizing the code during animation
     of a particular call on the call stack.  After creating a block,
@@ -17,14 +88,14 @@ class CodeHighlightBlock(object):
                  code,       # a unique prefix to highlight snippets in it,
                  textWidget): # and tags the snippets when refreenced
        self.code = code.strip()
-       self.lines = self.code.split('\n') if len(code) > 0 else []
-       declaration = self.lines and declarationPattern.match(self.lines[0])
-       self.blockName = declaration and declaration.group(2)
+       self.index = CodeFragmentIndex.forCode(self.code)
+       self.blockName = self.index.blockName
        self.cache = {}
        self.textWidget = textWidget
        self.prefix = '{:04d}-'.format(self._counter)
        self.startMark = None
        self.currentFragments = None
+       self.highlighted = {}  # Color of each highlighted tag in this block
        CodeHighlightBlock._counter += 1
 
     def __getitem__(self, fragment):
@@ -34,24 +105,28 @@ class CodeHighlightBlock(object):
            return self.cache[fragment]
        if self.startMark is None:
            raise KeyError('Missing start mark for CodeHighlightBlock')
-       span = self.findFragment(*fragment)
+       span = self.index.span(*fragment)
        if span:
-           if self.startMark in self.textWidget.mark_names():
+           try:
                startLine = int(
                    self.textWidget.index(self.startMark).split('.')[0])
-               newspan = ['{}.{}'.format(startLine + int(line), char)
-                          for line, char in [ind.split('.') for ind in span]]
-               tag = self.tag(*fragment)
-               self.textWidget.tag_add(tag, *newspan)
-               self.cache[fragment] = tag
-               return tag
-           else:
+           except TclError:
                raise KeyError('Start mark "{}" no longer in CodeHighlightBlock'
                               .format(self.startMark))
+           newspan = ['{}.{}'.format(startLine + int(line), char)
+                      for line, char in [ind.split('.') for ind in span]]
+           tag = self.tag(*fragment)
+           self.textWidget.tag_add(tag, *newspan)
+           self.cache[fragment] = tag
+           return tag
        else:
            raise KeyError('Snippet "{}" copy {} not found in code block'.format(
                *fragment))
 
+    @property
+    def lines(self):
+        return self.code.split('\n') if len(self.code) > 0 else []
+
     def __str__(self):
         return '<CodeHighlightBlock: {} {}>'.format(self.blockName, id(self))
 
@@ -64,57 +139,37 @@ class CodeHighlightBlock(object):
         when there are multiple copies.  Return the line.char position of the
         start and end of the fragment, similar to the indices used by the
         Tk text widget, but use 0-relative line numbers.
-        For regex fragments that have parenthesized groups, find the indices
-        of the last, non-empty group in the match.
         '''
-        j = 0
-        if isinstance(fragment, type(declarationPattern)):
-            matches = [match for match in fragment.finditer(self.code)]
-            if len(matches) >= copy:
-                match = matches[copy - 1]
-                lastGroup = 0
-                for i in range(1, len(match.groups()) + 1):
-                    if match.group(i):
-                        lastGroup = i
-                start = match.start(lastGroup)
-                fragment = match.group(lastGroup)
-            else:
-                start = None
-        else:
-            start = self.code.index(fragment) if fragment in self.code else None
-            while start is not None and copy > 1:
-                j = start + len(fragment)
-                copy -= 1
-                start = (j + self.code[j:].index(fragment)
-                         if fragment in self.code[j:] else None)
-        if start is None:
-            return None
-        chars, line = 0, 0
-        while (line < len(self.lines) and
-               chars + len(self.lines[line]) < start):
-            chars += len(self.lines[line]) + 1
-            line += 1
-        if line >= len(self.lines) or chars >= len(self.code):
-            raise IndexError(
-                'Internal error.  No more lines or characters when finding '
-                'fragment "{}"'.format(fragment))
-        first = '{}.{}'.format(line, start - chars)
-        while (line < len(self.lines) and
-               chars + len(self.lines[line]) < start + len(fragment)):
-            chars += len(self.lines[line]) + 1
-            line += 1
-        if line >= len(self.lines) or chars >= len(self.code):
-            raise IndexError(
-                'Internal error.  No more lines or characters when finding '
-                'fragment "{}"'.format(fragment))
-        return first, '{}.{}'.format(line, start + len(fragment) - chars)
-        
+        return self.index.span(fragment, copy)
+
+    def highlight(self, tags, color, **kwargs):
+        '''Highlight the given tags of this block with a background color
+        and remove the highlight from the block's other tags.  Only the tags
+        whose highlight changes are reconfigured.  Extra keyword arguments
+        are the options for highlighted tags, which are reset to 0 when the
+        highlight is removed.'''
+        for tag in [t for t in self.highlighted if t not in tags]:
+            self.textWidget.tag_config(
+                tag, background='', **dict((key, 0) for key in kwargs))
+            del self.highlighted[tag]
+        for tag in tags:
+            if self.highlighted.get(tag) != color:
+                self.textWidget.tag_config(tag, background=color, **kwargs)
+                self.highlighted[tag] = color
+
+    def deleteTags(self):
+        '''Remove all the tags of this block from the Tk text widget'''
+        if self.cache and self.textWidget:
+            self.textWidget.tag_delete(*self.cache.values())
+        self.cache = {}
+        self.highlighted = {}
+
     def markStart(self, ind='1.0', resetCache=True):
         '''Mark the start of this code block inside the Tk text widget'''
         self.startMark = self.prefix + '▶'
         self.textWidget.mark_set(self.startMark, ind)
         if resetCache:
-            self.cache = {}
+            self.deleteTags()
 
 def getCodeHighlightBlock(seq):
     'Utility to find the first CodeHighlightBlock within a sequence'
@@ -33,14 +33,47 @@ class Node234(object):
         if not all(isinstance(x, type(self)) for x in children):
             raise Exception(  # Verify type of children
                 'All children of 2-3-4 tree nodes must be more nodes')
-        self.dValue = dValue
+        self._dValue = dValue
+        self.culled = None    # (app, drawing state) while items are culled
         self.nKeys = len(keys)
         self.keys = [None] * Tree234.maxKeys
         self.keys[0:len(keys)] = keys
         self.nChild = len(children)
         self.children = [None] * Tree234.maxLinks
         self.children[0:len(children)] = children
-        self.center = center
+        self._center = center
+
+    @property
+    def dValue(self):        # Redraw culled nodes when their items are needed
+        self.redraw()
+        return self._dValue
+
+    @dValue.setter
+    def dValue(self, value):
+        if self.culled:
+            self.uncull()
+        self._dValue = value
+
+    @property
+    def center(self):       # Culled nodes are placed by their app when used
+        return self.culled[0].culledCenter(self) if self.culled else (
+            self._center)
+
+    @center.setter
+    def center(self, center):
+        self._center = center
+
+    def redraw(self):       # Recreate the canvas items of a culled node
+        if self.culled:
+            app, state = self.uncull()
+            app.redrawCulledNode(self, state)
+
+    def uncull(self):       # Fix the center of a culled node, note that it
+        app, state = self.culled # is drawn, and return its app and drawing
+        self._center = self.center # state
+        self.culled = None
+        app.drawnNodes.add(self)
+        return app, state
 
     def keyItems(self):
         "Get the key items from this node's drawnValue"
@@ -83,6 +116,11 @@ class Tree234(BinaryTreeBase):
         self.ROOT_X0, self.ROOT_Y0 = 0, 25
         self.LEVEL_GAP = self.CIRCLE_SIZE * 8
         self.scale, self.fontScale = 1.0, abs(self.FONT_SIZE)
+        self.pendingDraw = None
+        for scrollbar, view in ((self.canvasHScroll, self.canvas.xview),
+                                (self.canvasVScroll, self.canvas.yview)):
+            if scrollbar:
+                scrollbar['command'] = self.scrollAndDraw(view)
         self.buttons = self.makeButtons()
         self.newTree()
         
@@ -159,27 +197,49 @@ class Tree234(BinaryTreeBase):
                              (self.LEVEL_GAP + dY * (childNum - halfKeys)) *
                              scale)
                            
-    def recenterNodes(
-            self, node, parent=None, level=None, childNum=None, byLevel=False):
-        if node is None:
-            return
-        if byLevel:
-            if level is None or childNum is None:
-                raise ValueError(
-                    'Cannot recenter nodes without level and childNum')
-            node.center = ((self.ROOT_X0, self.ROOT_Y0) if parent is self else
-                           self.childCoords(parent, childNum, level))
-        else:
-            node.center = tuple(self.canvas.coords(node.keyItems()[1]))
-        for ci in range(node.nChild):
-            self.recenterNodes(node.children[ci], node, 
-                               None if level is None else level + 1, ci,
-                               byLevel=byLevel)
-
-    def scaleItems(self, *args, **kwargs):
+    def recenterNodes(self, scaled=(0, 0, 1)):
+        '''Update node centers after the canvas changes.  Drawn nodes take
+        their centers from their canvas items.  A culled root is scaled
+        about (x0, y0) by the scaled tuple.  Other culled nodes are placed
+        relative to their parents when used.'''
+        for node in self.drawnNodes:
+            coords = self.canvas.coords(node.keyItems()[1])
+            if coords:
+                node.center = tuple(coords)
+        root = self.rootNode
+        if root and root.culled:
+            x0, y0, scaleBy = scaled
+            root.center = tuple(
+                V(V(V(root.center) - V(x0, y0)) * scaleBy) + V(x0, y0))
+
+    def scaleItems(self, x0, y0, scaleBy, *args, **kwargs):
         '''After scale changes, update node centers for new scale'''
-        super().scaleItems(*args, **kwargs)
-        self.recenterNodes(self.rootNode, self, 0, 0)
+        super().scaleItems(x0, y0, scaleBy, *args, **kwargs)
+        self.recenterNodes(scaled=(x0, y0, scaleBy))
+
+    def placedCenter(self, node, drawn=True):
+        '''Compute a node's center by descending from the root and placing
+        each node on the path relative to its parent.  If drawn is true,
+        drawn nodes and the root keep their current centers.  Returns None
+        if the node is not in the tree.'''
+        current, center, level, key = self.rootNode, None, 0, node.keys[0]
+        while current:
+            center = (
+                current._center if drawn and (
+                    center is None or not current.culled) else
+                (self.ROOT_X0, self.ROOT_Y0) if center is None else
+                self.childCoords(center, childNum, level))
+            if current is node:
+                return center
+            childNum = 0
+            while childNum < current.nKeys and current.keys[childNum] < key:
+                childNum += 1
+            if childNum >= current.nChild:
+                return None
+            current, level = current.children[childNum], level + 1
+
+    def culledCenter(self, node): # Center of a culled node below its parent
+        return self.placedCenter(node) or node._center
         
     def getAllDescendants(self, node):
         if isinstance(node, Node234):
@@ -317,6 +377,129 @@ class Tree234(BinaryTreeBase):
         return (linkItem, lcItem, rectItem, rcItem,
                 *textItems, *dataItems, *cellItems)
 
+    def parentAndChild(self, node):
+        '''Find the parent of a node and its child number by descending
+        from the root using the node's first key.  The tree object is the
+        parent of the root.  Returns None, 0 if the node isn't found.'''
+        parent, childNum, current = self, 0, self.rootNode
+        key = node.keys[0]
+        while current and current is not node:
+            child = 0
+            while child < current.nKeys and current.keys[child] < key:
+                child += 1
+            if child >= current.nChild:
+                return None, 0
+            parent, childNum, current = current, child, current.children[child]
+        return (parent, childNum) if current is node else (None, 0)
+
+    def visibleNodes(self):
+        '''Find the nodes to draw by going down the tree.  Nodes are drawn if
+        they are in or near the visible canvas.  Subtrees whose extent lies
+        completely outside the visible canvas are summarized.  Returns the
+        list of nodes to draw and the (node, parent, childNum) tuples of the
+        summarized subtrees.'''
+        margin = 2 * self.CIRCLE_SIZE * self.scale
+        left, top, right, bottom = V(self.visibleCanvas()) + V(
+            -margin, -margin, margin, margin)
+        nodeWidth = self.CIRCLE_SIZE * Tree234.maxKeys * 2 * self.scale
+        bounds = self.desiredTreeBounds(max(1, self.maxLevel))
+        treeWidth = bounds[2] - bounds[0] - nodeWidth
+        drawn, summarized = [], []
+        stack = [(self.rootNode, self, 0, 0, None)] if self.rootNode else []
+        while stack:
+            node, parent, childNum, level, parentCenter = stack.pop()
+            x, y = center = (     # Place culled nodes below their parents
+                node.center if parent is self or not node.culled else
+                self.childCoords(parentCenter, childNum, level))
+            halfWidth = (2 * treeWidth / Tree234.maxLinks ** (level + 1) +
+                         nodeWidth / 2)
+            if x + halfWidth < left or right < x - halfWidth or bottom < y:
+                summarized.append((node, parent, childNum))
+                continue
+            if (left <= x + nodeWidth / 2 and x - nodeWidth / 2 <= right and
+                top <= y):
+                drawn.append(node)
+            stack.extend((node.children[c], node, c, level + 1, center)
+                         for c in range(node.nChild))
+        return drawn, summarized
+
+    def drawVisibleNodes(self):
+        '''Cull the canvas items of nodes that are not visible, redraw the
+        visible nodes that were culled, and draw a placeholder wedge from
+        each visible node to any of its subtrees that are summarized.'''
+        self.canvas.delete('placeholder')
+        drawn, summarized = self.visibleNodes()
+        keep = set(drawn)
+        for node in self.drawnTreeNodes():
+            if node not in keep:
+                self.cullNode(node)
+        for node in drawn:
+            node.redraw()
+        for node, parent, childNum in summarized:
+            if parent in keep:
+                self.createPlaceholder(
+                    self.nodeChildAnchor(parent, childNum), node.center,
+                    radius=self.CIRCLE_SIZE * self.scale)
+
+    def culledNodeState(self, node):
+        return {'data': [self.canvas.itemConfig(item, 'fill')
+                         for item in node.dataItems()[:node.nKeys]]}
+
+    def cullNode(self, node, deleteItems=True):
+        state = self.culledNodeState(node)
+        if deleteItems:
+            self.canvas.delete(*node.dValue.items)
+        node.dValue.items = ()
+        node.culled = (self, state)
+        self.drawnNodes.discard(node)
+
+    def cullAllNodes(self, deleteItems=False):
+        for node in list(self.drawnNodes):
+            if not node.culled:
+                self.cullNode(node, deleteItems=deleteItems)
+
+    def drawnTreeNodes(self):
+        '''Forget the drawn nodes that were culled or removed from the tree
+        and return a list of the rest'''
+        self.drawnNodes = set(
+            node for node in self.drawnNodes
+            if not node.culled and node.nKeys > 0 and
+            self.parentAndChild(node)[0] is not None)
+        return list(self.drawnNodes)
+
+    def drawAllNodes(self):
+        self.restoreNodes()
+        if self.CULL_NODES:
+            self.drawVisibleNodes()
+        else:
+            for node in self.getAllDescendants(self.rootNode):
+                node.redraw()
+
+    def redrawCulledNode(self, node, state):
+        parent, childNum = self.parentAndChild(node)
+        node.dValue.items = self.createNodeShapes(
+            node.center, node.keys[:node.nKeys], data=list(state['data']),
+            parent=parent, childNum=childNum)
+        for key, item in zip(node.keys[node.nKeys:],
+                             node.keyItems()[node.nKeys:]):
+            if key is not None:
+                self.canvas.itemConfig(item, text=str(key))
+
+    def scrollAndDraw(self, view): # Make a scrollbar command that scrolls
+        def scroll(*args):         # the canvas view and then draws the
+            view(*args)            # visible nodes when idle
+            self.drawWhenIdle()
+        return scroll
+
+    def drawWhenIdle(self):
+        if self.pendingDraw is None and self.CULL_NODES:
+            self.pendingDraw = self.window.after_idle(self.drawIfIdle)
+
+    def drawIfIdle(self):      # Draw visible nodes unless an operation is
+        self.pendingDraw = None   # in progress
+        if len(self.callStack) == 0 and not self.destroyed:
+            self.drawVisibleNodes()
+
     def textItemClickHandler(self, textItem):
         def textItemClick(e=None):
             self.setArgument(self.canvas.itemConfig(textItem, 'text'))
@@ -520,6 +703,7 @@ def insert(self, key={key}, value):
                                      sleepTime=wait / 10, see=True)
                 self.rootNode = Node234(drawnValue([key], *newNodeItems),
                                         center=center)
+                self.drawnNodes.add(self.rootNode)
                 self.updateMaxLevelAndBounds(self.maxLevel + 1)
                 self.updateTreeObjectRootPointer(root=self.rootNode)
                 
@@ -730,6 +914,7 @@ def __splitNode(self, toSplit={toSplitStr},
         childrenToRemove = toSplit.children[2:toSplit.nChild]
         newNode = Node234(drawnValue([toSplit.keys[2]], *newNodeItems),
                           *childrenToRemove, center=newNodeCenter)
+        self.drawnNodes.add(newNode)
         if animation:
             newNodeConfig = {'keyNum': -0.2, 'orientation': -135, 'anchor': SW,
                              'level': 2}
@@ -779,6 +964,7 @@ def __splitNode(self, toSplit={toSplitStr},
                 drawnValue([toSplit.keys[1]], *newRootItems),
                 toSplit, newNode, 
                 center=newRootCenter if animation else rootCenter)
+            self.drawnNodes.add(self.rootNode)
             self.updateMaxLevelAndBounds(self.maxLevel + 1)
             if animation:
                 links = (self.treeObject[1], toSplit.dValue.items[0], 
@@ -1084,14 +1270,68 @@ def insertKeyValue(self={selfStr}, key={key}, data, subtree={subtreeStr}):
         return True
     
     def randomFill(self, quantity, animation=False):
-        values = random.sample(range(self.valMax + 1), quantity)
-        for value in values:
-            self.insert(value, animation=animation)
-        self.scrollToSee(
-            flat(*(n.dValue.items 
-                   for n in self.getAllDescendants(self.rootNode))),
+        values = random.sample(range(self.valMax + 1),
+                               min(quantity, self.valMax + 1))
+        if animation:
+            for value in values:
+                self.insert(value, animation=animation)
+        else:
+            self.bulkLoad([key for node in self.getAllDescendants(self.rootNode)
+                           for key in node.keys[:node.nKeys]] + values)
+        self.scrollToSee(     # See the root first and then the drawn nodes
+            [BBoxUnion(*self.nodeItemCoords(n)[1:4:2])
+             for n in ([self.rootNode] if self.rootNode else []) +
+             [n for n in self.drawnTreeNodes() if n is not self.rootNode]],
             sleepTime=0)
-            
+        if self.CULL_NODES:
+            self.drawVisibleNodes()
+
+    def bulkLoad(self, values):
+        '''Empty the tree and fill it with values which is either a list of
+        integers or an integer number of random values.  The sorted values
+        are packed into the shortest tree that holds them, with all leaves
+        on the same level, in linear time.  No canvas items are made for
+        the nodes until the tree is displayed at the end.'''
+        nums = random.sample(range(self.valMax + 1),
+                             min(values, self.valMax + 1)) if (
+            isinstance(values, int)) else values
+        keys = sorted(set(nums))
+        self.emptyTree()
+        height = 0
+        while len(keys) > Tree234.maxLinks ** (height + 1) - 1:
+            height += 1
+        with pausedGarbageCollection():
+            if keys:
+                self.rootNode = self.packedSubtree(keys, 0, len(keys), height)
+                self.updateMaxLevelAndBounds(height)
+            self.display(treeLabel='Tree234')
+        return True
+
+    def packedSubtree(self, keys, low, high, height):
+        '''Make a subtree of the given height holding keys[low:high].  The
+        keys are split among as few children as can hold them, with one
+        key between each pair of children.  The number of keys must be
+        at least 2 ** (height + 1) - 1 and at most 4 ** (height + 1) - 1.'''
+        if height == 0:
+            nodeKeys, children = keys[low:high], ()
+        else:
+            slots = high - low + 1         # Keys plus one, shared out evenly
+            capacity = Tree234.maxLinks ** height # Most slots in a child
+            nChild = max(2, -(-slots // capacity))
+            bounds = [low - 1 + slots * c // nChild for c in range(nChild + 1)]
+            children = tuple(
+                self.packedSubtree(keys, bounds[c] + 1, bounds[c + 1],
+                                   height - 1)
+                for c in range(nChild))
+            nodeKeys = [keys[bound] for bound in bounds[1:-1]]
+        node = Node234(drawnValue(nodeKeys), *children)
+        data = []
+        for key in nodeKeys:
+            data.append(drawnValue.palette[self.nextColor])
+            self.nextColor = (self.nextColor + 1) % len(drawnValue.palette)
+        node.culled = (self, {'data': data})
+        return node
+
     searchCode = '''
 def search(self, goal={goal}):
    node, p = self.__find(goal, self.__root, self, prepare=False)
@@ -1164,7 +1404,9 @@ def search(self, goal={goal}):
             self.visibleCanvas()))
         
     def restoreNodes(self, nodes=None):
-        if self.rootNode and (nodes is None or nodes[0] is self.rootNode):
+        if nodes is None:
+            self.restoreDrawnNodes()
+        elif self.rootNode and nodes[0] is self.rootNode:
             self.restoreNodePositions(self.rootNode, sleepTime=0, see=False)
         elif nodes:
             for node in nodes:
@@ -1179,6 +1421,22 @@ def search(self, goal={goal}):
                     node.children[j] = None
         self.updateTreeObjectRootPointer(root=self.rootNode, see=False)
         
+    def restoreDrawnNodes(self):
+        '''Place the root and the drawn nodes by their levels in the tree and
+        move their canvas items to match.  Culled nodes are placed relative
+        to the nodes above them when used.'''
+        if self.rootNode:
+            self.rootNode.center = (self.ROOT_X0, self.ROOT_Y0)
+        drawn = self.drawnTreeNodes()
+        for node in drawn:
+            node.center = self.placedCenter(node, drawn=False)
+        for node in drawn:
+            parent, childNum = self.parentAndChild(node)
+            for item, coords in zip(
+                    node.dValue.items, self.nodeItemCoords(
+                        node, parent=parent, childNum=childNum)):
+                self.canvas.coords(item, coords)
+
     def restoreNodePositions(
             self, subtreeRoot, parent=None, childNum=None, sleepTime=0.05,
             setChildCenters=True, nodeIndices=(), see=False):
@@ -1249,10 +1507,12 @@ def search(self, goal={goal}):
                 (self.ROOT_X0, self.ROOT_Y0) if node is self.rootNode else
                 self.childCoords(parent, childNum, level, scale=scale))
         excludeParentLink = 0 if parent or node is self.rootNode else 1
-        items = node.dValue.items[excludeParentLink:]
-        coords = self.nodeItemCoords(
-            node, parent=parent, childNum=childNum, scale=scale)[
-                excludeParentLink:]
+        items, coords = (), ()
+        if not node.culled:
+            items = node.dValue.items[excludeParentLink:]
+            coords = self.nodeItemCoords(
+                node, parent=parent, childNum=childNum, scale=scale)[
+                    excludeParentLink:]
         for ci in range(node.nChild):
             citems, ccoords = self.subtreeItemCoords(
                 node.children[ci], node, ci, level + 1, setChildCenters)
@@ -1670,6 +1930,7 @@ def traverse(self, traverseType={traverseType!r}):
                 newFontScale / abs(self.FONT_SIZE),
                 fixPoint=fixPoint, updateBounds=True)
             self.scale, self.fontScale = newScale, newFontScale
+            self.drawWhenIdle()
 
     def setupCanvasZoomHandlers(
             self, zoomBy=5/4, x0=0, y0=0, updateBounds=True):
@@ -0,0 +1,467 @@
+__doc__ = """
+Non-visual engines for the balanced search trees.  Each engine follows
+the insert, delete, and search code shown by its visualization, but
+works on plain Python objects without a canvas, so the algorithmic cost
+can be measured on trees with millions of keys.  The engines count key
+comparisons, node visits, rotations, color flips, and node splits.
+Color flips include the recoloring done while fixing a red-black tree
+after a delete.
+
+The red-black visualization leaves the rotations and recoloring needed
+after an insert or delete to the user.  RedBlackEngine performs the
+color flips on the way down during insertion exactly as the
+visualization does, and then applies the rotations and delete fixups
+automatically so that the tree stays balanced.  The 2-3-4 tree
+visualization has no delete operation, so neither does Tree234Engine.
+"""
+
+COUNTS = ('comparisons', 'visits', 'rotations', 'flips', 'splits')
+
+class TreeEngine(object):
+    '''Base class for tree engines holding the operation counters.'''
+    def __init__(self):
+        self.root = None
+        self.size = 0
+        self.resetCounts()
+
+    def resetCounts(self):
+        for name in COUNTS:
+            setattr(self, name, 0)
+
+    def counts(self):        # Dictionary of the counters by name
+        return dict((name, getattr(self, name)) for name in COUNTS)
+
+    def __len__(self):
+        return self.size
+
+class BinaryEngine(TreeEngine):
+    '''Common search and traversal for binary search tree engines.'''
+
+    def search(self, goal):  # Return data for goal key or None if not found
+        node = self.root
+        while node:
+            self.visits += 1
+            self.comparisons += 1
+            if goal == node.key:
+                return node.data
+            self.comparisons += 1
+            node = node.left if goal < node.key else node.right
+        return None
+
+    def traverse(self):      # Generate (key, data) pairs in order
+        stack, node = [], self.root
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                yield node.key, node.data
+                node = node.right
+
+    def height(self):        # Number of levels in the tree
+        height, stack = 0, [(self.root, 1)] if self.root else []
+        while stack:
+            node, level = stack.pop()
+            height = max(height, level)
+            for child in (node.left, node.right):
+                if child:
+                    stack.append((child, level + 1))
+        return height
+
+class AVLEngine(BinaryEngine):
+    '''AVL tree following the recursive insert and delete of AVLTree.'''
+
+    class Node(object):
+        __slots__ = ('key', 'data', 'left', 'right', 'height')
+        def __init__(self, key, data):
+            self.key = key
+            self.data = data
+            self.left = self.right = None
+            self.height = 1
+
+    @staticmethod
+    def updateHeight(node):
+        node.height = max(node.left.height if node.left else 0,
+                          node.right.height if node.right else 0) + 1
+
+    @staticmethod
+    def heightDiff(node):
+        return ((node.left.height if node.left else 0) -
+                (node.right.height if node.right else 0))
+
+    def rotateLeft(self, top):
+        self.rotations += 1
+        toRaise = top.right
+        top.right = toRaise.left
+        toRaise.left = top
+        self.updateHeight(top)
+        self.updateHeight(toRaise)
+        return toRaise
+
+    def rotateRight(self, top):
+        self.rotations += 1
+        toRaise = top.left
+        top.left = toRaise.right
+        toRaise.right = top
+        self.updateHeight(top)
+        self.updateHeight(toRaise)
+        return toRaise
+
+    def insert(self, key, data=None):
+        self.root, flag = self.__insert(self.root, key, data)
+        self.size += flag
+        return flag
+
+    def __insert(self, node, key, data):
+        if node is None:
+            return self.Node(key, data), True
+        self.visits += 1
+        self.comparisons += 1
+        if key == node.key:
+            node.data = data
+            return node, False
+        self.comparisons += 1
+        if key < node.key:
+            node.left, flag = self.__insert(node.left, key, data)
+            if self.heightDiff(node) > 1:
+                self.comparisons += 1
+                if node.left.key < key:
+                    node.left = self.rotateLeft(node.left)
+                node = self.rotateRight(node)
+        else:
+            node.right, flag = self.__insert(node.right, key, data)
+            if self.heightDiff(node) < -1:
+                self.comparisons += 1
+                if key < node.right.key:
+                    node.right = self.rotateRight(node.right)
+                node = self.rotateLeft(node)
+        self.updateHeight(node)
+        return node, flag
+
+    def delete(self, goal):
+        self.root, flag = self.__delete(self.root, goal)
+        self.size -= flag
+        return flag
+
+    def __delete(self, node, goal):
+        if node is None:
+            return None, False
+        self.visits += 1
+        self.comparisons += 1
+        if goal < node.key:
+            node.left, flag = self.__delete(node.left, goal)
+            node = self.__balanceLeft(node)
+        else:
+            self.comparisons += 1
+            if goal > node.key:
+                node.right, flag = self.__delete(node.right, goal)
+                node = self.__balanceRight(node)
+            elif node.left is None:
+                return node.right, True
+            elif node.right is None:
+                return node.left, True
+            else:
+                node.key, node.data, node.right = self.__deleteMin(node.right)
+                node = self.__balanceRight(node)
+                flag = True
+        self.updateHeight(node)
+        return node, flag
+
+    def __deleteMin(self, node):
+        self.visits += 1
+        if node.left is None:
+            return (node.key, node.data, node.right)
+        key, data, node.left = self.__deleteMin(node.left)
+        node = self.__balanceLeft(node)
+        self.updateHeight(node)
+        return (key, data, node)
+
+    def __balanceLeft(self, node):
+        if self.heightDiff(node) < -1:
+            if self.heightDiff(node.right) > 0:
+                node.right = self.rotateRight(node.right)
+            node = self.rotateLeft(node)
+        return node
+
+    def __balanceRight(self, node):
+        if self.heightDiff(node) > 1:
+            if self.heightDiff(node.left) < 0:
+                node.left = self.rotateLeft(node.left)
+            node = self.rotateRight(node)
+        return node
+
+class RedBlackEngine(BinaryEngine):
+    '''Red-black tree with top-down insertion as in RedBlackTree.  Nodes
+    are kept on a path list from the root so rotations can relink them
+    to their parents.'''
+
+    class Node(object):
+        __slots__ = ('key', 'data', 'left', 'right', 'red')
+        def __init__(self, key, data, red=True):
+            self.key = key
+            self.data = data
+            self.left = self.right = None
+            self.red = red
+
+    def rotateUp(self, child, parent, grandparent):
+        '''Rotate child above its parent and link it to the grandparent,
+        which is None when the parent is the root.'''
+        self.rotations += 1
+        if child is parent.left:
+            parent.left = child.right
+            child.right = parent
+        else:
+            parent.right = child.left
+            child.left = parent
+        if grandparent is None:
+            self.root = child
+        elif grandparent.left is parent:
+            grandparent.left = child
+        else:
+            grandparent.right = child
+
+    def fixRedRed(self, path):
+        '''Rotate to fix a red node at the end of the path with a red
+        parent.  The grandparent must be black.  The path is updated to end
+        at the node that took the red node's place in the descent.'''
+        node, parent, grandparent = path[-1], path[-2], path[-3]
+        above = path[-4] if len(path) > 3 else None
+        if (parent is grandparent.left) == (node is parent.left):
+            self.rotateUp(parent, grandparent, above)
+            parent.red, grandparent.red = False, True
+            path[-3:] = [parent, node]
+        else:
+            self.rotateUp(node, parent, grandparent)
+            self.rotateUp(node, grandparent, above)
+            node.red, grandparent.red = False, True
+            path[-3:] = [node]
+
+    def insert(self, key, data=None):
+        if self.root is None:
+            self.root = self.Node(key, data, red=False)
+            self.size += 1
+            return True
+        path = [self.root]
+        while True:
+            node = path[-1]
+            self.visits += 1
+            if (not node.red and node.left and node.left.red and
+                node.right and node.right.red):
+                self.flips += 1          # Swap colors with children on the
+                node.left.red = node.right.red = False  # way down, keeping
+                node.red = node is not self.root        # the root black
+                if len(path) > 2 and path[-2].red:
+                    self.fixRedRed(path)
+                    node = path[-1]
+            self.comparisons += 1
+            if key == node.key:
+                node.data = data
+                return False
+            self.comparisons += 1
+            child = node.left if key < node.key else node.right
+            if child is None:
+                break
+            path.append(child)
+        child = self.Node(key, data)
+        if key < node.key:
+            node.left = child
+        else:
+            node.right = child
+        path.append(child)
+        if node.red:
+            self.fixRedRed(path)
+        self.size += 1
+        return True
+
+    def delete(self, goal):
+        '''Delete a key by promoting its successor when it has two children
+        like RedBlackTree, then restore the black heights bottom-up.'''
+        path, node = [], self.root
+        while node:
+            self.visits += 1
+            self.comparisons += 1
+            if goal == node.key:
+                break
+            path.append(node)
+            self.comparisons += 1
+            node = node.left if goal < node.key else node.right
+        if node is None:
+            return False
+        if node.left and node.right:
+            path.append(node)
+            successor = node.right
+            while successor.left:
+                self.visits += 1
+                path.append(successor)
+                successor = successor.left
+            node.key, node.data = successor.key, successor.data
+            node = successor
+        child = node.left or node.right
+        parent = path[-1] if path else None
+        if parent is None:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        self.size -= 1
+        if node.red:
+            return True
+        if child and child.red:
+            child.red = False
+            self.flips += 1
+        elif parent:
+            self.fixDoubleBlack(path, parent.left is child)
+        return True
+
+    def fixDoubleBlack(self, path, left):
+        '''Restore the black height of the left or right subtree of the
+        last node in the path, which is one short of its sibling's.'''
+        while path:
+            parent = path[-1]
+            above = path[-2] if len(path) > 1 else None
+            sibling = parent.right if left else parent.left
+            if sibling.red:          # Make the sibling black by rotating
+                self.rotateUp(sibling, parent, above)
+                sibling.red, parent.red = False, True
+                self.flips += 1
+                path[-1:] = [sibling, parent]
+                above = sibling
+                sibling = parent.right if left else parent.left
+            near, far = ((sibling.left, sibling.right) if left else
+                         (sibling.right, sibling.left))
+            if not (near and near.red) and not (far and far.red):
+                sibling.red = True   # Remove a black from both subtrees and
+                self.flips += 1      # move the shortage up to the parent
+                if parent.red:
+                    parent.red = False
+                    return
+                path.pop()
+                if path:
+                    left = path[-1].left is parent
+                continue
+            if not (far and far.red):
+                self.rotateUp(near, sibling, parent)
+                near.red, sibling.red = False, True
+                self.flips += 1
+                sibling, far = near, sibling
+            self.rotateUp(sibling, parent, above)
+            sibling.red, parent.red, far.red = parent.red, False, False
+            self.flips += 1
+            return
+
+class Tree234Engine(TreeEngine):
+    '''2-3-4 tree with the top-down splitting insert of Tree234.'''
+    maxKeys = 3
+
+    class Node(object):
+        __slots__ = ('keys', 'data', 'children')
+        def __init__(self, key, data, *children):
+            self.keys = [key]
+            self.data = [data]
+            self.children = list(children)
+
+        def isLeaf(self):
+            return not self.children
+
+    def __find(self, goal, prepare=False):
+        current, parent = self.root, self
+        while current:
+            self.visits += 1
+            keys, i = current.keys, 0
+            while i < len(keys):
+                self.comparisons += 1
+                if not keys[i] < goal:
+                    break
+                i += 1
+            if i < len(keys):
+                self.comparisons += 1
+                if goal == keys[i]:
+                    return current, parent
+            if prepare and len(keys) == self.maxKeys:
+                current, parent = self.__splitNode(current, parent, goal)
+                self.comparisons += 1
+                i = 0 if goal < current.keys[0] else 1
+            if current.isLeaf():
+                return (prepare and current, parent)
+            current, parent = current.children[i], current
+        return current, parent
+
+    def __splitNode(self, toSplit, parent, goal):
+        self.splits += 1
+        newNode = self.Node(toSplit.keys[2], toSplit.data[2],
+                            *toSplit.children[2:])
+        key, data = toSplit.keys[1], toSplit.data[1]
+        del toSplit.keys[1:], toSplit.data[1:], toSplit.children[2:]
+        if parent is self:
+            self.root = parent = self.Node(key, data, toSplit, newNode)
+        else:
+            self.insertKeyValue(parent, key, data, newNode)
+        self.comparisons += 1
+        return (toSplit if goal < key else newNode, parent)
+
+    def insertKeyValue(self, node, key, data, subtree=None):
+        '''Insert a key and data into a node that is not full, along with
+        the subtree to the right of the key, or update the data of an
+        existing key.'''
+        keys, i = node.keys, 0
+        while i < len(keys):
+            self.comparisons += 1
+            if not keys[i] < key:
+                break
+            i += 1
+        if i < len(keys):
+            self.comparisons += 1
+            if keys[i] == key:
+                node.data[i] = data
+                return False
+        if len(keys) == self.maxKeys:
+            raise Exception('Cannot insert key into full 2-3-4 node')
+        keys.insert(i, key)
+        node.data.insert(i, data)
+        if subtree:
+            node.children.insert(i + 1, subtree)
+        return True
+
+    def insert(self, key, data=None):
+        node, p = self.__find(key, prepare=True)
+        if node is None:
+            if p is self:
+                self.root = self.Node(key, data)
+                self.size += 1
+                return True
+            raise Exception('__find did not find 2-3-4 node for insertion')
+        inserted = self.insertKeyValue(node, key, data)
+        self.size += inserted
+        return inserted
+
+    def search(self, goal):  # Return data for goal key or None if not found
+        node, p = self.__find(goal)
+        if node:
+            return node.data[node.keys.index(goal)]
+        return None
+
+    def traverse(self):      # Generate (key, data) pairs in order
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            if isinstance(node, tuple):
+                yield node
+                continue
+            for i in range(len(node.keys) - 1, -1, -1):
+                if node.children:
+                    stack.append(node.children[i + 1])
+                stack.append((node.keys[i], node.data[i]))
+            if node.children:
+                stack.append(node.children[0])
+
+    def height(self):        # Number of levels in the tree
+        height, node = 0, self.root
+        while node:
+            height += 1
+            node = node.children[0] if node.children else None
+        return height
+
+ENGINES = {'AVLEngine': AVLEngine, 'RedBlackEngine': RedBlackEngine,
+           'Tree234Engine': Tree234Engine}
@@ -0,0 +1,192 @@
+__doc__ = """
+Tidy layout of binary trees in the style of Reingold and Tilford.
+Each subtree is laid out independently and then its left and right
+subtrees are pushed together until their facing contours are one node
+separation apart, with the parent centered above its children.  The
+children are also kept far enough apart that every node of the left
+subtree is left of the parent and every node of the right subtree is
+right of it, so the keys of a binary search tree read in order from
+left to right.  The
+contours are linked lists that are shared between a subtree and its
+ancestors, so a full layout takes time linear in the number of nodes.
+The layout of each subtree is cached on its root node and discarded
+when the tree is changed at or below that node, so after an insert,
+delete, or rotation only the subtrees along the path to the root are
+laid out again.
+"""
+
+class TidyTreeLayout(object):
+    '''Compute compact positions for the nodes of a binary tree app.  The
+    app must provide a NodeArray in its nodes attribute along with the
+    geometry attributes of BinaryTreeBase.  Horizontal positions are
+    measured in units of node separation relative to the root and scaled
+    down when the tree is wider than the app's TREE_WIDTH.  Vertical
+    positions depend only on the node level as in the heap index layout.
+    '''
+    def __init__(self, app, separation=2.5):
+        self.app = app
+        self.separation = separation # Minimum distance between node
+        self.nodes = None            # centers in node radii
+        self.generation = 0  # Layouts cached on nodes from other generations
+        self.dirty = True    # are ignored
+        self.bounds = (0, 0) # Leftmost and rightmost offsets in tree
+
+    def invalidate(self, nodes, parent, *written):
+        '''Discard cached layouts after a change to the links of some nodes
+        in a NodeArray.  The changed nodes, the parent above them, and all
+        of its ancestors are affected.'''
+        for node in written:
+            if node:
+                node.layout = None
+        while parent:
+            parent.layout = None
+            parent = parent.parent
+        self.dirty = True
+
+    def update(self):        # Lay out any subtrees that changed
+        nodes = self.app.nodes
+        if nodes is not self.nodes: # Start a new generation for each new
+            self.nodes = nodes      # node array so old layouts are ignored
+            nodes.layout = self
+            self.generation += 1
+            self.dirty = True
+        if not self.dirty:
+            return
+        low = high = 0
+        if nodes[0]:
+            contour, shift = self.layOut(nodes[0])[5], 0
+            while contour:
+                low = min(low, contour[0] + shift)
+                high = max(high, contour[1] + shift)
+                contour, shift = contour[2], shift + contour[3]
+        self.bounds = (low, high)
+        self.dirty = False
+
+    def layOut(self, node):
+        '''Get the layout of the subtree rooted at a node, computing it if
+        needed.  The layout is a tuple of the generation, left child, right
+        child, offsets of the left and right children, the subtree
+        contour, and the (low, high) extent of the subtree.  A contour is
+        a linked list of (low, high, next, shift) tuples, one for each
+        level of the subtree, giving the leftmost and rightmost offsets at
+        that level.  The shift is added to all the offsets in the rest of
+        the list.'''
+        leftChild, rightChild = node.left, node.right
+        layout = node.layout
+        if (layout and layout[0] == self.generation and
+            layout[1] is leftChild and layout[2] is rightChild):
+            return layout
+        leftLayout = self.layOut(leftChild) if leftChild else None
+        rightLayout = self.layOut(rightChild) if rightChild else None
+        left = leftLayout[5] if leftLayout else None
+        right = rightLayout[5] if rightLayout else None
+        gap, low, high = 1, 0, 0
+        if left and right:
+            gap = self.separationNeeded(left, right)
+        if leftLayout:       # Keep the left subtree left of the parent and
+            gap = max(gap, 2 * leftLayout[6][1] + 1) # the right subtree
+        if rightLayout:      # right of it, at least half a unit away
+            gap = max(gap, 1 - 2 * rightLayout[6][0])
+        leftOffset, rightOffset = -gap / 2, gap / 2
+        if leftLayout:
+            low = leftOffset + leftLayout[6][0]
+        if rightLayout:
+            high = rightOffset + rightLayout[6][1]
+        node.layout = (self.generation, leftChild, rightChild,
+                       leftOffset, rightOffset,
+                       (0, 0) + self.mergeContours(
+                           left, leftOffset, right, rightOffset),
+                       (low, high))
+        return node.layout
+
+    def separationNeeded(self, left, right):
+        '''Find the distance between the roots of two subtrees that keeps
+        the facing contours at least one unit apart on every level.'''
+        gap, leftShift, rightShift = 1, 0, 0
+        while left and right:
+            gap = max(gap, left[1] + leftShift - right[0] - rightShift + 1)
+            leftShift += left[3]
+            rightShift += right[3]
+            left, right = left[2], right[2]
+        return gap
+
+    def mergeContours(self, left, leftShift, right, rightShift):
+        '''Combine the contours of two subtrees placed at the given offsets
+        from their parent.  New tuples are made for the levels both
+        subtrees share and the deeper subtree's contour is linked below
+        them.  Returns the next and shift fields for the parent's tuple.'''
+        shared = []
+        while left and right:
+            shared.append((left[0] + leftShift, right[1] + rightShift))
+            leftShift += left[3]
+            rightShift += right[3]
+            left, right = left[2], right[2]
+        rest, shift = (left, leftShift) if left else (right, rightShift)
+        for low, high in reversed(shared):
+            rest, shift = (low, high, rest, shift), 0
+        return rest, shift
+
+    def scale(self):         # Pixels per unit of offset and the x
+        app = self.app       # coordinate of the root
+        unit = self.separation * app.CIRCLE_SIZE
+        low, high = self.bounds
+        if (high - low) * unit > app.TREE_WIDTH:
+            unit = app.TREE_WIDTH / (high - low)
+        x0, x1 = (app.ROOT_X0 - app.TREE_WIDTH / 2,
+                  app.ROOT_X0 + app.TREE_WIDTH / 2)
+        rootX = app.ROOT_X0
+        if rootX + low * unit < x0:
+            rootX = x0 - low * unit
+        elif rootX + high * unit > x1:
+            rootX = x1 - high * unit
+        return unit, rootX
+
+    def offset(self, index):
+        '''Horizontal offset in units of the node at an index from the root,
+        or None if one of its ancestors is missing.  An empty index below
+        an existing node is placed half a unit to that side of it.'''
+        self.update()
+        path = []
+        while index > 0:
+            path.append(index)
+            index = (index - 1) // 2
+        node, offset = self.nodes[0], 0
+        for index in reversed(path):
+            if node is None:
+                return None
+            layout = self.layOut(node)
+            if index % 2 == 1:
+                offset, node = offset + layout[3], layout[1]
+            else:
+                offset, node = offset + layout[4], layout[2]
+        return offset if path or node else None
+
+    def center(self, index): # Canvas coordinates of the node at an index
+        offset = self.offset(index)
+        if offset is None:
+            return None
+        unit, rootX = self.scale()
+        app = self.app
+        return (rootX + offset * unit,
+                app.ROOT_Y0 + ((index + 1).bit_length() - 1) * app.LEVEL_GAP)
+
+    def centers(self):
+        '''Generate (index, node, center) for every node in the tree from
+        the root downward in time linear in the number of nodes.'''
+        self.update()
+        root = self.nodes[0]
+        if root is None:
+            return
+        app = self.app
+        unit, rootX = self.scale()
+        stack = [(0, root, 0)]
+        while stack:
+            index, node, offset = stack.pop()
+            yield index, node, (
+                rootX + offset * unit,
+                app.ROOT_Y0 + ((index + 1).bit_length() - 1) * app.LEVEL_GAP)
+            layout = self.layOut(node)
+            if layout[2]:
+                stack.append((2 * index + 2, layout[2], offset + layout[4]))
+            if layout[1]:
+                stack.append((2 * index + 1, layout[1], offset + layout[3]))
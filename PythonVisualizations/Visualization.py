@@ -12,9 +12,15 @@ from enum import Enum
 try:
     from coordinates import *
     from tkUtilities import *
+    from AnimationScheduler import *
+    from AnimationTimeline import *
+    from HeadlessScrim import *
 except ModuleNotFoundError:
     from .coordinates import *
     from .tkUtilities import *
+    from .AnimationScheduler import *
+    from .AnimationTimeline import *
+    from .HeadlessScrim import *
     
 # Utilities for vector math; used for canvas item coordinates
 V = vector
@@ -42,6 +48,8 @@ class Visualization(object):  # Base class for Python visualizations
     SMALL_FONT = ('Helvetica', -9)
     DEFAULT_CANVAS_WIDTH = 800
     DEFAULT_CANVAS_HEIGHT = 400
+    HEADLESS = False      # Default for running without a display
+    INSTANT = False       # Default for skipping intermediate animation
 
     def __init__(  # Constructor
             self,
@@ -49,39 +57,45 @@ class Visualization(object):  # Base class for Python visualizations
             title=None,
             canvasWidth=None,  # Canvas portal size
             canvasHeight=None,
-            canvasBounds=None): # Canvas extent (behind portal)
+            canvasBounds=None, # Canvas extent (behind portal)
+            headless=None):   # Run without display (default is HEADLESS)
         self.title = title
+        self.headless = self.HEADLESS if headless is None else headless
+        self.instant = self.INSTANT # Jump to final states without animation
+        if self.headless:
+            useApproximateFonts()
         # Set up Tk windows for canvas and operational controls
         if window:
             self.window = window
         else:
-            self.window = Tk()
+            self.window = HeadlessWindow() if self.headless else Tk()
             if title:
                 self.window.title(title)
         self.destroyed = False
         self.window.bind('<Destroy>', self.setDestroyFlag)
+        self.scheduler = AnimationScheduler(self.window)
 
         if canvasWidth is None: canvasWidth = self.DEFAULT_CANVAS_WIDTH
         if canvasHeight is None: canvasHeight = self.DEFAULT_CANVAS_HEIGHT
         self.targetCanvasWidth = canvasWidth
         self.targetCanvasHeight = canvasHeight
-        self.canvasFrame = Frame(self.window)
+        self.canvasFrame = self.widgetClass(Frame)(self.window)
         self.canvasFrame.pack(side=TOP, expand=True, fill=BOTH)
-        if canvasBounds:
+        if canvasBounds and not self.headless:
             self.canvasVScroll = Scrollbar(self.canvasFrame, orient=VERTICAL)
             self.canvasVScroll.pack(side=RIGHT, expand=False, fill=Y)
             if canvasWidth == 800:  # Shrink canvas width to show scrollbar
                 self.targetCanvasWidth, canvasWidth = 785, 785
         else:
             self.canvasVScroll = None
-        self.canvas = Scrim(
+        self.canvas = (HeadlessScrim if self.headless else Scrim)(
             self.canvasFrame, width=canvasWidth, height=canvasHeight,
             bg=self.DEFAULT_BG)
         self.canvas.pack(side=TOP, expand=True, fill=BOTH)
         self.__createCanvasText = self.canvas.create_text
         self.canvas.create_text = self.createCanvasText
         self.setCanvasBounds(canvasBounds)
-        if canvasBounds:
+        if canvasBounds and not self.headless:
             self.canvasHScroll = Scrollbar(self.canvasFrame, orient=HORIZONTAL)
             self.canvasHScroll.pack(side=TOP, expand=False, fill=X)
             self.canvasVScroll['command'] = self.canvas.yview
@@ -94,9 +108,14 @@ class Visualization(object):  # Base class for Python visualizations
         # Set up animation state variable
         self.animationState = Animation.STOPPED
 
+    def widgetClass(self, tkClass): # Get the class to use for a Tk widget,
+        return (headlessWidgetClass(tkClass) # replacing it with a stand in
+                if self.headless else tkClass) # when running headless
+
     def setDestroyFlag(self, event=None): # Capture destruction of top window
         if event and event.widget == self.window:
             self.destroyed = True
+            self.scheduler.interrupt()
 
     def expandCanvasFor(self, *itemOrBBox):
         '''Expand canvas scroll region if needed to view given canvas items
@@ -267,21 +286,72 @@ class Visualization(object):  # Base class for Python visualizations
     # methods my change the number of steps) This enables combining
     # animation sequences by using the *Sequence generator to go
     # through the steps and performing other animation actions for
-    # each step.  Each moveItems____ method calls self.wait(0) at the
-    # beginning to wait if step mode has been engaged
+    # each step.  Each moveItems____ method runs its sequence through
+    # runSequence, which calls self.wait(0) at the beginning to wait if
+    # step mode has been engaged, and then has the animation scheduler
+    # advance the sequence one step per frame.
+    #
+    # Operations written as generators yield the base time to wait
+    # before their next step instead of calling wait().  They animate
+    # moves with yield from self.sequenceSteps(self.moveItems____Sequence(
+    # ...), sleepTime), and are run by runSteps or, for operation
+    # buttons, step by step from the event loop.
     #
     # Most moveItems method take optional see and expand keyword
     # parameters that control scrolling the canvas to see the moved items
     # and expanding the canvas bounds to accommodate the new positions
 
+    def runSequence(         # Run an animation sequence with one step per
+            self, sequence,  # frame on the animation scheduler
+            sleepTime=0.1):  # Base time between steps
+        self.wait(0)
+        if self.canvas.recorder:
+            sequence = self.recordedSequence(sequence)
+        frameTime = self.frameTime(sleepTime)
+        if frameTime <= 0:   # Without any delay, run all steps immediately
+            for step in sequence:
+                self.wait(0)
+        else:
+            self.scheduler.run(
+                sequence, lambda: self.frameTime(sleepTime),
+                hold=self.animationsPaused,
+                abort=lambda: self.destroyed or self.animationsStopped())
+        self.wait(0)
+
+    def sequenceSteps(       # Make an animation sequence into steps of an
+            self, sequence,  # operation generator that yield the base time
+            sleepTime=0.1):  # between steps
+        for step in sequence:
+            yield sleepTime
+
+    def runSteps(self, steps): # Run the steps of an operation generator,
+        for sleepTime in steps:  # waiting the time each one yields before
+            self.wait(sleepTime or 0) # running the next
+
+    def recordedSequence(self, sequence): # Record a timeline frame after
+        for step in sequence:               # each step of a sequence
+            self.recordFrame()
+            yield step
+        self.recordFrame()
+
+    def frameTime(self, sleepTime): # Time for each frame of an animation
+        return 0 if self.headless or self.instant else sleepTime
+
+    def animationSteps(self, steps): # Number of steps to use in an animation
+        return 1 if self.instant else max(1, steps) # Must use at least 1
+
+    def textItems(self, items): # Get the set of text items among items
+        return set(item for item in items
+                   if item is not None and self.canvas.type(item) == 'text')
+
     def moveItemsOffCanvas(  # Animate the removal of canvas items by sliding
             self, items,     # them off one of the canvas edges
             edge=N,          # One of the 4 tkinter edges: N, E, S, or W
             steps=10,        # Number of intermediate steps along line
             sleepTime=0.1):  # Base time between steps (adjusted by user)
-        self.wait(0)
-        for step, _ in self.moveItemsOffCanvasSequence(items, edge, steps):
-            self.wait(sleepTime)
+        self.runSequence(
+            self.moveItemsOffCanvasSequence(items, edge, steps),
+            sleepTime)
 
     def moveItemsOffCanvasSequence(  # Iterator for moveItemsOffCanvas
             self, items, edge=N, steps=10):
@@ -324,11 +394,11 @@ class Visualization(object):  # Base class for Python visualizations
             endFont=None,    # given
             see=(),          # Scroll to view moved items plus any items in see
             expand=True):    # Expand canvas bounds before scrolling if needed
-        self.wait(0)
-        for step, _ in self.moveItemsBySequence(
+        self.runSequence(
+            self.moveItemsBySequence(
                 items, delta, steps, startFont=startFont, endFont=endFont,
-                see=see, expand=expand):
-            self.wait(sleepTime)
+                see=see, expand=expand),
+            sleepTime)
 
     def moveItemsBySequence( # Iterator for moveItemsBy
             self, items, delta, steps=10, startFont=None, endFont=None,
@@ -340,20 +410,23 @@ class Visualization(object):  # Base class for Python visualizations
             raise ValueError('Delta must be a 2-dimensional vector')
         if items and V(delta).len2() >= 0.001: # If some items and delta
 
-            steps = max(1, steps) # Must use at least 1 step
+            steps = self.animationSteps(steps)
             changeFont = startFont and endFont and startFont != endFont
 
+            textItems = self.textItems(items) if changeFont else ()
+
             # move the items in steps along vector
             moveBy = V(delta) / steps
             for step in range(steps):
                 font = changeFont and (endFont[0], 
                                        (startFont[1] * (steps - (step + 1)) +
                                         endFont[1] * (step + 1)) // steps)
-                for item in items:
-                    if item is not None:
-                        self.canvas.move(item, *moveBy)
-                        if changeFont and self.canvas.type(item) == 'text':
-                            self.canvas.itemconfigure(item, font=font)
+                with self.canvas.batch():
+                    for item in items:
+                        if item is not None:
+                            self.canvas.move(item, *moveBy)
+                            if item in textItems:
+                                self.canvas.itemconfigure(item, font=font)
                 if see:
                     self.scrollToSee(
                         tuple(items) + 
@@ -363,10 +436,9 @@ class Visualization(object):  # Base class for Python visualizations
                 yield (step, steps) # Yield step in sequence
                 
             # Force end font if provided
-            if changeFont:
-                for item in items:
-                    if self.canvas.type(item) == 'text':
-                        self.canvas.itemconfigure(item, font=endFont)
+            with self.canvas.batch():
+                for item in textItems:
+                    self.canvas.itemconfigure(item, font=endFont)
                 
     def moveItemsTo(         # Animate canvas items moving rigidly 
             self, items,     # to destination locations along line(s)
@@ -377,11 +449,11 @@ class Visualization(object):  # Base class for Python visualizations
             endFont=None,    # end font, if provided
             see=(),          # Scroll to view moved items plus any items in see
             expand=True):    # Expand canvas bounds before scrolling if needed
-        self.wait(0)
-        for step, _ in self.moveItemsToSequence(
-                items, toPositions, steps, startFont=startFont, endFont=endFont,
-                see=see, expand=expand):
-            self.wait(sleepTime)
+        self.runSequence(
+            self.moveItemsToSequence(
+                items, toPositions, steps, startFont=startFont,
+                endFont=endFont, see=see, expand=expand),
+            sleepTime)
 
     def moveItemsToSequence( # Iterator for moveItemsTo
             self, items,     # to destination locations along line(s)
@@ -393,12 +465,13 @@ class Visualization(object):  # Base class for Python visualizations
             expand=True):    # Expand canvas bounds before scrolling if needed
         items, toPositions = self.reconcileItemPositions(items, toPositions)
         if items and toPositions:
-            steps = max(1, steps) # Must use at least 1 step
+            steps = self.animationSteps(steps)
             moveBy = [V(V(toPos) - V(fromPos)) / steps
                       for toPos, fromPos in zip(
                               toPositions,
                               [self.canvas.coords(item)[:2] for item in items])]
             changeFont = startFont and endFont and startFont != endFont
+            textItems = self.textItems(items) if changeFont else ()
 
             # move the items until they reach the toPositions
             moved = []
@@ -407,13 +480,14 @@ class Visualization(object):  # Base class for Python visualizations
                                        (startFont[1] * (steps - (step + 1)) +
                                         endFont[1] * (step + 1)) // steps)
                 moved = []
-                for i, item in enumerate(items):
-                    if len(moveBy[i]) == 2:  # Unneeded test?
-                        self.canvas.move(item, *moveBy[i])
-                        if changeFont and self.canvas.type(item) == 'text':
-                            self.canvas.itemconfigure(item, font=font)
-                        if see and V(moveBy[i]).len2() >= 1:
-                            moved.append(item)
+                with self.canvas.batch():
+                    for i, item in enumerate(items):
+                        if len(moveBy[i]) == 2:  # Unneeded test?
+                            self.canvas.move(item, *moveBy[i])
+                            if item in textItems:
+                                self.canvas.itemconfigure(item, font=font)
+                            if see and V(moveBy[i]).len2() >= 1:
+                                moved.append(item)
                 if see and moved:
                     self.scrollToSee(
                         moved + 
@@ -423,10 +497,11 @@ class Visualization(object):  # Base class for Python visualizations
                 yield (step, steps) # Yield step in sequence
             
             # Force position of new objects to their exact destinations
-            for pos, item in zip(toPositions, items):
-                self.canvas.coords(item, *pos)
-                if changeFont and self.canvas.type(item) == 'text':
-                    self.canvas.itemconfigure(item, font=endFont)
+            with self.canvas.batch():
+                for pos, item in zip(toPositions, items):
+                    self.canvas.coords(item, *pos)
+                    if item in textItems:
+                        self.canvas.itemconfigure(item, font=endFont)
             if see and moved:
                 self.scrollToSee(
                     moved + 
@@ -448,11 +523,11 @@ class Visualization(object):  # Base class for Python visualizations
             endFont=None,    # given
             see=(),          # Scroll to view moved items plus any items in see
             expand=True):    # Expand canvas bounds before scrolling if needed
-        self.wait(0)
-        for step, _ in self.moveItemsLinearlySequence(
-                items, toPositions, steps, startFont=startFont, endFont=endFont,
-                see=see, expand=expand):
-            self.wait(sleepTime)
+        self.runSequence(
+            self.moveItemsLinearlySequence(
+                items, toPositions, steps, startFont=startFont,
+                endFont=endFont, see=see, expand=expand),
+            sleepTime)
 
     def moveItemsLinearlySequence( # Iterator for moveItemsLinearly
             self, items, toPositions, steps=10, startFont=None, endFont=None,
@@ -460,28 +535,30 @@ class Visualization(object):  # Base class for Python visualizations
             expand=True):    # Expand canvas bounds before scrolling if needed
         items, toPositions = self.reconcileItemPositions(items, toPositions)
         if items and toPositions:
-            steps = max(1, steps) # Must use at least 1 step
+            steps = self.animationSteps(steps)
+            current = [self.canvas.coords(item) for item in items]
             moveBy = [V(V(toPos) - V(fromPos)) / steps
-                      for toPos, fromPos in zip(
-                              toPositions,
-                              [self.canvas.coords(item) for item in items])]
+                      for toPos, fromPos in zip(toPositions, current)]
             changeFont = startFont and endFont and startFont != endFont
+            textItems = self.textItems(items) if changeFont else ()
 
-            # move the items until they reach the toPositions
+            # move the items until they reach the toPositions, tracking
+            # their current coordinates rather than reading them each step
             moved = []
             for step in range(steps):
                 font = changeFont and (endFont[0], 
                                        (startFont[1] * (steps - (step + 1)) +
                                         endFont[1] * (step + 1)) // steps)
                 moved = []
-                for i, item in enumerate(items):
-                    if len(moveBy[i]) >= 2:
-                        self.canvas.coords(
-                            item, V(self.canvas.coords(item)) + V(moveBy[i]))
-                        if changeFont and self.canvas.type(item) == 'text':
-                            self.canvas.itemconfigure(item, font=font)
-                        if see and V(moveBy[i]).len2() >= 1:
-                            moved.append(item)
+                with self.canvas.batch():
+                    for i, item in enumerate(items):
+                        if len(moveBy[i]) >= 2:
+                            current[i] = V(current[i]) + V(moveBy[i])
+                            self.canvas.coords(item, current[i])
+                            if item in textItems:
+                                self.canvas.itemconfigure(item, font=font)
+                            if see and V(moveBy[i]).len2() >= 1:
+                                moved.append(item)
                 if see and moved:
                     self.scrollToSee(
                         moved + 
@@ -491,10 +568,11 @@ class Visualization(object):  # Base class for Python visualizations
                 yield (step, steps) # Yield step in sequence
             
             # Force position of new objects to their exact destinations
-            for pos, item in zip(toPositions, items):
-                self.canvas.coords(item, *pos)
-                if changeFont and self.canvas.type(item) == 'text':
-                    self.canvas.itemconfigure(item, font=endFont)
+            with self.canvas.batch():
+                for pos, item in zip(toPositions, items):
+                    self.canvas.coords(item, *pos)
+                    if item in textItems:
+                        self.canvas.itemconfigure(item, font=endFont)
             if see and moved:
                 self.scrollToSee(
                     moved + 
@@ -511,11 +589,11 @@ class Visualization(object):  # Base class for Python visualizations
             endFont=None,    # given
             see=(),          # Scroll to view moved items plus any items in see
             expand=True):    # Expand canvas bounds before scrolling if needed
-        self.wait(0)
-        for step, _ in self.moveItemsOnCurveSequence(
+        self.runSequence(
+            self.moveItemsOnCurveSequence(
                 items, toPositions, startAngle, steps, startFont=startFont,
-                endFont=endFont, see=see, expand=expand):
-            self.wait(sleepTime)
+                endFont=endFont, see=see, expand=expand),
+            sleepTime)
             
     def moveItemsOnCurveSequence( # Iterator for moveItemsOnCurve
             self, items, toPositions, startAngle=90, steps=10, startFont=None,
@@ -524,10 +602,13 @@ class Visualization(object):  # Base class for Python visualizations
             expand=True):    # Expand canvas bounds before scrolling if needed
         items, toPositions = self.reconcileItemPositions(items, toPositions)
         if items and toPositions:
-            steps = max(1, steps) # Must use at least 1 step
+            steps = self.animationSteps(steps)
             changeFont = startFont and endFont and startFont != endFont
+            textItems = self.textItems(items) if changeFont else ()
+            current = [self.canvas.coords(item)[:2] for item in items]
 
-            # move the items until they reach the toPositions
+            # move the items until they reach the toPositions, tracking
+            # their current position rather than reading it each step
             moved = []
             for step in range(steps):  # Go through all steps of the annimation
                 toGo = steps - 1 - step  # remaining steps to go
@@ -537,16 +618,18 @@ class Visualization(object):  # Base class for Python visualizations
                 ang = startAngle * toGo / steps  # angle decreases on each step
                 scale = 1 + abs(ang) / 180  # scale is larger for higher angles
                 moved = []
-                for i, item in enumerate(items):
-                    coords = self.canvas.coords(item)[:2]
-                    if len(coords) == 2:
-                        moveBy = V(V(V(toPositions[i]) - V(coords)) /
-                                   ((toGo + 1) / scale)).rotate(ang)
-                        self.canvas.move(item, *moveBy)
-                        if changeFont and self.canvas.type(item) == 'text':
-                            self.canvas.itemconfigure(item, font=font)
-                        if see and V(moveBy).len2() >= 1:
-                            moved.append(item)
+                with self.canvas.batch():
+                    for i, item in enumerate(items):
+                        coords = current[i]
+                        if len(coords) == 2:
+                            moveBy = V(V(V(toPositions[i]) - V(coords)) /
+                                       ((toGo + 1) / scale)).rotate(ang)
+                            current[i] = V(coords) + V(moveBy)
+                            self.canvas.move(item, *moveBy)
+                            if item in textItems:
+                                self.canvas.itemconfigure(item, font=font)
+                            if see and V(moveBy).len2() >= 1:
+                                moved.append(item)
                 if see and moved:
                     self.scrollToSee(
                         moved + 
@@ -556,10 +639,11 @@ class Visualization(object):  # Base class for Python visualizations
                 yield (step, steps) # Yield step in sequence
             
             # Force position of new objects to their exact destinations
-            for pos, item in zip(toPositions, items):
-                self.canvas.coords(item, *pos)
-                if changeFont and self.canvas.type(item) == 'text':
-                    self.canvas.itemconfigure(item, font=endFont)
+            with self.canvas.batch():
+                for pos, item in zip(toPositions, items):
+                    self.canvas.coords(item, *pos)
+                    if item in textItems:
+                        self.canvas.itemconfigure(item, font=endFont)
             if see and moved:
                 self.scrollToSee(
                     moved + 
@@ -616,7 +700,7 @@ class Visualization(object):  # Base class for Python visualizations
         yPos = self.canvasVScroll.get()
         if distance2(xPos + yPos, newX + newY) < .0001:
             return
-        if sleepTime > 0:
+        if sleepTime > 0 and not self.instant:
             for step in range(1, steps + 1):
                 self.canvas.xview_moveto(
                     (xPos[0] * (steps - step) + newX[0] * step) / steps)
@@ -726,11 +810,11 @@ class Visualization(object):  # Base class for Python visualizations
     # ANIMATION CONTROLS
 
     def wait(self, sleepTime): # Sleep for a period of time and handle user stop
-        if sleepTime > 0:
-            self.window.update()
-            if self.destroyed:
-                sys.exit()
-            time.sleep(sleepTime)
+        if self.instant:       # Nothing to show in instant mode
+            return
+        self.recordFrame()
+        if sleepTime > 0 and not self.headless:
+            self.scheduler.sleep(self.frameTime(sleepTime))
         if self.destroyed:
             sys.exit()
         if self.animationState == Animation.STOPPED: # If user requested to stop
@@ -759,7 +843,40 @@ class Visualization(object):  # Base class for Python visualizations
 
     def animationsStepping(self):
         return self.animationState == Animation.STEP
+
+    @property
+    def animationState(self):
+        return self._animationState
+
+    @animationState.setter
+    def animationState(self, state): # Changes in state wake any waits for
+        self._animationState = state # them
+        self.scheduler.notify()
     
+    # TIMELINE RECORDING
+    # Recording attaches a TimelineRecorder to the canvas.  Each wait and
+    # each step of an animation sequence captures a frame of the changes
+    # made to the canvas items and the code highlights.
+
+    def startRecording(self, keyframeInterval=None):
+        self.canvas.recorder = TimelineRecorder(self.canvas, keyframeInterval)
+        self.recordFrame()
+
+    def recordFrame(self):   # Capture changes since last frame, if recording
+        if self.canvas.recorder:
+            self.canvas.recorder.captureFrame(self.codeState())
+
+    def stopRecording(self): # Stop recording and return the timeline, if any
+        recorder = self.canvas.recorder
+        if recorder is None:
+            return None
+        self.recordFrame()
+        self.canvas.recorder = None
+        return recorder.timeline
+
+    def codeState(self):     # Get code text and highlighted ranges
+        return ('', ())
+
     def runVisualization(self):
         self.window.mainloop()
 
@@ -803,6 +920,39 @@ if __name__ == '__main__':
     app = Visualization(title='Visualization test',
                         canvasBounds=(0, 0, 1000, 500) if grid else None)
 
+    def benchmarkMoves(counts=(10, 100, 1000), steps=20):
+        'Measure per-frame cost of moving many items with and without batching'
+        print('{:>5s}  {:>26s}  {:>9s}  {:>8s}'.format(
+            'Items', 'Sequence', 'Unbatched', 'Batched'))
+        for count in counts:
+            for name in ('moveItemsBySequence', 'moveItemsLinearlySequence'):
+                frameTimes = []
+                for batching in (False, True):
+                    Scrim.batching = batching
+                    items = [app.canvas.create_rectangle(
+                        (i * 7) % 700, (i * 13) % 300,
+                        (i * 7) % 700 + 10, (i * 13) % 300 + 10, fill='blue')
+                             for i in range(count)]
+                    target = [V(app.canvas.coords(item)) + V(50, 50, 50, 50)
+                              for item in items]
+                    sequence = (
+                        app.moveItemsBySequence(items, (50, 50), steps)
+                        if name == 'moveItemsBySequence' else
+                        app.moveItemsLinearlySequence(items, target, steps))
+                    app.window.update()
+                    start = time.perf_counter()
+                    for step, _ in sequence:
+                        app.window.update_idletasks()
+                    frameTimes.append(
+                        (time.perf_counter() - start) * 1000 / steps)
+                    app.canvas.delete(*items)
+                print('{:5d}  {:>26s}  {:7.2f}ms  {:6.2f}ms'.format(
+                    count, name, *frameTimes))
+        Scrim.batching = True
+
+    if '-benchmark' in options:
+        benchmarkMoves()
+
     centerText = app.canvas.create_text(
         app.targetCanvasWidth // 2, app.targetCanvasHeight // 2,
         text='Center of the canvas', fill=app.VALUE_COLOR, font=app.VALUE_FONT)
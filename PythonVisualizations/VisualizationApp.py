@@ -10,7 +10,7 @@ The control panel has containers for
  * A text window for showing and highlighting code snippets
 """
 
-import time, re, pdb, sys, os.path, threading
+import time, re, pdb, sys, os.path, threading, inspect
 from collections import *
 from tkinter import *
 from tkinter import ttk
@@ -19,10 +19,12 @@ try:
     from TextHighlight import *
     from tkUtilities import *
     from Visualization import *
+    from OperationProfiler import *
 except ModuleNotFoundError:
     from .TextHighlight import *
     from .tkUtilities import *
     from .Visualization import *
+    from .OperationProfiler import *
     
 def gridDict(frame):    # Get all widget's within a frame's grid indexed by
     slaves = frame.grid_slaves() # their grid cooordinates (col, row)
@@ -48,6 +50,18 @@ def makeFilterValidate(maxWidth, exclude=''):
         len(value_if_allowed) <= maxWidth and
         all(c not in exclude for c in value_if_allowed))
 
+class CallEnvironment(set):
+    '''Set of canvas items, plus a CodeHighlightBlock, for a call on the
+    call stack.  Each environment has a unique canvas tag that is applied
+    to its items when they need to be hidden, restored, or restacked
+    together in single canvas calls.'''
+    _counter = 0
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        CallEnvironment._counter += 1
+        self.tag = 'callEnviron{}'.format(self._counter)
+
 class VisualizationApp(Visualization): # Base class for visualization apps
 
     # Default styles for display of operational controls
@@ -74,21 +88,44 @@ class VisualizationApp(Visualization): # Base class for visualization apps
     SPEED_SCALE_MAX = 500
     SPEED_SCALE_DEFAULT = (SPEED_SCALE_MIN + SPEED_SCALE_MAX) // 2
     DEBUG = False
+    RECORD_TIMELINE = False  # Default for recording operations for replay
+    PROFILE_OPERATIONS = False # Default for profiling operations
+    QUEUE_OPERATIONS = True  # Queue operations requested while one runs
+    PROFILE_LOG = None       # Default JSON lines file for operation profiles
+    PROFILE_FONT = ('Courier', -10)
+    PROFILE_BG = 'light yellow'
 
     def __init__(  # Constructor
             self,
             maxArgWidth=3,    # Maximum length/width of text arguments
             hoverDelay=500,   # Milliseconds to wait before showing hints
-            **kwargs):
+            recordTimeline=None, # Record operations for replay (default is
+                              # RECORD_TIMELINE)
+            profileOperations=None, # Profile operations (default is
+                              # PROFILE_OPERATIONS)
+            profileLog=None,  # File to append profiles to (default is
+            **kwargs):        # PROFILE_LOG)
         super().__init__(**kwargs)
 
         self.maxArgWidth = maxArgWidth
         self.HOVER_DELAY = hoverDelay
+        self.recordTimeline = (self.RECORD_TIMELINE if recordTimeline is None
+                               else recordTimeline)
+        self.timeline = None   # Timeline of last recorded operation
+        self.replayButton = None
+        self.profiler = None   # Profiler for operations, if enabled
+        self.profileOverlay = None # Label showing last operation's profile
+        if (self.PROFILE_OPERATIONS if profileOperations is None
+            else profileOperations):
+            self.startProfiling(profileLog or self.PROFILE_LOG)
+        if self.headless:      # Recognize stand in buttons as operations
+            self.buttonTypes = self.buttonTypes + (HeadlessButton,)
 
         # Set up instance variables for managing animations and operations
         self.callStack = []    # Stack of local environments for visualziation
 
         self.operationMutex = threading.Lock()
+        self.operationQueue = deque() # (operation, arguments) to run next
         self.pauseButton, self.stopButton, self.stepButton = None, None, None
         self.stepPause = False
         self.lastHighlights = self.callStackHighlights()
@@ -100,53 +137,96 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         self.window.bind('<Unmap>', self.clearHintHandler(), '+')
  
     def setUpControlPanel(self):  # Set up control panel structure
-        self.controlPanel = Frame(self.window, bg=self.DEFAULT_BG)
+        self.controlPanel = self.widgetClass(Frame)(
+            self.window, bg=self.DEFAULT_BG)
         self.controlPanel.pack(side=BOTTOM, expand=False, fill=X)
-        self.operationsUpper = LabelFrame(
+        self.operationsUpper = self.widgetClass(LabelFrame)(
             self.controlPanel, text="Operations", bg=self.DEFAULT_BG)
         self.operationsUpper.grid(row=0, column=0)
         self.opButtons = []
-        self.operationsPadding = Frame(
+        self.operationButtons = {} # Operation buttons indexed by label
+        self.operationsPadding = self.widgetClass(Frame)(
             self.operationsUpper, padx=2, pady=2, bg=self.OPERATIONS_BORDER)
         self.operationsPadding.pack(side=TOP)
-        self.operations = Frame(self.operationsPadding, bg=self.OPERATIONS_BG)
+        self.operations = self.widgetClass(Frame)(
+            self.operationsPadding, bg=self.OPERATIONS_BG)
         self.opSeparator = None
         self.operations.pack(side=LEFT)
-        self.operationsLower = Frame(self.controlPanel, bg=self.DEFAULT_BG)
+        self.operationsLower = self.widgetClass(Frame)(
+            self.controlPanel, bg=self.DEFAULT_BG)
         self.operationsLower.grid(row=1, column=0)
-        self.operationsLowerCenter = Frame(
+        self.operationsLowerCenter = self.widgetClass(Frame)(
             self.operationsLower, padx=2, pady=5, bg=self.DEFAULT_BG)
         self.operationsLowerCenter.pack(side=TOP)
-        self.codeFrame = Frame(self.controlPanel, bg=self.DEFAULT_BG)
+        self.codeFrame = self.widgetClass(Frame)(
+            self.controlPanel, bg=self.DEFAULT_BG)
         self.codeFrame.grid(row=0, column=1, rowspan=2, sticky=(N, E, S, W))
         self.codeText = None
 
         self.speedControl = None
-        self.speedScale = Scale(
+        self.speedScale = self.widgetClass(Scale)(
             self.operationsLowerCenter, orient=HORIZONTAL,
             from_=self.SPEED_SCALE_MIN, to=self.SPEED_SCALE_MAX,
             showvalue=False, sliderlength=20)
         self.speedScale.grid(row=0, column=1, sticky=W)
         self.speedScale.set(self.SPEED_SCALE_DEFAULT)
-        self.slowLabel = Label(
+        self.slowLabel = self.widgetClass(Label)(
             self.operationsLowerCenter, text="Animation speed:  slow",
             font=self.CONTROLS_FONT, bg=self.DEFAULT_BG)
         self.slowLabel.grid(row=0, column=0, sticky=W)
-        self.fastLabel = Label(
+        self.fastLabel = self.widgetClass(Label)(
             self.operationsLowerCenter, text="fast", font=self.CONTROLS_FONT,
             bg=self.DEFAULT_BG)
         self.fastLabel.grid(row=0, column=2, sticky=W)
         self.textEntries, self.entryHint = [], None
         self.messageText = StringVar()
         self.messageText.set('')
-        self.message = Label(
+        self.message = self.widgetClass(Label)(
             self.operationsLowerCenter, textvariable=self.messageText,
             font=self.CONTROLS_FONT + ('italic',), fg="blue",
             bg=self.DEFAULT_BG)
         self.message.grid(row=0, column=4, sticky=(E, W))
+        self.instantVar = IntVar(value=1 if self.instant else 0)
+        self.instantButton = self.widgetClass(Checkbutton)(
+            self.operationsLowerCenter, text="Instant", font=self.CONTROLS_FONT,
+            variable=self.instantVar, bg=self.DEFAULT_BG,
+            command=lambda: self.setInstantMode(self.instantVar.get()))
+        self.instantButton.grid(row=0, column=3, sticky=W)
         self.operationsLowerCenter.grid_columnconfigure(4, minsize=200)
         self.operationsLowerCenter.grid_columnconfigure(3, minsize=10)
 
+    def setInstantMode(self, instant=True):
+        '''Turn instant mode on or off.  In instant mode, operations skip
+        their intermediate animation.  Code is not shown or highlighted,
+        waits return immediately, and item movements jump to their final
+        positions, so only the final state of an operation is drawn.'''
+        self.instant = bool(instant)
+        if self.instantVar.get() != self.instant:
+            self.instantVar.set(1 if self.instant else 0)
+
+    def startProfiling(self, logFile=None, overlay=True):
+        '''Profile each operation run from now on, appending the profiles
+        to a JSON lines log file, if provided, and showing the last one in
+        an overlay on the canvas, if requested.'''
+        self.profiler = OperationProfiler(self, logFile)
+        if overlay and not self.headless and self.profileOverlay is None:
+            self.profileOverlay = Label(
+                self.canvas, font=self.PROFILE_FONT, bg=self.PROFILE_BG,
+                justify=LEFT, anchor=NW)
+            
+    def stopProfiling(self):
+        if self.profiler:
+            self.profiler.stop()
+            self.profiler = None
+        if self.profileOverlay:
+            self.profileOverlay.destroy()
+            self.profileOverlay = None
+
+    def showProfile(self, profile): # Show a profile in the overlay
+        if self.profileOverlay:
+            self.profileOverlay['text'] = OperationProfiler.summary(profile)
+            self.profileOverlay.place(relx=1, x=-4, y=4, anchor=NE)
+
     def newValueCoords(self, buffer=30, offCanvas=False):
         '''Return a set of canvas coords that are below the canvas
         somewhere behind the control panel.  New values can be centered
@@ -213,15 +293,18 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         if bg is None:
             bg = self.OPERATIONS_BG
         if buttonType in (ttk.Button,):
-            ttk.Style().configure('TButton', font=self.CONTROLS_FONT, 
-                                  background=bg)
-            button = buttonType(self.operations, text=label, **kwargs)
+            if not self.headless:
+                ttk.Style().configure('TButton', font=self.CONTROLS_FONT, 
+                                      background=bg)
+            button = self.widgetClass(buttonType)(
+                self.operations, text=label, **kwargs)
         else:
-            button = buttonType( # Create button based on type
+            button = self.widgetClass(buttonType)( # Create button of type
                 self.operations, text=label, font=self.CONTROLS_FONT, bg=bg,
                 **kwargs)
-        button['command'] = self.runOperation(
-            callback, cleanUpBefore, button, mutex)
+        operation = self.runOperation(callback, cleanUpBefore, button, mutex)
+        button['command'] = operation
+        setattr(button, 'operation', operation) # Callable even when disabled
         button.bind('<Button>', self.recordModifierKeyState)
         button.bind('<KeyPress>', self.recordModifierKeyState)
         setattr(button, 'required_args', numArguments)
@@ -279,12 +362,13 @@ class VisualizationApp(Visualization): # Base class for visualization apps
             button.bind('<Leave>', self.makeDisarmHandler(button)) #equivalent of ttp 'close'
             button.bind('<Button>', self.makeDisarmHandler(button), '+')
         self.opButtons.append(button)
+        self.operationButtons[label] = button
         return button
 
     def configureOperationsSeparator(self, withArgs, withoutArgs):
         'Add separator if both kinds of buttons are present and none built'
         if withArgs and withoutArgs and not self.opSeparator:
-            self.opSeparator = Frame(
+            self.opSeparator = self.widgetClass(Frame)(
                 self.operations, width=2, bg=self.OPERATIONS_BORDER)
             self.opSeparator.grid(
                 column=self.separatorColumn, row=1, sticky=(N, E, W, S))
@@ -294,7 +378,7 @@ class VisualizationApp(Visualization): # Base class for visualization apps
                 rowspan=max(nRows, self.entryHintRow if self.entryHint else 1))
         
     def createArgumentEntry(self, validationCmd):
-        entry = Entry(
+        entry = self.widgetClass(Entry)(
             self.operations, width=self.maxArgWidth * 5 // 4, bg=self.ENTRY_BG,
             validate='key', validatecommand=validationCmd, 
             font=self.CONTROLS_FONT)
@@ -316,7 +400,7 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         # creates a toplevel window
         if not self.tw:
             # Make floating window in front of this app without window controls
-            self.tw = Toplevel()
+            self.tw = self.widgetClass(Toplevel)()
             self.entryHint = None
             if not sys.platform.startswith('win'):
                 self.tw.transient(self.controlPanel)
@@ -337,7 +421,7 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         self.tw.geometry("+%d+%d" % (x, y))
 
         if self.entryHint is None: # Create hint if not present
-            self.entryHint = Label(
+            self.entryHint = self.widgetClass(Label)(
                 self.tw, text=hintText,
                 font=self.HINT_FONT, fg=self.HINT_FG, bg=self.HINT_BG)
             self.entryHint.pack()
@@ -407,7 +491,8 @@ class VisualizationApp(Visualization): # Base class for visualization apps
             widgetState(    # Simulate button press
                 button, PRESSED if isinstance(button, ttk.Button) else ACTIVE)
             self.window.update()
-            time.sleep(0.05)
+            if not (self.headless or self.instant):
+                time.sleep(0.05)
             widgetState(
                 button, 
                 '!' + PRESSED if isinstance(button, ttk.Button) else NORMAL)
@@ -422,7 +507,8 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         has been defined, that operation will be the default when Enter is
         pressed.
         '''
-        self.playControlsFrame = Frame(self.operations, bg=self.OPERATIONS_BG)
+        self.playControlsFrame = self.widgetClass(Frame)(
+            self.operations, bg=self.OPERATIONS_BG)
         withArgs, withoutArgs = self.getOperations()
         lastRow, lastColumn = self.getOperationGridLocation(
             withoutArgs[0]) if withoutArgs else (1, self.withoutArgsColumn)
@@ -430,8 +516,9 @@ class VisualizationApp(Visualization): # Base class for visualization apps
             column=lastColumn + lastRow // maxRows, row=lastRow % maxRows + 1)
 
         self.pauseButton, self.stepButton, self.stopButton = (
-            Button(self.playControlsFrame, image=self.playControlImages[name],
-                   state=DISABLED)
+            self.widgetClass(Button)(
+                self.playControlsFrame, image=self.playControlImages[name],
+                state=DISABLED)
             for name in ('pause', 'skip-next', 'stop'))
         for btn, name, func, column in zip(
                 (self.pauseButton, self.stepButton, self.stopButton),
@@ -445,6 +532,11 @@ class VisualizationApp(Visualization): # Base class for visualization apps
             btn.bind('<FocusOut>', self.buttonFocus(btn, False))
             btn.bind('<Button>', self.recordModifierKeyState, add='+')
             btn.bind('<KeyPress>', self.recordModifierKeyState, add='+')
+        if self.recordTimeline:
+            self.replayButton = self.widgetClass(Button)(
+                self.playControlsFrame, text='Replay', font=self.CONTROLS_FONT,
+                command=self.replayTimeline, state=DISABLED)
+            self.replayButton.grid(row=0, column=3, sticky=(E, W))
         withoutArgs.append(self.playControlsFrame)
         self.configureOperationsSeparator(withArgs, withoutArgs)
         
@@ -461,12 +553,24 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         targetSize = (height, height)
         names = ('play', 'pause', 'skip-next', 'stop')
         self.playControlImages = dict(
-            (name, getPhotoImage(name + '-symbol.png', targetSize))
+            (name, name if self.headless else # Use names when headless
+             getPhotoImage(name + '-symbol.png', targetSize))
             for name in names)
         return self.playControlImages
         
     def runOperation(self, command, cleanUpBefore, button=None, mutex=True):
+        '''Make a function that runs an operation command when a button is
+        pressed.  Operations that need the mutex are queued if another
+        operation is running, and run when it finishes.  Commands that
+        return a generator are resumed step by step from Tk's event loop
+        by runOperationSteps.'''
         def animatedOperation(): # If button that uses arguments is provided,
+            if mutex and self.operationMutex.locked():
+                if self.QUEUE_OPERATIONS:
+                    self.queueOperation(animatedOperation)
+                else:
+                    self.setMessage('Cannot run more than one operation')
+                return
             if button and getattr(button, 'required_args', 0) > 0: # record it
                 for entry in self.textEntries[:getattr( # as the last button
                         button, 'required_args')]: # pressed for all its args
@@ -475,6 +579,28 @@ class VisualizationApp(Visualization): # Base class for visualization apps
                 b for b in (self.pauseButton, self.stepButton, self.stopButton)
                 if b]
             withArgs, withoutArgs = self.getOperations()
+            profiling, acquired, steps = False, False, None
+
+            def finishOperation():
+                if self.canvas.recorder:
+                    self.timeline = self.stopRecording()
+                if profiling:
+                    self.showProfile(self.profiler.stop())
+                if acquired:
+                    self.operationMutex.release()
+                self.enableButtons()
+                focus = self.window.focus_get()
+                if (focus and  # If focus ended on a button needing arguments
+                    (focus in withArgs or  # or an animation control run on
+                     focus in animationControls and # something w/ args
+                     button in withArgs) and self.textEntries): # and there are
+                    self.textEntries[0].focus_set() # text entries, switch
+                elif (focus and   # focus to 1st entry. If focus ended on
+                      focus in animationControls and # animation control run
+                      button in withoutArgs): # on something without args
+                    button.focus_set()  # Set focus back to operation button
+                self.runQueuedOperation()
+
             try:
                 if cleanUpBefore:
                     self.cleanUp()
@@ -484,25 +610,176 @@ class VisualizationApp(Visualization): # Base class for visualization apps
                     if not self.operationMutex.acquire(blocking=False):
                         self.setMessage('Cannot run more than one operation')
                         return
-                command()
+                    acquired = True
+                if self.recordTimeline:
+                    self.startRecording()
+                if self.profiler and self.profiler.profile is None:
+                    profiling = True
+                    self.profiler.start(
+                        button['text'] if button else
+                        getattr(command, '__name__', ''))
+                steps = command()
+                if not inspect.isgenerator(steps):
+                    steps = None
             except UserStop as e:
                 self.cleanUp(self.callStack[0] if self.callStack else None,
                              ignoreStops=True)
-            if mutex and self.operationMutex.locked():
-                self.operationMutex.release()
-            self.enableButtons()
-            focus = self.window.focus_get()
-            if (focus and  # If focus ended on a button needing arguments or an
-                (focus in withArgs or  # animation control run on something w/
-                 focus in animationControls and button in withArgs) # args
-                and self.textEntries): # and there are text entry boxes
-                self.textEntries[0].focus_set() # switch focus to 1st entry
-            elif (focus and   # If focus ended on animation control run on
-                  focus in animationControls and # something without args
-                  button in withoutArgs):
-                button.focus_set()     # Set focust back to operation button
+            finally:
+                if steps is None and (acquired or not mutex):
+                    finishOperation()
+            if steps is not None:
+                self.runOperationSteps(steps, finishOperation)
         return animatedOperation
-                
+
+    def runOperationSteps(self, steps, finish):
+        '''Run an operation written as a generator.  Each value it yields
+        is the base time to sleep before the next step, or None for no
+        sleep.  Steps are resumed from 'after' callbacks in Tk's event
+        loop, so the button callback that started the operation returns
+        right away.  Paused operations wait for a change in animation
+        state without polling, and stepping pauses where the code
+        highlights change, like wait().  Frames are timed on the animation
+        scheduler's deadlines.  Stopped operations are closed, so their
+        finally clauses run.  The finish function is called at the end.
+        Headless apps and instant mode run all the steps before returning.'''
+        if self.headless or self.instant:
+            try:
+                self.runSteps(steps)
+            except UserStop:
+                self.cleanUp(self.callStack[0] if self.callStack else None,
+                             ignoreStops=True)
+            finally:
+                steps.close()
+                finish()
+            return
+
+        def step():
+            if self.destroyed:
+                return steps.close()
+            if (self.animationsStopped() and
+                inspect.getgeneratorstate(steps) != inspect.GEN_CREATED):
+                steps.close()
+                self.cleanUp(self.callStack[0] if self.callStack else None,
+                             ignoreStops=True)
+                return finish()
+            highlights = self.callStackHighlights()
+            self.stepPause = (self.animationsStepping() and
+                              self.lastHighlights != highlights)
+            if self.animationsPausedOrStepPaused():
+                play = self.playControlImages['play']
+                if self.stepPause and buttonImage(self.pauseButton) != play:
+                    buttonImage(self.pauseButton, play)
+                return self.scheduler.whenNotified(
+                    lambda: self.window.after_idle(step))
+            self.lastHighlights = highlights
+            self.recordFrame()
+            try:
+                sleepTime = next(steps)
+            except StopIteration:
+                return finish()
+            except UserStop:
+                self.cleanUp(self.callStack[0] if self.callStack else None,
+                             ignoreStops=True)
+                return finish()
+            except BaseException:
+                finish()
+                raise
+            self.scheduler.schedule(step, self.frameTime(sleepTime or 0))
+
+        self.window.after_idle(step)
+
+    def queueOperation(self, operation): # Queue an operation to run after
+        self.operationQueue.append(      # the current one with the current
+            (operation, self.getArguments())) # arguments
+        self.setMessage('Queued {} operation{}'.format(
+            len(self.operationQueue),
+            '' if len(self.operationQueue) == 1 else 's'))
+
+    def runQueuedOperation(self): # Start the next queued operation, if any
+        if self.operationQueue and not self.destroyed:
+            operation, arguments = self.operationQueue.popleft()
+            self.setArguments(*arguments)
+            self.window.after_idle(operation)
+
+    def scriptOperation(self, words):
+        '''Find the operation button named by the leading words of a script
+        line, ignoring case, spaces, and punctuation.  A unique prefix of a
+        label also matches the first word.  Return the button and the
+        remaining words, or None and all the words if there's no match.'''
+        labels = dict((re.sub(r'\W', '', label.lower()), button)
+                      for label, button in self.operationButtons.items())
+        for count in range(len(words), 0, -1):
+            name = re.sub(r'\W', '', ''.join(words[:count]).lower())
+            if name in labels:
+                return labels[name], words[count:]
+        prefix = re.sub(r'\W', '', words[0].lower())
+        matches = [button for label, button in labels.items()
+                   if prefix and label.startswith(prefix)]
+        return (matches[0], words[1:]) if len(matches) == 1 else (None, words)
+
+    def runScript(
+            self,
+            script,          # File name, '-' for stdin, or iterable of lines
+            renderEvery=1,   # Update display after every Nth operation
+            frameRate=None,  # or at most this many times per second
+            report=True):    # Print throughput report when done
+        '''Run operations from a script with one operation per line, like
+        'insert 42' or 'random fill 20'.  Text after a # is a comment.
+        Operations run in instant mode and the display is only updated
+        periodically.  Returns a dictionary of throughput statistics.'''
+        if isinstance(script, str):
+            if script == '-':
+                return self.runScript(sys.stdin, renderEvery, frameRate, report)
+            with open(script) as lines:
+                return self.runScript(lines, renderEvery, frameRate, report)
+        stats = {'operations': 0, 'skipped': 0, 'renders': 0, 'elapsed': 0,
+                 'counts': Counter()}
+        instant = self.instant
+        self.setInstantMode(True)
+        start = lastRender = time.perf_counter()
+        try:
+            for lineNumber, line in enumerate(script, 1):
+                words = line.split('#', 1)[0].split()
+                if not words:
+                    continue
+                button, arguments = self.scriptOperation(words)
+                if button is None or len(arguments) < button.required_args:
+                    stats['skipped'] += 1
+                    print('Line {}: {} operation: {}'.format(
+                        lineNumber, 'Unknown' if button is None else
+                        'Missing arguments for', line.strip()),
+                          file=sys.stderr)
+                    continue
+                self.setArguments(*arguments)
+                button.operation()
+                if self.destroyed:
+                    break
+                stats['operations'] += 1
+                stats['counts'][button['text']] += 1
+                now = time.perf_counter()
+                if (now - lastRender >= 1 / frameRate if frameRate else
+                    stats['operations'] % max(1, renderEvery) == 0):
+                    self.window.update_idletasks()
+                    stats['renders'] += 1
+                    lastRender = now
+        finally:
+            if not self.destroyed:
+                self.window.update_idletasks()
+                stats['renders'] += 1
+                self.setInstantMode(instant)
+        stats['elapsed'] = time.perf_counter() - start
+        stats['rate'] = stats['operations'] / max(stats['elapsed'], 1e-9)
+        summary = '{} operations in {:.3f}s, {:.1f} per second'.format(
+            stats['operations'], stats['elapsed'], stats['rate'])
+        if not self.destroyed:
+            self.setMessage(summary)
+        if report:
+            print('{}, {} renders, {} lines skipped'.format(
+                summary, stats['renders'], stats['skipped']))
+            for label, count in stats['counts'].most_common():
+                print('  {:6d} {}'.format(count, label))
+        return stats
+
     def getArgument(self, index=0, clear=False):
         if 0 <= index and index < len(self.textEntries):
             val = self.textEntries[index].get()
@@ -559,8 +836,8 @@ class VisualizationApp(Visualization): # Base class for visualization apps
                  sleepTime=0,       # Wait time between adding lines of text
                  allowStepping=True): # Allow stepping on waits
         code = code.strip()
-        if len(code) == 0:  # Empty code string?
-            return          # then nothing to show
+        if len(code) == 0 or self.headless or self.instant: # Empty code, no
+            return          # display, or instant mode?  then nothing to show
         if self.codeText is None:
             padX, padY = 10, 10
             self.codeTextCharWidth = textWidth( 
@@ -717,10 +994,33 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         If returnValue is a function, it is called at the end of this
         routine to delay the execution and get the return value.
         '''
+        if (self.highlightFragments(fragments, callEnviron, color) and
+            (wait > 0 or self.animationsStepping())): # Optionally wait for a
+            self.wait(wait)                           # time or pause at a step
+        return returnValue() if callable(returnValue) else returnValue
+
+    def highlightCodeSteps(
+            self, fragments, callEnviron, wait=0, color=None, returnValue=None):
+        '''Highlight code like highlightCode in an operation generator.
+        Instead of waiting, it yields the wait time to the generator's
+        runner, which also pauses there for steps.  Use it with yield from
+        to get the returnValue.
+        '''
+        if (self.highlightFragments(fragments, callEnviron, color) and
+            (wait > 0 or self.animationsStepping())):
+            yield wait
+        return returnValue() if callable(returnValue) else returnValue
+
+    def highlightFragments(self, fragments, callEnviron, color=None):
+        '''Highlight code fragments for a call environment as described in
+        highlightCode.  Returns true if code was highlighted.
+        '''
+        if self.instant:    # Nothing to highlight in instant mode
+            return False
         codeBlock = self.getCodeHighlightBlock(callEnviron)
         if self.codeText is None or codeBlock is None:
             # This should only happen when code is hidden
-            return returnValue() if callable(returnValue) else returnValue
+            return False
         if color is None:
             color = self.CODE_HIGHLIGHT
         if isinstance(fragments, (list, tuple)):
@@ -737,24 +1037,16 @@ class VisualizationApp(Visualization): # Base class for visualization apps
             frags = [(fragments, 1)]
         codeBlock.currentFragments = frags # Store standardized fragments
         tags = [codeBlock[frag] for frag in frags]
-        found = False       # Assume tag not found
-        for tagName in self.codeText.tag_names() if self.codeText else []:
-            if not tagName.startswith(codeBlock.prefix):
-                continue  # Only change tags for this call environment
-            highlight = tagName in tags
-            self.codeText.tag_config(
-                tagName, background=color if highlight else '',
-                underline=1 if highlight else 0)
-            if highlight:
-                found = True
-                for index in reversed(self.codeText.tag_ranges(tagName)):
-                    self.codeText.see(index)
-        if not found and len(tags) > 0:  # This shouldn't happen so log bug
+        codeBlock.highlight(tags, color, underline=1) # Only changed tags are
+        ranges = [index for tag in tags   # reconfigured
+                  for index in self.codeText.tag_ranges(tag)]
+        if ranges:           # Scroll to show end, then start of highlights
+            self.codeText.see(ranges[-1])
+            self.codeText.see(ranges[0])
+        elif len(tags) > 0:  # This shouldn't happen so log bug
             print('Unable to find highlight tag(s) {} among {}'.format(
-                ', '.join(tags), ', '.join(codeBlock.cache.keys())))
-        if wait > 0 or self.animationsStepping(): # Optionally weit for a time
-            self.wait(wait)                       # or pause at a step
-        return returnValue() if callable(returnValue) else returnValue
+                ', '.join(tags), ', '.join(map(str, codeBlock.cache.keys()))))
+        return True
 
 
     # Return the CodeHighlightBlock from the set object from the call stack
@@ -765,6 +1057,33 @@ class VisualizationApp(Visualization): # Base class for visualization apps
     # Instead, we do a linear search and find it by its type
     def getCodeHighlightBlock(self, callEnvironment):
         return getCodeHighlightBlock(callEnvironment)
+
+    def codeState(self):    # Get code text and highlighted ranges for timeline
+        if not self.codeText:
+            return super().codeState()
+        highlights = []
+        for callEnviron in self.callStack:
+            codeBlock = self.getCodeHighlightBlock(callEnviron)
+            for fragment in (codeBlock.currentFragments or []
+                             if codeBlock else []):
+                tag = codeBlock.cache.get(fragment)
+                if tag:
+                    highlights.extend(
+                        str(index) for index in self.codeText.tag_ranges(tag))
+        return (self.codeText.get('1.0', END), tuple(highlights))
+
+    def replayTimeline(self, timeline=None):
+        '''Open a player window to replay a timeline, by default, the
+        timeline of the last recorded operation'''
+        if timeline is None:
+            timeline = self.timeline
+        if timeline is None or len(timeline) == 0 or self.headless:
+            return None
+        width, height = widgetDimensions(self.canvas)
+        return TimelinePlayer(
+            timeline, master=self.window, canvasWidth=width,
+            canvasHeight=height,
+            title='{} replay'.format(self.title) if self.title else 'Replay')
             
     def cleanUp(self,         # Remove Tk items from past animations either
                 callEnviron=None,  # for a particular call or all calls
@@ -799,19 +1118,19 @@ class VisualizationApp(Visualization): # Base class for visualization apps
             allowSteps=False): # allowing step pauses if set
         inUserStop = False
         codeBlock = None
-        toDelete = []
-        while len(callEnviron):
-            thing = callEnviron.pop()
-            if isinstance(thing, (str, int)) and self.canvas.type(thing):
-                toDelete.append(thing)
-            elif isinstance(thing, CodeHighlightBlock) and self.codeText:
-                codeBlock = thing
+        toDelete = [thing for thing in callEnviron
+                    if isinstance(thing, int) or
+                    isinstance(thing, str) and self.canvas.type(thing)]
+        if self.codeText:
+            codeBlock = self.getCodeHighlightBlock(callEnviron)
+        callEnviron.clear()
         if codeBlock:
             inUserStop = self.removeCode(
                 codeBlock.code, sleepTime=sleepTime, allowSteps=allowSteps
             ) or inUserStop
-        for item in toDelete:
-            self.canvas.delete(item)
+            codeBlock.deleteTags()
+        if toDelete:         # Delete all the items in one canvas call
+            self.canvas.delete(*toDelete)
         if inUserStop:
             raise UserStop()
 
@@ -827,7 +1146,7 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         means don't call startAnimations.
         '''
         code = code.strip()
-        callEnviron = set()
+        callEnviron = CallEnvironment()
         if len(code) > 0:
             self.showCode(
                 code, addBoundary=True,
@@ -857,10 +1176,13 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         call stack.  The items in the callEnviron are either moved off the
         canvas, or set to HIDDEN state depending on the moveItems flag.
         Items in the exclude set or sequence are not hidden.
+        Only items with a vertex inside the canvas are moved.
         Returns a dictionary mapping item numbers to tuples of the form
         (state, index) where state is either their coordinates or their
-        current state attribute for later restoration in the stacking
-        order provided by their index.'''
+        prior state attribute for later restoration in the stacking order
+        provided by their index.  The items are tagged with the call
+        environment's tag so they can be hidden and raised with single
+        canvas calls.'''
         if callEnviron is not self.callStack[-1]:
             raise Exception(
                 'Cannot yield from call environment that is not current')
@@ -869,26 +1191,32 @@ class VisualizationApp(Visualization): # Base class for visualization apps
             self.removeCode(codeBlock.code, sleepTime=sleepTime)
         self.callStack.pop()
         itemCoords = {}
-        canvasDims = (V(self.canvasBounds[2:]) - self.canvasBounds[:2]
-                      if self.canvasBounds else 
-                      widgetDimensions(self.canvas))
-        away = V(canvasDims) * 10
-        itemStackingOrder = self.canvas.find_all()
-        for item in callEnviron:
-            if (isinstance(item, int) and self.canvas.type(item) and
-                not item in exclude):
-                itemIndex = itemStackingOrder.index(item)
-                if moveItems:
-                    coords = self.canvas.coords(item)
-                    if any(self.withinCanvas((coords[j], coords[j + 1]))
-                           for j in range(0, len(coords), 2)):
-                        itemCoords[item] = (coords, itemIndex)
-                        self.canvas.coords(item, V(coords) +
-                                           V(away * (len(coords) // 2)))
-                else:
-                    state = self.canvas_itemConfig(item, 'state')
-                    itemCoords[item] = (state, itemIndex)
-                    self.canvas_itemConfig(item, state=HIDDEN)
+        items = [item for item in callEnviron
+                 if isinstance(item, int) and self.canvas.type(item) and
+                 not item in exclude]
+        if moveItems:        # Only move items with a vertex in the canvas
+            coords = dict((item, self.canvas.coords(item)) for item in items)
+            items = [item for item in items if any(
+                self.withinCanvas(coords[item][j:j + 2])
+                for j in range(0, len(coords[item]), 2))]
+        if not items:
+            return itemCoords
+        tag = callEnviron.tag
+        self.canvas.tagItems(tag, items)
+        stackingOrder = self.canvas.find_withtag(tag)
+        if moveItems:
+            canvasDims = (V(self.canvasBounds[2:]) - self.canvasBounds[:2]
+                          if self.canvasBounds else 
+                          widgetDimensions(self.canvas))
+            away = tuple(V(canvasDims) * 10)
+            for index, item in enumerate(stackingOrder):
+                itemCoords[item] = (coords[item], index)
+            self.canvas.move(tag, *away)
+        else:
+            for index, item in enumerate(stackingOrder):
+                itemCoords[item] = (self.canvas_itemConfig(item, 'state'),
+                                    index)
+            self.canvas_itemConfig(tag, state=HIDDEN)
         return itemCoords
 
     def resumeCallEnvironment(
@@ -900,14 +1228,28 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         if codeBlock:
             self.showCode(codeBlock.code, sleepTime=sleepTime,
                           addBoundary=True, allowStepping=False)
-            codeBlock.markStart()
-            self.highlightCode(codeBlock.currentFragments, callEnviron, wait=0)
-        for item in sorted(itemMap.keys(), key=lambda x: itemMap[x][1]):
-            if isinstance(itemMap[item][0], (list, tuple)):
-                self.canvas.coords(item, *itemMap[item][0])
-            else:
-                self.canvas_itemConfig(item, state=itemMap[item][0])
-            self.canvas.tag_raise(item)
+            if self.codeText:
+                codeBlock.markStart()
+                self.highlightCode(
+                    codeBlock.currentFragments, callEnviron, wait=0)
+        if not itemMap:
+            return
+        tag = callEnviron.tag
+        self.canvas.tagItems(tag, sorted(itemMap, key=lambda x: itemMap[x][1]))
+        moved = [(item, state) for item, (state, index) in itemMap.items()
+                 if isinstance(state, (list, tuple))]
+        for item, coords in moved:     # Put moved items back at their saved
+            self.canvas.coords(item, *coords) # coordinates
+        if len(moved) < len(itemMap):  # Restore the most common state to
+            restored = Counter(        # all hidden items, then the others
+                state for state, index in itemMap.values()
+                if not isinstance(state, (list, tuple)))
+            common = restored.most_common(1)[0][0]
+            self.canvas_itemConfig(tag, state=common)
+            for item, (state, index) in itemMap.items():
+                if not isinstance(state, (list, tuple)) and state != common:
+                    self.canvas_itemConfig(item, state=state)
+        self.canvas.tag_raise(tag)     # Raise items keeping their order
 
     def callStackHighlights(self):
         '''Return list of code fragments highlighted on every level of the call
@@ -920,12 +1262,23 @@ class VisualizationApp(Visualization): # Base class for visualization apps
         return min(
             10, sleepTime * 50 * self.SPEED_SCALE_MIN / self.speedScale.get())
 
+    def frameTime(self, sleepTime): # Frame times are adjusted by user speed
+        return 0 if self.headless or self.instant else self.speed(sleepTime)
+
     def wait(self, sleepTime, allowStepping=True):
         '''Sleep for a user-adjusted period, pausing optionally for steps
         and for user requested pauses.
         Stepping pauses when the current highlighted fragments on the call
         stack don't match those encountered in the last call to wait.
+        In instant mode, waits return immediately unless the user has
+        requested a stop.
         '''
+        if self.instant:
+            if self.destroyed:
+                sys.exit()
+            if self.animationsStopped():
+                raise UserStop()
+            return
         if self.debugRequested:
             kwargs = {}
             if sys.version_info[:2] >= (3, 7):
@@ -935,6 +1288,7 @@ class VisualizationApp(Visualization): # Base class for visualization apps
             self.debugRequested = False
             pdb.set_trace(**kwargs)
             
+        self.recordFrame()
         stateOnEntry = self.animationState
         if (self.animationsStepping() and
             buttonImage(self.pauseButton) != self.playControlImages['play']):
@@ -948,31 +1302,23 @@ class VisualizationApp(Visualization): # Base class for visualization apps
                     for index in reversed(self.codeText.tag_ranges(
                             codeBlock[fragment])):
                         self.codeText.see(index)
-            while self.lastHighlights != highlights and self.animationsStepping():
-                self.stepPause = True
-                self.window.update()
-                if self.destroyed:
-                    sys.exit()
-                time.sleep(0.02)
-                if self.destroyed:
-                    sys.exit()
+            self.stepPause = True   # Wait for step button or a state change
+            self.scheduler.waitUntil(
+                lambda: self.lastHighlights == highlights or
+                not self.animationsStepping())
             self.stepPause = False
-        self.lastHighlights = self.callStackHighlights()
-        if sleepTime > 0:
-            self.window.update()
-            if self.destroyed:
-                sys.exit()
-            time.sleep(self.speed(sleepTime))
             if self.destroyed:
                 sys.exit()
-        while self.animationsPaused():
-            self.window.update()
+        self.lastHighlights = self.callStackHighlights()
+        if sleepTime > 0 and not self.headless:
+            self.scheduler.sleep(self.frameTime(sleepTime))
             if self.destroyed:
                 sys.exit()
-            time.sleep(0.02)
+        if self.animationsPaused(): # Wait for a change in animation state
+            self.scheduler.waitUntil(lambda: not self.animationsPaused())
             if self.destroyed:
                 sys.exit()
-            
+
         if self.animationsStopped(): # If user requested to stop
             raise UserStop()      # animation while waiting then raise exception
 
@@ -1021,8 +1367,14 @@ class VisualizationApp(Visualization): # Base class for visualization apps
                                 enable and not self.animationsStopped() and
                                 (b != self.stepButton or self.codeText))
                             else DISABLED)
+                if self.replayButton:
+                    widgetState(
+                        self.replayButton,
+                        NORMAL if enable and self.timeline and
+                        self.animationsStopped() else DISABLED)
 
     def stop(self):
+        self.operationQueue.clear()  # Stopping also cancels queued operations
         self.stopAnimations()
         self.animationState = Animation.STOPPED  # Always stop on user request
         buttonImage(self.pauseButton, self.playControlImages['play'])
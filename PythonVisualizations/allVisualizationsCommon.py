@@ -3,8 +3,9 @@ __doc__ = """
 Common components of the runAllVisualization tools.
 """
 
-import sys, re, webbrowser, os, glob
+import sys, re, webbrowser, os, glob, time, random, inspect, json, hashlib
 from importlib import *
+from tkinter import *
 from tkinter import ttk
 
 try:
@@ -18,9 +19,94 @@ pathsep = re.compile(r'[/\\]')
 runVizCallPattern = re.compile(
     r'\n[^#]*\.runVisualization\(\)(?!.*#\s*runAllVisualizations ignore)')
 
-def findVisualizations(filesAndDirectories, verbose=0):
+MANIFEST_NAME = '.visualizationManifest.json'
+discoveryStats = {}      # Counts and time of the last findVisualizations call
+
+class DiscoveryManifest(object):
+    '''Persistent record of which python files in a directory call
+    runVisualization() and the names of the VisualizationApp classes
+    found in them when last imported.  Entries are keyed by absolute file
+    path and hold the file's modification time, size, and content hash,
+    so unchanged files need not be read and scanned again, and unchanged
+    files without VisualizationApp classes need not be imported.  The
+    manifest is saved in the directory, if it is writable.'''
+
+    VERSION = 1
+
+    def __init__(self, directory, load=True):
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.entries = {}    # Entries by absolute file path
+        self.changed = False
+        if not load:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.entries = data['entries']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def entry(self, filename): # Get the entry for a file, scanning it if it
+        path = os.path.abspath(filename) # changed.  None if it's unreadable
+        try:
+            stat = os.stat(path)
+            entry = self.entries.get(path)
+            if (entry and entry['mtime'] == stat.st_mtime and
+                entry['size'] == stat.st_size):
+                discoveryStats['cached'] += 1
+                return entry
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+        digest = hashlib.sha1(content).hexdigest()
+        self.changed = True
+        if entry and entry['hash'] == digest: # Same content, new timestamp
+            entry['mtime'], entry['size'] = stat.st_mtime, stat.st_size
+            discoveryStats['cached'] += 1
+            return entry
+        discoveryStats['scanned'] += 1
+        entry = self.entries[path] = {
+            'mtime': stat.st_mtime, 'size': stat.st_size, 'hash': digest,
+            'runsVisualization': bool(runVizCallPattern.search(
+                content.decode('utf-8', errors='replace'))),
+            'classes': None}   # Class names are unknown until imported
+        return entry
+
+    def noteClasses(self, filename, classes): # Record names of classes
+        entry = self.entries.get(os.path.abspath(filename)) # found in a file
+        names = sorted(cls.__name__ for cls in classes)
+        if entry and entry['classes'] != names:
+            entry['classes'] = names
+            self.changed = True
+
+    def save(self):
+        if not self.changed:
+            return
+        try:
+            with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'entries': self.entries},
+                          f, indent=1, sort_keys=True)
+            os.replace(self.path + '.tmp', self.path)
+            self.changed = False
+        except OSError:
+            pass
+
+def findVisualizations(filesAndDirectories, verbose=0, useManifest=True):
+    '''Find the VisualizationApp subclasses in the python files that call
+    runVisualization().  Files are given individually or by directory.  A
+    manifest in each directory records which files call runVisualization()
+    so that unchanged files are not scanned again, and which of them
+    define no VisualizationApp classes so that they are not imported
+    again.  When useManifest is false, all files are scanned and the
+    manifests are not updated.'''
     global VAPs
     classes = set()
+    start = time.perf_counter()
+    discoveryStats.update(
+        files=0, scanned=0, cached=0, imported=0, skipped=0)
+    manifests = {}       # Manifests by directory
     try:
         orig__path__ = sys.path
     except NameError:
@@ -38,8 +124,18 @@ def findVisualizations(filesAndDirectories, verbose=0):
                 file=sys.stderr)
             if verbose > 2 and isDir:
                 print('Files:', '\n'.join(files), file=sys.stderr)
-        for filename in [f for f in files 
-                         if isPatternInFile(runVizCallPattern, f)]:
+        discoveryStats['files'] += len(files)
+        for filename in files:
+            directory = os.path.dirname(os.path.abspath(filename))
+            if directory not in manifests:
+                manifests[directory] = DiscoveryManifest(
+                    directory, load=useManifest)
+            entry = manifests[directory].entry(filename)
+            if not (entry and entry['runsVisualization']):
+                continue
+            if entry['classes'] == []: # Imported before without finding any
+                discoveryStats['skipped'] += 1 # app classes
+                continue
             dirs = pathsep.split(os.path.normpath(os.path.dirname(filename)))
             if dirs and dirs[0] == '.':
                 dirs.pop(0)
@@ -63,6 +159,7 @@ def findVisualizations(filesAndDirectories, verbose=0):
                         except ModuleNotFoundError:
                             pass
                     module = import_module(modulename)
+                    discoveryStats['imported'] += 1
                     if verbose > 1:
                         print('Imported. Looking for VisualizationApp'
                               .format(modulename), file=sys.stderr)
@@ -76,12 +173,22 @@ def findVisualizations(filesAndDirectories, verbose=0):
                             print('Previously found:', previouslyFound,
                                   file=sys.stderr)
                     classes |= set(newclasses)
+                    manifests[directory].noteClasses(filename, newclasses)
                 except ModuleNotFoundError:
                     if verbose > 0:
                         print('Unable to import module', modulename,
                               file=sys.stderr)
     if orig__path__ is not None:
         sys.path = orig__path__
+    if useManifest:
+        for manifest in manifests.values():
+            manifest.save()
+    discoveryStats['seconds'] = time.perf_counter() - start
+    if verbose > 0:
+        print('Found {} classes in {files} files ({scanned} scanned, '
+              '{cached} cached, {imported} imported, {skipped} skipped) '
+              'in {seconds:.3f} seconds'.format(len(classes), **discoveryStats),
+              file=sys.stderr)
     return classes
 
 def isPatternInFile(textOrRegex, filename):
@@ -103,6 +210,93 @@ def findVisualizationClasses(module, verbose=0):
                 module.__name__, name, type(this)), file=sys.stderr)
     return classes
 
+def appTitle(app):       # Get the default title of a VisualizationApp class
+    try:                 # without constructing it
+        parameter = inspect.signature(app).parameters.get('title')
+    except (TypeError, ValueError):
+        parameter = None
+    return (parameter.default if parameter and isinstance(
+        parameter.default, str) and parameter.default else app.__name__)
+
+class LazyApp(object):
+    '''Construct a VisualizationApp in a pane the first time the pane is
+    mapped, rather than when the pane is made.  Apps can also be warmed up
+    by building them in idle time before they are shown.'''
+
+    def __init__(self, app, pane, seed=None, debug=False, profile=None,
+                 onBuild=None):
+        self.app = app          # VisualizationApp class
+        self.pane = pane        # Frame to hold app
+        self.seed = seed        # Random seed to use before construction
+        self.debug = debug
+        self.profile = profile  # StartupProfile to note constructions
+        self.onBuild = onBuild  # Function to call with this after building
+        self.title = appTitle(app)
+        self.vizApp = None      # The constructed app, if any
+        self.error = None       # Exception raised during construction
+        pane.bind('<Map>', self.mapHandler, '+')
+
+    def built(self):
+        return self.vizApp is not None or self.error is not None
+
+    def build(self):         # Construct the app if it hasn't been already
+        if self.built():
+            return self.vizApp
+        if self.seed:
+            random.seed(self.seed)
+        start = time.perf_counter()
+        try:
+            self.vizApp = self.app(window=self.pane)
+            self.vizApp.DEBUG = self.debug
+            self.title = getattr(self.vizApp, 'title', self.title)
+        except Exception as e:
+            self.error = e
+            msg = 'Error instantiating {}:\n{}'.format(self.app.__name__, e)
+            label = Label(self.pane, text=msg, fg='red')
+            label.pack()
+            print(msg, file=sys.stderr)
+        if self.profile:
+            self.profile.mark('built {}'.format(self.app.__name__), start)
+        if self.onBuild:
+            self.onBuild(self)
+        return self.vizApp
+
+    def mapHandler(self, event=None):
+        if self.built():
+            return
+        if self.build() is not None:
+            oneTimeShowHintHandler(self.vizApp)(event)
+
+    def warmUp(self, delay=200): # Build the app in idle time after a delay
+        if not self.built():
+            self.pane.after(delay, lambda: self.pane.after_idle(self.build))
+
+class StartupProfile(object):
+    '''Measure startup phases of a visualization launcher from the time this
+    profile is made to the first interactive frame.'''
+
+    def __init__(self, file=sys.stderr):
+        self.start = time.perf_counter()
+        self.file = file
+        self.marks = []         # (label, start, end) times of phases
+
+    def mark(self, label, start=None): # Note the end of a phase that began
+        now = time.perf_counter()      # at start or at the last mark
+        if start is None:
+            start = self.marks[-1][2] if self.marks else self.start
+        self.marks.append((label, start, now))
+
+    def reportWhenInteractive(self, window): # Report once the window has
+        window.after_idle(                   # processed its first events
+            lambda: window.after(0, lambda: self.mark('first frame') or
+                                 self.report()))
+
+    def report(self):
+        for label, start, end in self.marks:
+            print('{:>8.1f} ms {:>8.1f} ms  {}'.format(
+                (end - self.start) * 1000, (end - start) * 1000, label),
+                  file=self.file)
+
 URL_pattern = re.compile(r'(https*|ftp)://[\w-]+\.[\w/.,?&=#%-]+')
 
 intro_msg = """
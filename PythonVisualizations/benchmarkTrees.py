@@ -0,0 +1,180 @@
+__doc__ = """
+Microbenchmarks for the binary tree visualizations.  The trees run
+without animation so the times reflect the cost of the tree model and
+canvas bookkeeping rather than the animation delays.  Each benchmark
+grows a tree in stages and reports the average cost per operation at
+each stage, so costs that should be flat as the tree grows can be
+checked at a glance.  Without a display, the trees run headless.  Only
+the nodes in view are drawn, so the canvas work per operation does not
+grow with the tree.
+
+The non-visual tree engines can be benchmarked by name too.  Each
+engine inserts keys given in random, sorted, reversed, or zigzag order,
+searches for every key in random order, and then deletes the first half
+of the keys in the order they were inserted.  The zigzag order takes
+keys alternately from the low and high ends of the range, so many
+inserts into a binary tree need a double rotation.  It causes about 1.5
+to 1.6 rotations per insert in the AVL and red-black engines, compared
+with 1 for sorted keys and 0.6 to 0.7 for random keys.  The report
+gives the time and the counts of comparisons, node visits, rotations,
+color flips, and splits per operation along with the tree height.
+"""
+
+import argparse, sys, os, random, time
+
+try:
+    from BinaryTree import *
+    from AVLTree import *
+    from RedBlackTree import *
+    from TreeEngines import *
+except ModuleNotFoundError:
+    from .BinaryTree import *
+    from .AVLTree import *
+    from .RedBlackTree import *
+    from .TreeEngines import *
+
+TREES = {'BinaryTree': BinaryTree, 'AVLTree': AVLTree,
+         'RedBlackTree': RedBlackTree}
+
+def emptyTree(cls, maxLevel, valMax):  # Make an empty tree with enough
+    tree = cls(MAX_LEVEL=maxLevel, VAL_MAX=valMax) # levels for benchmarking
+    tree.emptyTree()
+    return tree
+
+def benchmarkInsert(
+        cls,            # Binary tree class to benchmark
+        stages=5,       # Number of stages in which to grow the tree
+        perStage=200,   # Number of keys inserted in each stage
+        lookups=2000,   # Number of node to index lookups per stage
+        maxLevel=40):   # Maximum level of tree
+    '''Insert random keys into a tree in stages.  Report the average time
+    per insert, node to index lookup, and height difference in each
+    stage.  Like fill(), the inserts run inside a call environment so the
+    whole tree is not restored on the canvas after each one.'''
+    valMax = 10 * stages * perStage
+    tree = emptyTree(cls, maxLevel, valMax)
+    keys = random.sample(range(1, valMax), stages * perStage)
+    results = []
+    for stage in range(stages):
+        callEnviron = tree.createCallEnvironment()
+        start = time.perf_counter()
+        for key in keys[stage * perStage:(stage + 1) * perStage]:
+            tree.insert(key, animation=False)
+        insertTime = (time.perf_counter() - start) / perStage
+        tree.cleanUp(callEnviron)
+        nodes = [node for i, node in tree.nodes.items()]
+        sample = [random.choice(nodes) for i in range(lookups)]
+        start = time.perf_counter()
+        for node in sample:
+            tree.getIndex(node)
+        lookupTime = (time.perf_counter() - start) / lookups
+        start = time.perf_counter()
+        for node in sample:
+            tree.heightDiff(node)
+        heightTime = (time.perf_counter() - start) / lookups
+        results.append((tree.size, insertTime, lookupTime, heightTime))
+    return results
+
+def zigzag(size):            # Keys alternately from the low and high ends
+    keys = []
+    for low in range((size + 1) // 2):
+        keys.append(low)
+        if size - 1 - low > low:
+            keys.append(size - 1 - low)
+    return keys
+
+KEY_ORDERS = {
+    'random': lambda size: random.sample(range(size), size),
+    'sorted': lambda size: list(range(size)),
+    'reversed': lambda size: list(range(size - 1, -1, -1)),
+    'zigzag': zigzag}
+
+def benchmarkEngine(
+        cls,            # Tree engine class to benchmark
+        order='random', # Name of key order for inserts
+        size=10000):    # Number of keys to insert
+    '''Insert keys in the given order into an empty engine, search for all
+    of them in random order, and delete the first half in insertion order.
+    Return the tree height after the inserts and a list of (operation,
+    count, seconds per operation, counts per operation) tuples.'''
+    engine = cls()
+    keys = KEY_ORDERS[order](size)
+    operations = [('insert', engine.insert, keys),
+                  ('search', engine.search, random.sample(keys, size))]
+    if hasattr(engine, 'delete'):
+        operations.append(('delete', engine.delete, keys[:size // 2]))
+    results, height = [], 0
+    for name, operation, operands in operations:
+        engine.resetCounts()
+        start = time.perf_counter()
+        for key in operands:
+            operation(key)
+        elapsed = time.perf_counter() - start
+        results.append((name, len(operands), elapsed / len(operands),
+                        dict((count, value / len(operands))
+                             for count, value in engine.counts().items())))
+        if name == 'insert':
+            height = engine.height()
+    return height, results
+
+def reportEngine(name, order, size, height, results):
+    print('{} with {} {} keys, height {}:'.format(name, size, order, height))
+    print('  {:>8s} {:>10s} '.format('op', 'time (us)') + ' '.join(
+        '{:>11s}'.format(count) for count in COUNTS))
+    for operation, count, seconds, counts in results:
+        print('  {:>8s} {:10.2f} '.format(operation, seconds * 1e6) + ' '.join(
+            '{:11.3f}'.format(counts[name]) for name in COUNTS))
+
+def report(name, results):
+    print('{}:'.format(name))
+    print('  {:>8s} {:>14s} {:>14s} {:>15s}'.format(
+        'size', 'insert (us)', 'getIndex (us)', 'heightDiff (us)'))
+    for size, insertTime, lookupTime, heightTime in results:
+        print('  {:8d} {:14.1f} {:14.3f} {:15.3f}'.format(
+            size, insertTime * 1e6, lookupTime * 1e6, heightTime * 1e6))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        'trees', nargs='*', default=['BinaryTree'],
+        help='Tree classes or engines to benchmark: {}'.format(
+            ', '.join(list(TREES) + list(ENGINES))))
+    parser.add_argument(
+        '-s', '--stages', type=int, default=5,
+        help='Number of stages in which to grow each tree.')
+    parser.add_argument(
+        '-n', '--per-stage', type=int, default=200,
+        help='Number of keys to insert in each stage.')
+    parser.add_argument(
+        '-o', '--orders', nargs='+', choices=KEY_ORDERS,
+        default=list(KEY_ORDERS),
+        help='Key orders for benchmarking tree engines.')
+    parser.add_argument(
+        '--sizes', nargs='+', type=int, default=[1000, 10000, 100000],
+        help='Numbers of keys for benchmarking tree engines.')
+    parser.add_argument(
+        '--headless', default=not os.environ.get('DISPLAY'),
+        action='store_true',
+        help='Run without a display.')
+    parser.add_argument(
+        '--seed', default='3.14159',
+        help='Random number generator seed.  Set to empty string to skip '
+        'seeding.')
+    args = parser.parse_args()
+
+    Visualization.HEADLESS = args.headless
+    for name in args.trees:
+        if name not in TREES and name not in ENGINES:
+            parser.error('Unknown tree {!r}'.format(name))
+        if args.seed:
+            random.seed(args.seed)
+        if name in ENGINES:
+            for order in args.orders:
+                for size in args.sizes:
+                    reportEngine(name, order, size, *benchmarkEngine(
+                        ENGINES[name], order=order, size=size))
+            continue
+        report(name, benchmarkInsert(
+            TREES[name], stages=args.stages, perStage=args.per_stage))
@@ -2,7 +2,10 @@ import functools
 
 @functools.total_ordering
 class drawnValue(object):
-    'A record describing a value drawn in a Tk canvas to represent a value'
+    '''A record describing a value drawn in a Tk canvas to represent a value.
+    Records have fixed slots for the value and the tuple of canvas items.'''
+    __slots__ = ('val', 'items')
+
     def __init__(            # Constructor
             self,            # The value is usually the key used in sorting
             val=None,        # values in a data structure
@@ -11,13 +14,30 @@ class drawnValue(object):
         self.items = items
 
     __fields = ('val', 'items')
-    __legacy_fields = ('display_shape', 'display_val')
+
+    @classmethod
+    def many(cls,            # Make a list of drawnValues for a sequence of
+             values,         # values and a parallel sequence of canvas item
+             itemSequences=None): # sequences (or no items when not provided)
+        new, result = object.__new__, [] # Fill the slots directly rather
+        append = result.append           # than calling init
+        if itemSequences is None:
+            for val in values:
+                dValue = new(cls)
+                dValue.val, dValue.items = val, ()
+                append(dValue)
+        else:
+            for val, items in zip(values, itemSequences):
+                dValue = new(cls)
+                dValue.val, dValue.items = val, tuple(items)
+                append(dValue)
+        return result
 
     def __getitem__(self, key): # Implement positIonal access
         if isinstance(key, int):
             if 0 == key:        # Index 0 is value
                 return self.val
-            if 1 <= key and key < 1 + len(self.items): # Indices 1-N are
+            if 1 <= key and key <= len(self.items): # Indices 1-N are
                 return self.items[key-1]  # the canvas items making up the value
             raise IndexError
         elif isinstance(key, slice):
@@ -28,36 +48,37 @@ class drawnValue(object):
             return getattr(self, key)
         raise ValueError
 
-    def __getattr__(self, name):
-        if name in self.__legacy_fields:
-            return self[self.__legacy_fields.index(name) + 1]
-        raise AttributeError('drawnValue has no attribute {}'.format(
-            repr(name)))
-
     def __setitem__(self, key, val): # Implement posititional field access
         if isinstance(key, int):
             if 0 == key:
                 self.val = val
                 return self
-            if 1 <= key and key < 1 + len(self.items):
-                self.items = tuple(
-                    val if i == key-1 else v for i, v in enumerate(self.items))
+            if 1 <= key and key <= len(self.items):
+                self.items = self.items[:key-1] + (val,) + self.items[key:]
                 return self
             raise IndexError
         elif isinstance(key, str):
             return setattr(self, key, val)
         raise ValueError
 
-    def __setattr__(self, name, val):
-        if name in self.__fields:
-            return object.__setattr__(self, name, val)
-        if name in self.__legacy_fields:
-            pos = self.__legacy_fields.index(name)
-            self.items = tuple(
-                val if i == pos else v for i, v in enumerate(self.items))
-            return 
-        raise AttributeError('drawnValue has no attribute {} to set'.format(
-            repr(name)))
+    # Legacy names for the first two canvas items
+    @property
+    def display_shape(self):
+        return self[1]
+
+    @display_shape.setter
+    def display_shape(self, val):
+        if len(self.items) > 0:
+            self[1] = val
+
+    @property
+    def display_val(self):
+        return self[2]
+
+    @display_val.setter
+    def display_val(self, val):
+        if len(self.items) > 1:
+            self[2] = val
 
     def __eq__(self, other):  # Equality test between drawnValues
         if self._is_valid_operand(other): # Only test value to preserve
@@ -75,13 +96,17 @@ class drawnValue(object):
     def __len__(self):
         return 1 + len(self.items)
 
+    def __iter__(self):
+        yield self.val
+        yield from self.items
+
     def __str__(self):
         return '<drawnValue: {}>'.format(', '.join(
             '{}: {}'.format(attr, repr(getattr(self, attr))) 
             for attr in self.__fields))
         
     def copy(self):          # Retun a copy of this drawnValue
-        return drawnValue(*(attr for attr in self))
+        return drawnValue(self.val, *self.items)
 
     def color(self, canvas): # Get fill color of first canvas item
         mainItem = None      # Look for canvas item IDs among items and get
@@ -101,13 +126,38 @@ class drawnValue(object):
 
 if __name__ == '__main__':
     from tkinter import *
-    import random
+    import random, sys, time
+
+    N = 100000             # Microbenchmark of building and accessing records
+    values = list(range(N))
+    itemSequences = [(i + 1, i + 2, i + 3) for i in values]
+    start = time.perf_counter()
+    records = [drawnValue(val, *items)
+               for val, items in zip(values, itemSequences)]
+    built = time.perf_counter()
+    bulk = drawnValue.many(values, itemSequences)
+    bulkBuilt = time.perf_counter()
+    print('Built {} records in {:.3f}s one at a time, {:.3f}s with many()'
+          .format(N, built - start, bulkBuilt - built))
+    print('Bytes per record, including its items tuple:',
+          sys.getsizeof(records[0]) + sys.getsizeof(records[0].items))
+    for label, access in (
+            ('.val', lambda d: d.val),
+            ('d[1]', lambda d: d[1]),
+            ('display_shape', lambda d: d.display_shape),
+            ('d[1] = x', lambda d: d.__setitem__(1, 0))):
+        start = time.perf_counter()
+        for d in bulk:
+            access(d)
+        print('{:>14}: {:.3f}s per million accesses'.format(
+            label, (time.perf_counter() - start) * 1e6 / N))
+
     window = Tk()
     canvas = Canvas(window, width=800, height=400)
     canvas.pack()
 
     side = 50
-    N = 20
+    N = 20                 # Drawing demonstration
     row = 5
     numbers = [random.randrange(10) for j in range(N)]
     items = [drawnValue(
@@ -2,8 +2,8 @@ __doc__ = """
 Program to show data structure visualizations in a tabbed Tk notebook
 presentation form.  This program loads all the visualization modules
 in the current directory that contain subclasses of VisualizationApp.
-It and instantiates each one in a separate tab.  When the user clicks
-on a tab, it calls the class's runVisualization method.  A preferred
+It makes a tab for each one and instantiates the class the first time
+its tab is shown.  A preferred
 order for the modules (by class name) controls the order of the
 recognized modules.  The rest are added in alphabetical order. 
 """
@@ -55,7 +55,7 @@ and use the soft keyboard to enter values.
 def showVisualizations(   # Display a set of VisualizationApps in a ttk.Notebook
         classes, start=None, title="Datastructure Visualizations", 
         adjustForTrinket=False, seed='3.14159', verbose=0, debug=False,
-        theme='alt', introBG='white'):
+        theme='alt', introBG='white', warmUp=False, profile=None):
     if len(classes) == 0:
         print('No matching classes to visualize', file=sys.stderr)
         return
@@ -117,7 +117,12 @@ def showVisualizations(   # Display a set of VisualizationApps in a ttk.Notebook
         folders['Other'] = otherApps
     ordered_classes += otherApps
 
-    appNumber = 1
+    lazyApps = []
+    def warmUpNext(lazyApp): # After building one app, warm up the next one
+        index = lazyApps.index(lazyApp) + 1
+        if warmUp and index < len(lazyApps):
+            lazyApps[index].warmUp()
+        
     for folder in folders:
         if folders[folder]:
             if verbose > 0:
@@ -126,32 +131,23 @@ def showVisualizations(   # Display a set of VisualizationApps in a ttk.Notebook
             notebook.add(group, text=folder)
         for app in folders[folder]:
             if verbose > 0:
-                print('Found app {} and instantiating in {}'.format(
+                print('Found app {} and adding it to {}'.format(
                     app.__name__, folder),
                       file=sys.stderr)
             pane = ttk.Frame(group)
-            loading['text'] = '\nLoading module {} of {} modules...'.format(
-                appNumber, len(classes))
-            appNumber += 1
-            try:
-                vizApp = app(window=pane)
-                vizApp.DEBUG = debug
-                name = getattr(vizApp, 'title', app.__name__)
-                pane.bind('<Map>', oneTimeShowHintHandler(vizApp), '+')
-
-            except Exception as e:
-                name = app.__name__
-                msg = 'Error instantiating {}:\n{}'.format(name, e)
-                label = Label(pane, text=msg, fg='red')
-                label.pack()
-                print(msg, file=sys.stderr)
-                
+            lazyApp = LazyApp(app, pane, seed=seed, debug=debug,
+                              profile=profile, onBuild=warmUpNext)
+            lazyApps.append(lazyApp)
+            name = lazyApp.title
             group.add(pane, text=name)
             if start and start.lower() in (app.__name__.lower(), name.lower()):
                 notebook.select(group)
                 group.select(pane)
     loading.destroy()
     resizeIntro(intro, padBy)
+    if profile:
+        profile.mark('made {} tabs'.format(len(lazyApps)))
+        profile.reportWhenInteractive(top)
     top.mainloop()
 
 def mapHandler(introCenter, padding, debug=False):
@@ -199,6 +195,14 @@ if __name__ == '__main__':
         '--seed', default='3.14159',
         help='Random number generator seed.  Set to empty string to skip '
         'seeding.')
+    parser.add_argument(
+        '--warm-up', default=False, action='store_true',
+        help='Construct the visualization after the one shown during idle '
+        'time.')
+    parser.add_argument(
+        '--startup-profile', default=False, action='store_true',
+        help='Report the time taken by startup phases up to the first '
+        'interactive frame.')
     parser.add_argument(
         '-d', '--debug', default=False, action='store_true',
         help='Show debugging information.')
@@ -206,6 +210,7 @@ if __name__ == '__main__':
         '-v', '--verbose', action='count', default=0,
         help='Add verbose comments')
     args = parser.parse_args()
+    profile = StartupProfile() if args.startup_profile else None
 
     if args.files is None or args.files == []:
         dirs = set([os.path.relpath(os.getcwd())])
@@ -221,7 +226,10 @@ if __name__ == '__main__':
             print('No files provided.  Unique directories to search:', dirs,
                   'with search order:', list(dirs))
         args.files = list(dirs)
-    showVisualizations(findVisualizations(args.files, args.verbose),
+    classes = findVisualizations(args.files, args.verbose)
+    if profile:
+        profile.mark('found {} visualizations'.format(len(classes)))
+    showVisualizations(classes,
                        start=args.start, title=args.title, verbose=args.verbose,
                        adjustForTrinket=args.warn_for_trinket, debug=args.debug,
-                       seed=args.seed)
+                       seed=args.seed, warmUp=args.warm_up, profile=profile)
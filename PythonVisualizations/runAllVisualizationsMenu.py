@@ -2,13 +2,14 @@ __doc__ = """
 Program to show algorithm visualizations one at at time with a
 dropdown menu to select one.  This program loads all the visualization
 modules in the current directory that contain subclasses of
-VisualizationApp.  It instantiates each one in a separate Frame, and
-builds a menu to choose one.  When the user selects a visualization,
-the frame is shown (by using grid to manage its geometry) and all the
-others are hidden.  A preferred order for the modules (by class or
-name) controls the order of the recognized modules and groups them
-with a prefix 'folder' name.  The rest are added in alphabetical
-order in a folder called 'Other'.
+VisualizationApp.  It makes a separate Frame for each one, and builds
+a menu to choose one.  When the user selects a visualization, the frame
+is shown (by using grid to manage its geometry) and all the others are
+hidden.  Each class is instantiated the first time its frame is shown.
+A preferred order for the modules (by class or name) controls the
+order of the recognized modules and groups them with a prefix 'folder'
+name.  The rest are added in alphabetical order in a folder called
+'Other'.
 """
 
 import argparse, sys, os, random
@@ -127,7 +128,7 @@ def resizeHandler(event):
 def showVisualizations(   # Display a set of VisualizationApps in pulldown menu
         classes, start=None, title="Datastructure Visualizations", version=None,
         adjustForTrinket=False, seed='3.14159', verbose=0, debug=False,
-        theme='alt', introBG='white'):
+        theme='alt', introBG='white', warmUp=False, profile=None):
     global DEBUG
     DEBUG = debug
     if len(classes) == 0:
@@ -199,36 +200,31 @@ def showVisualizations(   # Display a set of VisualizationApps in pulldown menu
     ordered_classes += otherApps
 
     startAppWindow = None
+    lazyApps = []
+    def warmUpNext(lazyApp): # After building one app, warm up the next one
+        index = lazyApps.index(lazyApp) + 1
+        if warmUp and index < len(lazyApps):
+            lazyApps[index].warmUp()
+        
     for folder in folders:
         if folders[folder]:
             if verbose > 0:
                 print('Constructing folder {}'.format(folder), file=sys.stderr)
         for app in folders[folder]:
             if verbose > 0:
-                print('Found app {} and instantiating in {}'.format(
+                print('Found app {} and adding it to {}'.format(
                     app.__name__, folder),
                       file=sys.stderr)
             pane = ttk.Frame(top)
-            loading['text'] = '\nLoading module {} of {} modules...'.format(
-                len(appWindows), len(classes))
-            try:
-                vizApp = app(window=pane)
-                vizApp.DEBUG = debug
-                appTitle = getattr(vizApp, 'title', app.__name__)
-                name = folder + ': ' + appTitle
-                setattr(pane, 'appTitle', appTitle)
-                appWindows.append(pane)
-                pane.bind('<Map>', oneTimeShowHintHandler(vizApp), '+')
-            except Exception as e:
-                name = app.__name__ + ' *'
-                msg = 'Error instantiating {}:\n{}'.format(app.__name__, e)
-                label = Label(pane, text=msg, fg='red')
-                label.grid()
-                print(msg, file=sys.stderr)
+            lazyApp = LazyApp(app, pane, seed=seed, debug=debug,
+                              profile=profile, onBuild=warmUpNext)
+            lazyApps.append(lazyApp)
+            name = folder + ': ' + lazyApp.title
+            setattr(pane, 'appTitle', lazyApp.title)
+            appWindows.append(pane)
 
             if start and start.lower() in (
-                    getattr(vizApp, 'title', app.__name__).lower(),
-                    app.__name__.lower()) and pane == appWindows[-1]:
+                    lazyApp.title.lower(), app.__name__.lower()):
                startAppWindow = pane
                
                pane.grid(row=1, column=0, sticky=(N, E, W, S))
@@ -268,6 +264,9 @@ def showVisualizations(   # Display a set of VisualizationApps in pulldown menu
                              .format(type(version)))
             
     loading['text'] = ''
+    if profile:
+        profile.mark('made {} frames'.format(len(lazyApps)))
+        profile.reportWhenInteractive(top)
     if verbose > 1:
         print('Top geometry:', top.winfo_geometry(),
               'Menubutton geometry:', menubutton.winfo_geometry(),
@@ -302,6 +301,14 @@ if __name__ == '__main__':
         '--seed', default='3.14159',
         help='Random number generator seed.  Set to empty string to skip '
         'seeding.')
+    parser.add_argument(
+        '--warm-up', default=False, action='store_true',
+        help='Construct the visualization after the one shown during idle '
+        'time.')
+    parser.add_argument(
+        '--startup-profile', default=False, action='store_true',
+        help='Report the time taken by startup phases up to the first '
+        'interactive frame.')
     parser.add_argument(
         '-d', '--debug', default=False, action='store_true',
         help='Show debugging information.')
@@ -309,6 +316,7 @@ if __name__ == '__main__':
         '-v', '--verbose', action='count', default=0,
         help='Add verbose comments')
     args = parser.parse_args()
+    profile = StartupProfile() if args.startup_profile else None
 
     if args.files is None or args.files == []:
         dirs = set([os.path.relpath(os.getcwd())])
@@ -328,7 +336,11 @@ if __name__ == '__main__':
     if (args.version and args.version.startswith('(') and
         args.version.endswith(')')):
         args.version = eval(args.version)
-    showVisualizations(findVisualizations(args.files, args.verbose),
+    classes = findVisualizations(args.files, args.verbose)
+    if profile:
+        profile.mark('found {} visualizations'.format(len(classes)))
+    showVisualizations(classes,
                        start=args.start, title=args.title, verbose=args.verbose,
                        adjustForTrinket=args.warn_for_trinket, debug=args.debug,
-                       seed=args.seed, version=args.version)
+                       seed=args.seed, version=args.version,
+                       warmUp=args.warm_up, profile=profile)
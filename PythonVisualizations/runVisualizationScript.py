@@ -0,0 +1,71 @@
+__doc__ = """
+Program to run a script of operations on one visualization, for example,
+to stress test a data structure with thousands of insertions.  The
+script has one operation per line, named by its button label followed
+by its arguments, like 'insert 42', 'delete 17', or 'search 5'.  Text
+after a # is a comment.  Operations run in instant mode and the display
+is updated only after every Nth operation or at a target frame rate.
+The throughput is reported at the end.
+"""
+
+import argparse, sys, os, random
+
+try:
+    from allVisualizationsCommon import *
+    import Visualization
+except ModuleNotFoundError:
+    from .allVisualizationsCommon import *
+    from . import Visualization
+
+def findVisualization(name, classes): # Find a visualization class by its
+    for cls in classes:                # class name or title, ignoring case
+        if name.lower() in (cls.__name__.lower(), appTitle(cls).lower()):
+            return cls
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        'visualization',
+        help='Class name or title of the visualization to run.')
+    parser.add_argument(
+        'script', nargs='?', default='-',
+        help='File of operations to run.  Use - for standard input.')
+    parser.add_argument(
+        '-n', '--render-every', type=int, default=100,
+        help='Update the display after every N operations.')
+    parser.add_argument(
+        '-f', '--frame-rate', type=float, default=None,
+        help='Update the display at most this many times per second '
+        'instead of every N operations.')
+    parser.add_argument(
+        '--headless', default=False, action='store_true',
+        help='Run without a display.')
+    parser.add_argument(
+        '-k', '--keep-open', default=False, action='store_true',
+        help='Keep the visualization open after running the script.')
+    parser.add_argument(
+        '--seed', default='3.14159',
+        help='Random number generator seed.  Set to empty string to skip '
+        'seeding.')
+    parser.add_argument(
+        '-v', '--verbose', action='count', default=0,
+        help='Add verbose comments')
+    args = parser.parse_args()
+
+    if args.headless:
+        Visualization.Visualization.HEADLESS = True
+    classes = findVisualizations(
+        [os.path.dirname(os.path.abspath(__file__))], args.verbose)
+    cls = findVisualization(args.visualization, classes)
+    if cls is None:
+        parser.error('Unknown visualization {!r}.  Choose from: {}'.format(
+            args.visualization, ', '.join(c.__name__ for c in classes)))
+    if args.seed:
+        random.seed(args.seed)
+    app = cls()
+    app.runScript(args.script, renderEvery=args.render_every,
+                  frameRate=args.frame_rate)
+    if args.keep_open and not args.headless:
+        app.runVisualization() # runAllVisualizations ignore
@@ -1,10 +1,15 @@
 __doc__ = """
 Utilty methods and classes for Tk, and in particular, a specialized
-version of canvas called 'Scrim', and a cache of Tk images.
+version of canvas called 'Scrim', a cache of Tk images, and a cache
+of font objects and text measurements.
 """
 
 import re, sys, math, os
+from collections import OrderedDict
+from contextlib import contextmanager
+import tkinter
 from tkinter import *
+from tkinter import _stringify, _flatten
 from tkinter import ttk
 import tkinter.font as tkfont
 from enum import Enum
@@ -161,26 +166,146 @@ def widgetState(widget, state=None): # Get or set widget state
 sizePattern = re.compile(r'-?\d+')
 
 def textWidth(font, text=' '):
-    return tkFontFromSpec(font).measure(text)
+    return textMetrics.width(font, text)
         
 def textHeight(font, text=' '):
     lines = text.split('\n')
     nLines = len(lines) if lines and len(lines[-1]) > 0 else len(lines) - 1
-    return tkFontFromSpec(font).metrics()['linespace'] * nLines
+    return textMetrics.linespace(font) * nLines
 
 def tkFontFromSpec(spec):
+    'Get the shared font object for a font spec tuple'
+    return textMetrics.font(spec)
+
+def makeFontFromSpec(spec): # Make a new font object for a font spec tuple
     family = spec[0]
     size = spec[1] if (len(spec) > 1 and 
                        (isinstance(spec[1], int) or
                         (isinstance(spec[1], str) and 
                          sizePattern.match(spec[1])))) else 0
-    return tkfont.Font(
+    fontClass = ApproximateFont if approximateFonts else tkfont.Font
+    return fontClass(
         family=family, size=size,
         weight=lookFor(('bold', 'light'), spec, 'normal'),
         slant=lookFor(('italic', 'oblique'), spec, 'roman'),
         underline=1 if lookFor(('underline',), spec, 0) else 0,
         overstrike=1 if lookFor(('overstrike',), spec, 0) else 0)
-        
+
+class TextMetricsCache(object):
+    '''Registry of font objects shared by font spec, plus a least recently
+    used cache of measured text widths and font line heights.  Fonts are
+    made again if the default Tk root changes or approximate font
+    metrics are switched on or off.'''
+
+    def __init__(self, maxSize=4096):
+        self.maxSize = maxSize  # Maximum number of cached measurements
+        self.fonts = {}         # Font objects by spec tuple
+        self.measurements = OrderedDict() # (spec, text) -> width and
+        self.root = None                  # (spec, None) -> line height
+        self.approximate = None
+        self.hits, self.misses, self.fontsMade = 0, 0, 0
+
+    def __str__(self):
+        return ('<TextMetricsCache: {} fonts, {} measurements, {} hits, '
+                '{} misses>'.format(len(self.fonts), len(self.measurements),
+                                    self.hits, self.misses))
+
+    def key(self, spec):     # Make a hashable key for a font spec
+        return tuple(spec) if isinstance(spec, list) else spec
+
+    def font(self, spec):
+        if (self.root is not tkinter._default_root or
+            self.approximate != approximateFonts):
+            self.clear()
+        key = self.key(spec)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = makeFontFromSpec(spec)
+            self.fontsMade += 1
+        return font
+
+    def lookup(self, key, measure): # Get a measurement from the cache or
+        if (self.root is not tkinter._default_root or # by calling measure
+            self.approximate != approximateFonts):
+            self.clear()
+        if key in self.measurements:
+            self.hits += 1
+            self.measurements.move_to_end(key)
+            return self.measurements[key]
+        self.misses += 1
+        value = self.measurements[key] = measure()
+        if len(self.measurements) > self.maxSize:
+            self.measurements.popitem(last=False)
+        return value
+
+    def width(self, spec, text=' '):
+        key = self.key(spec)
+        return self.lookup(
+            (key, str(text)), lambda: self.font(key).measure(text))
+
+    def linespace(self, spec):
+        key = self.key(spec)
+        return self.lookup(
+            (key, None), lambda: self.font(key).metrics('linespace'))
+
+    def clear(self):
+        self.fonts, self.measurements = {}, OrderedDict()
+        self.root, self.approximate = tkinter._default_root, approximateFonts
+
+    def stats(self):
+        return {'fonts': len(self.fonts), 'fontsMade': self.fontsMade,
+                'measurements': len(self.measurements),
+                'hits': self.hits, 'misses': self.misses}
+
+textMetrics = TextMetricsCache()
+
+approximateFonts = False  # Use approximate font metrics when Tk is absent
+
+def useApproximateFonts(approximate=True):
+    '''Switch text measurements to use approximate font metrics, as needed
+    when running without a display'''
+    global approximateFonts
+    approximateFonts = approximate
+
+class ApproximateFont(object):
+    '''Estimate the metrics of a Tk font from its size, for use without a
+    display.  Character widths are a fixed fraction of the pixel size.'''
+    POINTS_TO_PIXELS = 4 / 3
+    DEFAULT_PIXELS = 12
+    MONOSPACE_FAMILIES = ('courier', 'courier new', 'monaco', 'menlo',
+                          'consolas', 'tkfixedfont')
+
+    def __init__(self, family='Helvetica', size=0, weight='normal',
+                 slant='roman', underline=0, overstrike=0):
+        self.family, self.size = family, int(size)
+        self.weight, self.slant = weight, slant
+        self.underline, self.overstrike = underline, overstrike
+        self.pixels = (-self.size if self.size < 0 else
+                       round(self.size * self.POINTS_TO_PIXELS) if self.size
+                       else self.DEFAULT_PIXELS)
+        self.fixed = family.lower() in self.MONOSPACE_FAMILIES
+        self.charWidth = self.pixels * (
+            0.6 if self.fixed else 0.55) * (1.1 if weight == 'bold' else 1)
+
+    def measure(self, text):
+        return max([round(len(line) * self.charWidth)
+                    for line in str(text).split('\n')] + [0])
+
+    def metrics(self, *options):
+        result = {'ascent': math.ceil(self.pixels * 0.9),
+                  'descent': math.ceil(self.pixels * 0.25),
+                  'fixed': 1 if self.fixed else 0}
+        result['linespace'] = result['ascent'] + result['descent']
+        if len(options) == 1:
+            return result[options[0]]
+        return dict((k, result[k]) for k in options) if options else result
+
+    def actual(self, option=None):
+        result = {'family': self.family, 'size': self.size,
+                  'weight': self.weight, 'slant': self.slant,
+                  'underline': self.underline, 'overstrike': self.overstrike}
+        return result[option] if option else result
+
 def lookFor(keys, spec, default):  # Find keyword in font spec
     strings = [x.lower() for x in spec if isinstance(x, str)]
     for key in keys:
@@ -189,7 +314,7 @@ def lookFor(keys, spec, default):  # Find keyword in font spec
     return default
 
 def parseTkFont(fontspec):
-    if isinstance(fontspec, tkfont.Font):
+    if isinstance(fontspec, (tkfont.Font, ApproximateFont)):
         actual = fontspec.actual()
         return (actual['family'], actual['size'],
                 *(() if actual['weight'] == 'normal' else (actual['weight'],)),
@@ -200,6 +325,8 @@ def parseTkFont(fontspec):
         font = fontspec.split()
         if len(font) > 1:
             return (font[0], int(font[1]), *font[2:])
+        if approximateFonts:
+            return (fontspec, 0)
         return parseTkFont(tkfont.nametofont(fontspec))
 
 def buttonImage(btn, image=None):
@@ -230,6 +357,196 @@ def genericEventHandler(
 class Scrim(Canvas):
     '''Enhanced Tk Canvas widget with more convenience methods.
     '''
+    batching = True       # Enable batching of canvas changes
+    recorder = None       # Recorder to notify of item changes, if any
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batchDepth = 0 # Depth of nested batch() contexts
+        self.batched = []   # Queue of Tcl commands for current batch
+        self.itemTypes = {} # Item type by item ID
+        self.styles = {}    # Dictionary of style options by item ID
+
+    # BATCHED CANVAS CHANGES
+    @contextmanager
+    def batch(self):
+        '''Context manager that queues item moves, coordinate changes, and
+        configuration changes made within it, and sends them to Tk in a
+        single Tcl evaluation when the outermost batch ends.  Reading item
+        coordinates, bounding boxes, or configuration flushes the queue.
+        '''
+        self.batchDepth += 1
+        try:
+            yield self
+        finally:
+            self.batchDepth -= 1
+            if self.batchDepth == 0:
+                self.flush()
+
+    def queueCommand(self, *args): # Queue a canvas widget command in the
+        if not (self.batching and self.batchDepth > 0): # current batch, if
+            return False                                # any
+        self.batched.append(' '.join(
+            _stringify(arg) for arg in (self._w,) + args))
+        return True
+
+    def flush(self):        # Send any queued canvas commands to Tk
+        if self.batched:
+            script = '\n'.join(self.batched)
+            self.batched = []
+            self.tk.eval(script)
+
+    # RECORDING CHANGES
+    def noteChange(self, *tagsOrIds): # Tell the recorder, if any, which
+        if self.recorder:             # items changed
+            self.recorder.touch(*tagsOrIds)
+
+    def noteRestack(self):  # Tell the recorder, if any, that the stacking
+        if self.recorder:   # order changed
+            self.recorder.restack()
+
+    # ITEM STYLE STORE
+    # The type, colors, and font of each item are recorded when items are
+    # created and configured, so that reading them needs no Tcl calls.
+    # Other options are read from Tk.
+    STYLE_DEFAULTS = {
+        'arc': {'fill': '', 'outline': 'black', 'activefill': '',
+                'activeoutline': '', 'disabledfill': '', 'disabledoutline': ''},
+        'polygon': {'fill': 'black', 'outline': '', 'activefill': '',
+                    'activeoutline': '', 'disabledfill': '',
+                    'disabledoutline': ''},
+        'line': {'fill': 'black', 'activefill': '', 'disabledfill': ''},
+        'text': {'fill': 'black', 'activefill': '', 'disabledfill': '',
+                 'font': 'TkDefaultFont'},
+        'bitmap': {'foreground': 'black', 'background': '',
+                   'activeforeground': '', 'activebackground': '',
+                   'disabledforeground': '', 'disabledbackground': ''},
+        'image': {},
+        'window': {},
+    }
+    STYLE_DEFAULTS['oval'] = STYLE_DEFAULTS['rectangle'] = STYLE_DEFAULTS['arc']
+    STYLE_KEYS = set(key for defaults in STYLE_DEFAULTS.values()
+                     for key in defaults)
+
+    def styleItems(self, tagOrId): # Get item IDs for a tag or ID, looking
+        if isinstance(tagOrId, int): # up tags in Tk
+            return (tagOrId,)
+        if isinstance(tagOrId, str) and tagOrId.isdigit():
+            return (int(tagOrId),)
+        self.flush()
+        return self.find_withtag(tagOrId)
+
+    def itemStyle(self, tagOrId): # Get style dictionary for an item ID
+        if isinstance(tagOrId, str) and tagOrId.isdigit():
+            tagOrId = int(tagOrId)
+        return self.styles.get(tagOrId) if isinstance(tagOrId, int) else None
+
+    def recordStyle(self, item, options): # Update stored style of an item
+        style = self.styles.get(item)
+        if style is not None:
+            for key, value in options.items():
+                if key in style and value is not None:
+                    style[key] = (value if isinstance(value, str) else
+                                  _stringify(value))
+
+    def itemCount(self):     # Number of items on the canvas
+        return len(self.itemTypes)
+
+    def type(self, tagOrId):
+        if isinstance(tagOrId, int):
+            return self.itemTypes.get(tagOrId)
+        return super().type(tagOrId)
+
+    def itemcget(self, tagOrId, option):
+        style = self.itemStyle(tagOrId)
+        key = option.lstrip('-')
+        if style and key in style:
+            return style[key]
+        self.flush()
+        return super().itemcget(tagOrId, option)
+
+    def _create(self, itemType, args, kw):
+        item = super()._create(itemType, args, kw)
+        self.itemTypes[item] = itemType
+        self.styles[item] = dict(self.STYLE_DEFAULTS.get(itemType, {}))
+        self.recordStyle(item, dict(
+            args[-1], **kw) if args and isinstance(args[-1], dict) else kw)
+        self.noteChange(item)
+        self.noteRestack()
+        return item
+
+    def delete(self, *args):
+        self.flush()
+        items = [item for tagOrId in args for item in self.styleItems(tagOrId)]
+        if self.recorder:
+            self.noteChange(*items)
+            self.noteRestack()
+        for item in items:
+            self.itemTypes.pop(item, None)
+            self.styles.pop(item, None)
+        super().delete(*args)
+
+    def tag_raise(self, *args):
+        self.noteRestack()
+        super().tag_raise(*args)
+
+    def tag_lower(self, *args):
+        self.noteRestack()
+        super().tag_lower(*args)
+
+    lift = tkraise = tag_raise
+    lower = tag_lower
+
+    def addtag_withtag(self, newtag, tagOrId):
+        self.noteChange(tagOrId)
+        super().addtag_withtag(newtag, tagOrId)
+
+    def dtag(self, *args):
+        if self.recorder:  # Find items before their tag is removed
+            self.noteChange(*self.find_withtag(args[0]))
+        super().dtag(*args)
+
+    def tagItems(self, tag, items): # Make a tag label exactly the given items
+        if self.recorder:           # using a single Tcl evaluation, when
+            self.noteChange(*self.find_withtag(tag)) # batching is enabled
+            self.noteChange(*items)
+        with self.batch():
+            if not self.queueCommand('dtag', tag, tag):
+                self.dtag(tag, tag)
+            for item in items:
+                if not self.queueCommand('addtag', tag, 'withtag', item):
+                    self.addtag_withtag(tag, item)
+
+    def scale(self, *args):
+        self.noteChange(args[0])
+        super().scale(*args)
+
+    def move(self, *args):
+        self.noteChange(args[0])
+        if not self.queueCommand('move', *args):
+            super().move(*args)
+
+    def itemconfigure(self, tagOrId, cnf=None, **kw):
+        if kw or isinstance(cnf, dict):
+            options = dict(cnf, **kw) if isinstance(cnf, dict) else kw
+            if any(key in self.STYLE_KEYS for key in options):
+                for item in self.styleItems(tagOrId):
+                    self.recordStyle(item, options)
+            self.noteChange(tagOrId)
+            if self.queueCommand(
+                    'itemconfigure', tagOrId, *self._options(cnf, kw)):
+                return
+        elif isinstance(cnf, str):
+            style = self.itemStyle(tagOrId)
+            key = cnf.lstrip('-')
+            if style and key in style:
+                return (key, '', '', self.STYLE_DEFAULTS[
+                    self.itemTypes[int(tagOrId)]][key], style[key])
+        self.flush()
+        return super().itemconfigure(tagOrId, cnf, **kw)
+
+    itemconfig = itemconfigure
+
     # CANVAS ITEM METHODS
     def itemConfig(self, canvasitem, *key, **kwargs):
         '''Do what the tk canvas itemconfigure command does, but return only
@@ -284,6 +601,11 @@ class Scrim(Canvas):
                     self.itemConfig(item, anchor=newAnchor)
 
     def coords(self, tagOrID, *args):
+        if args:
+            self.noteChange(tagOrID)
+            if self.queueCommand('coords', tagOrID, *_flatten(args)):
+                return
+        self.flush()
         result = super().coords(tagOrID, *args)
         if len(args) == 0 and result:
             return tuple(result)
@@ -292,6 +614,7 @@ class Scrim(Canvas):
     def bbox(self,
              tagOrID: 'Tag or ID of item for bounding box' =None
     ) -> 'Return Tk bounding box when defined, else approximate it':
+        self.flush()
         result = super().bbox(tagOrID)
         if result: return result
         kind = tagOrID and self.type(tagOrID)
@@ -395,7 +718,7 @@ class Scrim(Canvas):
         return itemColors
 
     def getItemColors(self, item):
-        config = self.itemConfig(item)
+        config = self.itemStyle(item) or self.itemConfig(item)
         return dict([(key, config[key])
                      for key in self.TYPE_COLORS[self.type(item)]])
 